@@ -1,5 +1,7 @@
+from pydantic import Field
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Dict, List, Literal, Optional
 import os
 
 
@@ -13,6 +15,91 @@ class Settings(BaseSettings):
     app_version: str = "1.0.0"
     debug: bool = False
     port: int = int(os.getenv("PORT", 8000))
+    # bcrypt cost factor; stored hashes with another cost are rehashed on
+    # the next successful login. Pick one with python -m app.utils.bcrypt_calibration
+    bcrypt_rounds: int = Field(12, ge=4, le=31)
+    # Password hashing pool; 0 workers means one per CPU core and a
+    # concurrency of 0 means one in-flight hash per worker
+    password_hash_workers: int = 0
+    password_hash_max_concurrency: int = 0
+    password_hash_max_queue: int = 256
+    # Organization read-through cache
+    org_cache_enabled: bool = True
+    org_cache_max_size: int = 10000
+    org_cache_ttl_seconds: float = 60.0
+    org_cache_negative_ttl_seconds: float = 5.0
+    org_cache_change_stream: bool = False
+    # Documents per batch when copying tenant collections
+    copy_batch_size: int = 1000
+    # Background jobs for organization updates and deletes
+    job_workers: int = 2
+    job_lease_seconds: int = 60
+    job_poll_interval_seconds: float = 1.0
+    job_max_attempts: int = 3
+    job_retention_hours: int = 24
+    # Bulk organization provisioning, for operators only. Every item costs
+    # a password hash, so items are also rate limited per client IP; a
+    # request is rejected whole when the client's bucket cannot cover it
+    bulk_create_max_items: int = 100
+    bulk_create_max_bytes: int = 64 * 1024
+    bulk_create_items_burst: int = 100
+    bulk_create_items_per_minute: float = Field(100.0, gt=0)
+    bulk_create_collection_concurrency: int = 16
+    # Shared secret of operator endpoints, sent in the X-Operator-Key
+    # header; operator access is disabled while it is unset
+    operator_api_key: Optional[str] = None
+    # /metrics and /stats also need the X-Operator-Key unless this is set,
+    # e.g. when they are only reachable from an internal network
+    metrics_public: bool = False
+    # Size of the chunks written to tenant export responses
+    export_chunk_bytes: int = 64 * 1024
+    # Where new organizations keep their data: "dedicated" gives each one
+    # its own collection, "pooled" shares pooled_collection_name between
+    # all of them; existing organizations keep the mode they were created in
+    tenancy_mode: Literal["dedicated", "pooled"] = "dedicated"
+    pooled_collection_name: str = "tenant_data"
+    # Additional clusters for tenant data as {"name": "mongodb://..."}; the
+    # cluster at mongodb_url is always available as "default"
+    clusters: Dict[str, str] = {}
+    # Cluster choice for new organizations: "least_loaded" picks the one
+    # with the fewest organizations, "hash" spreads them by organization ID.
+    # placement_clusters limits the candidates; empty means every cluster
+    placement_policy: Literal["least_loaded", "hash"] = "least_loaded"
+    placement_clusters: List[str] = []
+    placement_refresh_seconds: float = 60.0
+    # Verified access tokens kept in memory, and how often revocations made
+    # by other processes are picked up
+    token_cache_max_size: int = 10000
+    token_revocation_sync_seconds: float = 5.0
+    refresh_token_expiration_days: int = 30
+    # Login throttling: token buckets per email and per client IP, and a
+    # delay doubling with every failed login after login_free_failures.
+    # The "mongo" store shares buckets between processes
+    login_throttle_enabled: bool = True
+    login_throttle_store: Literal["memory", "mongo"] = "memory"
+    login_throttle_max_keys: int = 100000
+    login_email_burst: int = 5
+    login_email_per_minute: float = Field(5.0, gt=0)
+    login_ip_burst: int = 20
+    login_ip_per_minute: float = Field(60.0, gt=0)
+    login_free_failures: int = 3
+    login_failure_delay_seconds: float = 1.0
+    login_max_delay_seconds: float = 300.0
+    # Report the MongoDB commands, bytes and time of each request in the
+    # X-DB-Stats response header; meant for debugging and tests
+    db_stats_header: bool = False
+    # Event loop lag sampling; lags over the threshold are logged as stalls
+    loop_monitor_enabled: bool = True
+    loop_monitor_interval_seconds: float = 0.1
+    loop_stall_threshold_seconds: float = 0.1
+    # Logs are written by a background thread; "json" or "text" lines.
+    # Records carrying an event are kept at log_sample_rates[event], or
+    # log_sample_rate, when at INFO or below
+    log_level: str = "INFO"
+    log_format: Literal["json", "text"] = "json"
+    log_queue_size: int = 10000
+    log_sample_rate: float = Field(1.0, ge=0.0, le=1.0)
+    log_sample_rates: Dict[str, float] = {}
     
     class Config:
         env_file = ".env"  # Ensure this is correctly set to load the .env file
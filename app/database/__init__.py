@@ -1,3 +1,40 @@
-from app.database.mongodb import mongodb, MongoDBConnection
+from app.database.mongodb import (
+    mongodb,
+    async_mongodb,
+    MongoDBConnection,
+    AsyncMongoDBConnection,
+    create_async_client
+)
+from app.database.clusters import DEFAULT_CLUSTER, ClusterRegistry, cluster_registry
+from app.database.indexes import IndexReport, reconcile_indexes
+from app.database.collection_registry import CollectionRegistry
+from app.database.bulk import insert_many_unordered
+from app.database.tenancy import (
+    DEDICATED,
+    POOLED,
+    TENANCY_MODES,
+    TENANT_FIELD,
+    TenantCollection,
+    pooled_indexes
+)
 
-__all__ = ["mongodb", "MongoDBConnection"]
+__all__ = [
+    "mongodb",
+    "async_mongodb",
+    "MongoDBConnection",
+    "AsyncMongoDBConnection",
+    "create_async_client",
+    "DEFAULT_CLUSTER",
+    "ClusterRegistry",
+    "cluster_registry",
+    "IndexReport",
+    "reconcile_indexes",
+    "CollectionRegistry",
+    "insert_many_unordered",
+    "DEDICATED",
+    "POOLED",
+    "TENANCY_MODES",
+    "TENANT_FIELD",
+    "TenantCollection",
+    "pooled_indexes"
+]
@@ -0,0 +1,37 @@
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo.errors import BulkWriteError
+from typing import Any, Dict, List
+
+DUPLICATE_KEY_ERROR = 11000
+
+
+async def insert_many_unordered(
+    collection: AsyncIOMotorCollection,
+    documents: List[Dict[str, Any]]
+) -> Dict[int, str]:
+    """
+    Insert documents in one unordered bulk write
+
+    Args:
+        collection: Target collection
+        documents: Documents to insert; every one must carry its _id
+
+    Returns:
+        Position of every document that was not inserted, mapped to the
+        reason reported by the server
+    """
+    if not documents:
+        return {}
+
+    try:
+        await collection.insert_many(documents, ordered=False)
+    except BulkWriteError as e:
+        failed = {}
+        for error in e.details.get("writeErrors", []):
+            if error.get("code") == DUPLICATE_KEY_ERROR:
+                reason = "duplicate key"
+            else:
+                reason = error.get("errmsg", "write error")
+            failed[error["index"]] = reason
+        return failed
+    return {}
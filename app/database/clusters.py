@@ -0,0 +1,88 @@
+from app.database.mongodb import AsyncMongoDBConnection, async_mongodb, create_async_client
+from app.config import settings
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo.errors import ConnectionFailure
+from typing import Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# The cluster at mongodb_url; it also holds organizations, admins and jobs
+DEFAULT_CLUSTER = "default"
+
+
+class ClusterRegistry:
+    """
+    Named MongoDB clusters that can hold tenant data
+
+    The default cluster shares the client of ``async_mongodb``. Every other
+    cluster listed in ``Settings.clusters`` gets its own pooled client, created
+    on first use. Organizations record the cluster they were placed on, so
+    tenant operations resolve their database through this registry.
+    """
+
+    def __init__(
+        self,
+        urls: Optional[Dict[str, str]] = None,
+        default_connection: AsyncMongoDBConnection = async_mongodb
+    ):
+        self._urls = dict(settings.clusters if urls is None else urls)
+        if DEFAULT_CLUSTER in self._urls:
+            raise ValueError(
+                f"Cluster name '{DEFAULT_CLUSTER}' is reserved for mongodb_url"
+            )
+        self._default_connection = default_connection
+        self._clients: Dict[str, AsyncIOMotorClient] = {}
+
+    def names(self) -> List[str]:
+        """Names of every known cluster, the default one first"""
+        return [DEFAULT_CLUSTER, *sorted(self._urls)]
+
+    def get_client(self, cluster: Optional[str] = None) -> AsyncIOMotorClient:
+        cluster = cluster or DEFAULT_CLUSTER
+        if cluster == DEFAULT_CLUSTER:
+            return self._default_connection.get_database().client
+        if cluster not in self._urls:
+            raise KeyError(f"Unknown cluster: {cluster}")
+
+        client = self._clients.get(cluster)
+        if client is None:
+            # Motor connects lazily, so this never blocks
+            client = self._clients[cluster] = create_async_client(self._urls[cluster])
+        return client
+
+    def name_of(self, client: AsyncIOMotorClient) -> Optional[str]:
+        """Name of the cluster a client was handed out for, if any"""
+        if client is self._default_connection.get_database().client:
+            return DEFAULT_CLUSTER
+        for cluster, known in self._clients.items():
+            if known is client:
+                return cluster
+        return None
+
+    def get_database(
+        self,
+        cluster: Optional[str] = None,
+        db_name: Optional[str] = None
+    ) -> AsyncIOMotorDatabase:
+        return self.get_client(cluster)[db_name or settings.database_name]
+
+    async def connect(self):
+        """Check that every additional cluster is reachable"""
+        for cluster in self._urls:
+            try:
+                await self.get_client(cluster).admin.command("ping")
+                logger.info(f"Successfully connected to cluster {cluster}")
+            except ConnectionFailure as e:
+                logger.error(f"Failed to connect to cluster {cluster}: {e}")
+                raise
+
+    def close(self):
+        """Close the clients of the additional clusters"""
+        for cluster, client in self._clients.items():
+            client.close()
+            logger.info(f"Connection to cluster {cluster} closed")
+        self._clients = {}
+
+
+cluster_registry = ClusterRegistry()
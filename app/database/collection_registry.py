@@ -0,0 +1,42 @@
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from typing import Set
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CollectionRegistry:
+    """
+    Answers "does this collection exist" without listing the whole database
+
+    Names seen to exist are remembered in memory and kept up to date by our
+    own create and drop calls. Anything else is checked with a listCollections
+    filtered by name, so the cost of a lookup does not grow with the number of
+    tenant collections.
+    """
+    
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self._known: Set[str] = set()
+    
+    async def exists(self, collection_name: str) -> bool:
+        if collection_name in self._known:
+            return True
+        
+        names = await self.db.list_collection_names(
+            filter={"name": collection_name}
+        )
+        if names:
+            self._known.add(collection_name)
+            return True
+        return False
+    
+    def mark_created(self, collection_name: str):
+        self._known.add(collection_name)
+    
+    def mark_dropped(self, collection_name: str):
+        self._known.discard(collection_name)
+    
+    def forget(self):
+        """Discard everything learned so far, e.g. after an external change"""
+        self._known.clear()
@@ -0,0 +1,50 @@
+from pymongo import IndexModel
+from motor.motor_asyncio import AsyncIOMotorCollection
+from dataclasses import dataclass, field
+from typing import List
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class IndexReport:
+    """Outcome of reconciling the indexes of one collection"""
+    collection: str
+    created: List[str] = field(default_factory=list)
+    existing: List[str] = field(default_factory=list)
+
+
+async def reconcile_indexes(
+    collection: AsyncIOMotorCollection,
+    indexes: List[IndexModel]
+) -> IndexReport:
+    """
+    Create any missing indexes on a collection
+
+    Args:
+        collection: Collection to reconcile
+        indexes: Index definitions the collection must have
+
+    Returns:
+        IndexReport listing the created and already existing index names
+    """
+    report = IndexReport(collection=collection.name)
+    present = set(await collection.index_information())
+    missing = []
+
+    for index in indexes:
+        name = index.document["name"]
+        if name in present:
+            report.existing.append(name)
+        else:
+            missing.append(index)
+
+    if missing:
+        report.created.extend(await collection.create_indexes(missing))
+
+    logger.info(
+        f"Indexes on {report.collection}: created={report.created} "
+        f"existing={report.existing}"
+    )
+    return report
@@ -1,6 +1,12 @@
 from pymongo import MongoClient
 from pymongo.errors import ConnectionFailure
+from motor.motor_asyncio import (
+    AsyncIOMotorClient,
+    AsyncIOMotorCollection,
+    AsyncIOMotorDatabase
+)
 from app.config import settings
+from app.utils.metrics import mongodb_event_listeners
 from typing import Optional
 import logging
 
@@ -23,7 +29,8 @@ class MongoDBConnection:
                     settings.mongodb_url,
                     serverSelectionTimeoutMS=5000,
                     maxPoolSize=50,
-                    minPoolSize=10
+                    minPoolSize=10,
+                    event_listeners=mongodb_event_listeners()
                 )
                 self._client.admin.command('ping')
                 logger.info("Successfully connected to MongoDB")
@@ -49,4 +56,63 @@ class MongoDBConnection:
         return db[collection_name]
 
 
+def create_async_client(url: str) -> AsyncIOMotorClient:
+    """Create a Motor client with the service's connection pool settings"""
+    return AsyncIOMotorClient(
+        url,
+        serverSelectionTimeoutMS=5000,
+        maxPoolSize=50,
+        minPoolSize=10,
+        event_listeners=mongodb_event_listeners()
+    )
+
+
+class AsyncMongoDBConnection:
+    """Non-blocking counterpart of MongoDBConnection used on the request path"""
+    _instance: Optional['AsyncMongoDBConnection'] = None
+    _client: Optional[AsyncIOMotorClient] = None
+    
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+    
+    def _create_client(self) -> AsyncIOMotorClient:
+        return create_async_client(settings.mongodb_url)
+    
+    async def connect(self) -> AsyncIOMotorClient:
+        if self._client is None:
+            self._client = self._create_client()
+            try:
+                await self._client.admin.command('ping')
+                logger.info("Successfully connected to MongoDB (async)")
+            except ConnectionFailure as e:
+                logger.error(f"Failed to connect to MongoDB: {e}")
+                self.close()
+                raise
+        return self._client
+    
+    def get_database(self, db_name: Optional[str] = None) -> AsyncIOMotorDatabase:
+        # Motor connects lazily, so handing out a database never blocks
+        if self._client is None:
+            self._client = self._create_client()
+        db_name = db_name or settings.database_name
+        return self._client[db_name]
+    
+    def close(self):
+        if self._client:
+            self._client.close()
+            self._client = None
+            logger.info("Async MongoDB connection closed")
+    
+    def get_collection(
+        self,
+        collection_name: str,
+        db_name: Optional[str] = None
+    ) -> AsyncIOMotorCollection:
+        db = self.get_database(db_name)
+        return db[collection_name]
+
+
 mongodb = MongoDBConnection()
+async_mongodb = AsyncMongoDBConnection()
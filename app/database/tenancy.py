@@ -0,0 +1,138 @@
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import ASCENDING, IndexModel
+from typing import Any, Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# One collection per organization
+DEDICATED = "dedicated"
+# Every organization shares one collection, partitioned by TENANT_FIELD
+POOLED = "pooled"
+TENANCY_MODES = (DEDICATED, POOLED)
+
+TENANT_FIELD = "tenant_id"
+
+
+def pooled_indexes() -> List[IndexModel]:
+    """
+    Indexes of the shared tenant collection
+
+    Every index starts with the tenant key, so each tenant's slice is a
+    contiguous index range and scoped queries never scan other tenants.
+    """
+    return [
+        # Scoped _id order used by exports and copies
+        IndexModel([(TENANT_FIELD, ASCENDING), ("_id", ASCENDING)]),
+        IndexModel([(TENANT_FIELD, ASCENDING), ("created_at", ASCENDING)]),
+        IndexModel([(TENANT_FIELD, ASCENDING), ("updated_at", ASCENDING)]),
+    ]
+
+
+class TenantCollection:
+    """
+    One tenant's view of the shared collection
+
+    Mirrors the subset of the Motor collection API the services use. Every
+    filter and pipeline is restricted to the tenant, inserted documents are
+    stamped with the tenant key (overwriting any value they carry) and reads
+    leave the key out, so callers see the same documents as in a dedicated
+    collection. The one difference is that ``_id`` stays unique across the
+    whole collection: inserting an ``_id`` another tenant holds fails with
+    a duplicate key error.
+    """
+
+    def __init__(self, collection: AsyncIOMotorCollection, tenant_id: Any):
+        self.collection = collection
+        self.tenant_id = tenant_id
+
+    @property
+    def name(self) -> str:
+        return self.collection.name
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.collection.full_name}[{self.tenant_id}]"
+
+    @property
+    def database(self):
+        return self.collection.database
+
+    def _scope(self, filter: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        return {**(filter or {}), TENANT_FIELD: self.tenant_id}
+
+    def _stamp(self, document: Dict[str, Any]) -> Dict[str, Any]:
+        document[TENANT_FIELD] = self.tenant_id
+        return document
+
+    @staticmethod
+    def _hide_tenant(projection: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        if not projection:
+            return {TENANT_FIELD: 0}
+        if all(not value for key, value in projection.items() if key != "_id"):
+            # Exclusion projection; inclusion ones already leave the key out
+            return {**projection, TENANT_FIELD: 0}
+        return projection
+
+    def find(
+        self,
+        filter: Optional[Dict[str, Any]] = None,
+        projection: Optional[Dict[str, Any]] = None,
+        **kwargs: Any
+    ):
+        return self.collection.find(
+            self._scope(filter),
+            self._hide_tenant(projection),
+            **kwargs
+        )
+
+    async def find_one(
+        self,
+        filter: Optional[Dict[str, Any]] = None,
+        projection: Optional[Dict[str, Any]] = None,
+        **kwargs: Any
+    ) -> Optional[Dict[str, Any]]:
+        return await self.collection.find_one(
+            self._scope(filter),
+            self._hide_tenant(projection),
+            **kwargs
+        )
+
+    async def count_documents(
+        self,
+        filter: Optional[Dict[str, Any]] = None,
+        **kwargs: Any
+    ) -> int:
+        return await self.collection.count_documents(self._scope(filter), **kwargs)
+
+    async def estimated_document_count(self) -> int:
+        # Collection metadata counts every tenant, so count the tenant's range
+        return await self.count_documents()
+
+    async def insert_one(self, document: Dict[str, Any], **kwargs: Any):
+        return await self.collection.insert_one(self._stamp(document), **kwargs)
+
+    async def insert_many(self, documents: List[Dict[str, Any]], **kwargs: Any):
+        return await self.collection.insert_many(
+            [self._stamp(document) for document in documents],
+            **kwargs
+        )
+
+    async def update_one(self, filter: Dict[str, Any], update: Any, **kwargs: Any):
+        return await self.collection.update_one(self._scope(filter), update, **kwargs)
+
+    async def update_many(self, filter: Dict[str, Any], update: Any, **kwargs: Any):
+        return await self.collection.update_many(self._scope(filter), update, **kwargs)
+
+    async def delete_one(self, filter: Dict[str, Any], **kwargs: Any):
+        return await self.collection.delete_one(self._scope(filter), **kwargs)
+
+    async def delete_many(self, filter: Dict[str, Any], **kwargs: Any):
+        return await self.collection.delete_many(self._scope(filter), **kwargs)
+
+    def aggregate(self, pipeline: List[Dict[str, Any]], **kwargs: Any):
+        # The tenant key stays visible to later stages
+        return self.collection.aggregate(
+            [{"$match": {TENANT_FIELD: self.tenant_id}}, *pipeline],
+            **kwargs
+        )
@@ -1,19 +1,86 @@
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, Request, status
+from fastapi.responses import JSONResponse, Response
+from contextlib import asynccontextmanager
+from typing import Any, Dict
+import math
 from app.routes.organization import router as organization_router
 from app.routes.auth import router as auth_router
+from app.database.mongodb import async_mongodb
+from app.database.clusters import cluster_registry
+from app.services.container import services
+from app.services.login_throttle import LoginThrottled, Throttled
+from app.utils.security import password_hash_pool, PasswordHashPoolBusy, require_metrics_access
+from app.utils.responses import MongoJSONResponse
+from app.utils.metrics import MetricsMiddleware, metrics_payload, register_stats
+from app.utils.request_stats import RequestStatsMiddleware
+from app.utils.structured_logging import configure_logging, shutdown_logging
 from app.config import settings  # Import settings from config
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    configure_logging()
+    # Build shared services and reconcile indexes once per process
+    await async_mongodb.connect()
+    await cluster_registry.connect()
+    await services.startup()
+    yield
+    await services.shutdown()
+    password_hash_pool.shutdown()
+    cluster_registry.close()
+    async_mongodb.close()
+    shutdown_logging()
+
+
 app = FastAPI(
     title=settings.app_name,        # Use app name from settings
     version=settings.app_version,    # Use app version from settings
-    debug=settings.debug             # Set debug flag based on environment variable
+    debug=settings.debug,            # Set debug flag based on environment variable
+    lifespan=lifespan,
+    default_response_class=MongoJSONResponse
 )
 
-@app.get("/health")
+app.add_middleware(RequestStatsMiddleware)
+app.add_middleware(MetricsMiddleware)
+register_stats(services.stats)
+
+@app.exception_handler(PasswordHashPoolBusy)
+async def password_hash_pool_busy_handler(request: Request, exc: PasswordHashPoolBusy):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Server is busy, please retry shortly"},
+        headers={"Retry-After": "1"},
+    )
+
+@app.exception_handler(LoginThrottled)
+async def login_throttled_handler(request: Request, exc: LoginThrottled):
+    return JSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content={"detail": "Too many login attempts, please retry later"},
+        headers={"Retry-After": str(max(math.ceil(exc.retry_after), 1))},
+    )
+
+@app.exception_handler(Throttled)
+async def throttled_handler(request: Request, exc: Throttled):
+    return JSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content={"detail": "Too many requests, please retry later"},
+        headers={"Retry-After": str(max(math.ceil(exc.retry_after), 1))},
+    )
+
+@app.get("/health", response_model=Dict[str, str])
 def health_check():
     return {"status": "ok"}
 
+@app.get("/stats", response_model=Dict[str, Any], dependencies=[Depends(require_metrics_access)])
+def service_stats():
+    return services.stats()
+
+@app.get("/metrics", include_in_schema=False, dependencies=[Depends(require_metrics_access)])
+def metrics():
+    content, content_type = metrics_payload()
+    return Response(content=content, headers={"Content-Type": content_type})
+
 # Include route modules
 app.include_router(organization_router)
-app.include_router(auth_router, prefix="/admin", tags=["Admin"])
-
+app.include_router(auth_router)
@@ -0,0 +1,4 @@
+from app.migrations.stable_collection_names import migrate_to_stable_collection_names
+from app.migrations.tenancy_mode import migrate_tenancy_mode
+
+__all__ = ["migrate_to_stable_collection_names", "migrate_tenancy_mode"]
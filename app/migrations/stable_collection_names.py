@@ -0,0 +1,119 @@
+"""
+One-time migration from org_<name> to org_<organization_id> collections
+
+Run once per database after deploying the ID-keyed collection names:
+
+    python -m app.migrations.stable_collection_names [--dry-run]
+
+Collections are moved with renameCollection, which only rewrites metadata
+inside the database, and the organization document is updated afterwards.
+Re-running the migration after an interruption picks up where it stopped.
+Running API processes may serve the old collection_name from their
+organization cache until its TTL expires.
+"""
+from app.database.mongodb import async_mongodb
+from datetime import datetime
+from typing import Any, Dict
+import argparse
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def migrate_to_stable_collection_names(dry_run: bool = False) -> Dict[str, Any]:
+    """
+    Rename tenant collections so they are keyed by organization ID
+
+    Args:
+        dry_run: Only report what would be renamed
+
+    Returns:
+        Counts of migrated, resumed, already migrated, missing and
+        conflicting collections
+    """
+    db = async_mongodb.get_database()
+    organizations = db["organizations"]
+    report = {
+        "migrated": 0,
+        "resumed": 0,
+        "already_migrated": 0,
+        "missing": 0,
+        "conflicts": 0,
+        "dry_run": dry_run
+    }
+    # Renames only swap names that belong to a single organization, so one
+    # listing stays accurate for the whole run
+    existing = set(await db.list_collection_names())
+
+    cursor = organizations.find({}, {"collection_name": 1, "organization_name": 1})
+    async for org in cursor:
+        old_name = org["collection_name"]
+        new_name = f"org_{org['_id']}"
+
+        if old_name == new_name:
+            report["already_migrated"] += 1
+            continue
+
+        old_exists = old_name in existing
+        new_exists = new_name in existing
+
+        if old_exists and new_exists:
+            logger.error(
+                f"Both {old_name} and {new_name} exist for "
+                f"{org['organization_name']}, skipping"
+            )
+            report["conflicts"] += 1
+            continue
+        if old_exists:
+            outcome = "migrated"
+        elif new_exists:
+            # Renamed by an interrupted run before the new name was recorded
+            outcome = "resumed"
+        else:
+            # Never had data; the new name is still recorded
+            outcome = "missing"
+
+        if dry_run:
+            logger.info(f"Would record {new_name} for {org['organization_name']} ({outcome})")
+            report[outcome] += 1
+            continue
+
+        if outcome == "migrated":
+            await db[old_name].rename(new_name)
+            existing.discard(old_name)
+            existing.add(new_name)
+            logger.info(f"Renamed {old_name} to {new_name}")
+        elif outcome == "missing":
+            logger.warning(
+                f"Collection {old_name} of {org['organization_name']} does not exist"
+            )
+
+        await organizations.update_one(
+            {"_id": org["_id"]},
+            {
+                "$set": {"collection_name": new_name, "updated_at": datetime.utcnow()},
+                "$inc": {"version": 1}
+            }
+        )
+        report[outcome] += 1
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="only report the collections that would be renamed"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    report = asyncio.run(migrate_to_stable_collection_names(dry_run=args.dry_run))
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
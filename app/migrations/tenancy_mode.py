@@ -0,0 +1,225 @@
+"""
+Move organizations between dedicated and pooled tenancy
+
+    python -m app.migrations.tenancy_mode --to pooled [--organization NAME] [--dry-run]
+
+Each organization's documents are streamed into the other storage with the
+resumable CollectionCopier. Only when the new storage holds as many
+documents as the old one is the organization document switched over, and
+only then is the old storage removed. The switch records the old mode in
+the organization's tenancy_migration field until the old storage is gone.
+Re-running the migration after an interruption resumes copies from their
+checkpoints and finishes any pending removal. An organization whose
+documents share an _id with another tenant's cannot be pooled; it stays
+where it is and is counted as failed. Writes to an
+organization while it is being moved may be lost, so pause imports for the
+organizations being migrated. Running API processes may keep using the old
+storage until their organization cache TTL expires.
+"""
+from app.database.mongodb import async_mongodb
+from app.database.tenancy import DEDICATED, POOLED, TENANCY_MODES
+from app.services.collection_copier import CollectionCopier, CopyConflictError
+from app.services.database_service import COPY_CHECKPOINTS_COLLECTION, DatabaseService
+from app.config import settings
+from datetime import datetime
+from typing import Any, Dict, Optional
+import argparse
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Set on an organization between its switch and the removal of its old storage
+MIGRATION_FIELD = "tenancy_migration"
+
+
+async def _remove_old_storage(
+    organizations: Any,
+    database_service: DatabaseService,
+    org: Dict[str, Any]
+) -> bool:
+    """Drop the storage an organization was moved out of and clear its marker"""
+    old_org = {**org, "tenancy": org[MIGRATION_FIELD]["from"]}
+    removed = await database_service.drop_tenant_storage(old_org)
+    if not removed and old_org["tenancy"] == DEDICATED:
+        # An interrupted run may have dropped it before clearing the marker
+        removed = not await database_service.collection_exists(
+            old_org["collection_name"],
+            old_org.get("cluster")
+        )
+    if not removed:
+        logger.error(
+            f"Could not remove the {old_org['tenancy']} storage of "
+            f"{org['organization_name']}; re-run the migration to retry"
+        )
+        return False
+
+    await organizations.update_one({"_id": org["_id"]}, {"$unset": {MIGRATION_FIELD: ""}})
+    return True
+
+
+async def migrate_tenancy_mode(
+    target_mode: str,
+    organization_name: Optional[str] = None,
+    dry_run: bool = False
+) -> Dict[str, Any]:
+    """
+    Move organizations' data into the target tenancy mode
+
+    Args:
+        target_mode: dedicated or pooled
+        organization_name: Only migrate this organization
+        dry_run: Only report what would be moved
+
+    Returns:
+        Counts of migrated, already migrated and failed organizations, of
+        finished removals left over by an earlier run and of copied
+        documents
+    """
+    if target_mode not in TENANCY_MODES:
+        raise ValueError(f"Unknown tenancy mode: {target_mode}")
+
+    db = async_mongodb.get_database()
+    organizations = db["organizations"]
+    database_service = DatabaseService()
+    copier = CollectionCopier(
+        db[COPY_CHECKPOINTS_COLLECTION],
+        batch_size=settings.copy_batch_size
+    )
+    report = {
+        "migrated": 0,
+        "already_migrated": 0,
+        "failed": 0,
+        "cleaned_up": 0,
+        "documents": 0,
+        "dry_run": dry_run
+    }
+
+    if target_mode == POOLED and not dry_run:
+        await database_service._ensure_indexes()
+
+    query: Dict[str, Any] = {}
+    if organization_name:
+        query["organization_name"] = organization_name
+
+    cursor = organizations.find(
+        query,
+        {
+            "organization_name": 1,
+            "collection_name": 1,
+            "tenancy": 1,
+            "cluster": 1,
+            MIGRATION_FIELD: 1
+        }
+    )
+    async for org in cursor:
+        if org.get(MIGRATION_FIELD):
+            if dry_run:
+                logger.info(
+                    f"Would remove the {org[MIGRATION_FIELD]['from']} storage of "
+                    f"{org['organization_name']}"
+                )
+            elif not await _remove_old_storage(organizations, database_service, org):
+                report["failed"] += 1
+                continue
+            report["cleaned_up"] += 1
+
+        current_mode = org.get("tenancy", DEDICATED)
+        if current_mode == target_mode:
+            report["already_migrated"] += 1
+            continue
+
+        if dry_run:
+            logger.info(
+                f"Would move {org['organization_name']} from {current_mode} to {target_mode}"
+            )
+            report["migrated"] += 1
+            continue
+
+        target_org = {**org, "tenancy": target_mode}
+        # A dedicated collection that was never created has nothing to copy
+        has_data = current_mode == POOLED or await database_service.collection_exists(
+            org["collection_name"],
+            org.get("cluster")
+        )
+
+        if target_mode == DEDICATED:
+            await database_service.create_tenant_storage(target_org)
+        if has_data:
+            source = database_service.tenant_collection(org)
+            target = database_service.tenant_collection(target_org)
+            try:
+                result = await copier.copy(source, target)
+            except CopyConflictError as e:
+                logger.error(f"Not moving {org['organization_name']}: {e}")
+                report["failed"] += 1
+                continue
+
+            source_count = await source.count_documents({})
+            target_count = await target.count_documents({})
+            if target_count != source_count:
+                logger.error(
+                    f"Not moving {org['organization_name']}: {target_count} documents "
+                    f"in the {target_mode} storage, {source_count} in the {current_mode} one"
+                )
+                report["failed"] += 1
+                continue
+            report["documents"] += result.copied
+
+        now = datetime.utcnow()
+        update: Dict[str, Any] = {
+            "$set": {"tenancy": target_mode, "updated_at": now},
+            "$inc": {"version": 1}
+        }
+        if has_data:
+            update["$set"][MIGRATION_FIELD] = {
+                "from": current_mode,
+                "switched_at": now
+            }
+        await organizations.update_one({"_id": org["_id"]}, update)
+        if has_data:
+            await _remove_old_storage(
+                organizations,
+                database_service,
+                {**target_org, MIGRATION_FIELD: update["$set"][MIGRATION_FIELD]}
+            )
+
+        report["migrated"] += 1
+        logger.info(
+            f"Moved {org['organization_name']} from {current_mode} to {target_mode}"
+        )
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--to",
+        dest="target_mode",
+        required=True,
+        choices=TENANCY_MODES,
+        help="tenancy mode to move organizations into"
+    )
+    parser.add_argument(
+        "--organization",
+        help="only migrate the organization with this name"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="only report the organizations that would be moved"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    report = asyncio.run(migrate_tenancy_mode(
+        args.target_mode,
+        organization_name=args.organization,
+        dry_run=args.dry_run
+    ))
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,24 +2,39 @@ from app.models.organization import (
     OrganizationCreate,
     OrganizationUpdate,
     OrganizationResponse,
-    OrganizationInDB
+    OrganizationInDB,
+    BulkOrganizationResult,
+    BulkOrganizationResponse,
+    OrganizationListItem,
+    OrganizationListResponse,
+    TenantImportResponse
 )
 from app.models.admin import (
     AdminCreate,
     AdminLogin,
+    AdminRefresh,
     AdminInDB,
     TokenResponse,
     TokenData
 )
+from app.models.job import JobAccepted, JobStatusResponse
 
 __all__ = [
     "OrganizationCreate",
     "OrganizationUpdate",
     "OrganizationResponse",
     "OrganizationInDB",
+    "BulkOrganizationResult",
+    "BulkOrganizationResponse",
+    "OrganizationListItem",
+    "OrganizationListResponse",
+    "TenantImportResponse",
     "AdminCreate",
     "AdminLogin",
+    "AdminRefresh",
     "AdminInDB",
     "TokenResponse",
-    "TokenData"
+    "TokenData",
+    "JobAccepted",
+    "JobStatusResponse"
 ]
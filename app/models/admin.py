@@ -22,10 +22,15 @@ class AdminInDB(BaseModel):
     is_active: bool = True
 
 
+class AdminRefresh(BaseModel):
+    refresh_token: str
+
+
 class TokenResponse(BaseModel):
     access_token: str
     token_type: str = "bearer"
     expires_in: int
+    refresh_token: Optional[str] = None
 
 
 class TokenData(BaseModel):
@@ -33,3 +38,4 @@ class TokenData(BaseModel):
     email: str
     organization_id: str
     exp: Optional[datetime] = None
+    jti: Optional[str] = None
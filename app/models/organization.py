@@ -1,9 +1,13 @@
-from pydantic import BaseModel, EmailStr, Field, field_validator
+from pydantic import BaseModel, BeforeValidator, EmailStr, Field, field_validator
 from datetime import datetime
-from typing import Optional
+from typing import Annotated, List, Optional
 import re
 
 
+# ObjectId values read from MongoDB, exposed as strings
+ObjectIdStr = Annotated[str, BeforeValidator(str)]
+
+
 class OrganizationCreate(BaseModel):
     organization_name: str = Field(..., min_length=3, max_length=50)
     email: EmailStr
@@ -48,18 +52,19 @@ class OrganizationUpdate(BaseModel):
 
 
 class OrganizationResponse(BaseModel):
-    id: str = Field(..., alias="_id")
+    id: ObjectIdStr = Field(..., alias="_id")
     organization_name: str
     collection_name: str
+    admin_id: Optional[str] = None
     admin_email: str
     created_at: datetime
     updated_at: Optional[datetime] = None
+    tenancy: str = "dedicated"
+    cluster: str = "default"
+    version: int = 0
     
     class Config:
         populate_by_name = True
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
 
 
 class OrganizationInDB(BaseModel):
@@ -68,3 +73,42 @@ class OrganizationInDB(BaseModel):
     admin_id: str
     created_at: datetime
     updated_at: Optional[datetime] = None
+
+
+class BulkOrganizationResult(BaseModel):
+    index: int
+    organization_name: Optional[str] = None
+    success: bool
+    organization_id: Optional[str] = None
+    collection_name: Optional[str] = None
+    error: Optional[str] = None
+
+
+class BulkOrganizationResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[BulkOrganizationResult]
+
+
+class OrganizationListItem(BaseModel):
+    id: ObjectIdStr = Field(..., alias="_id")
+    organization_name: Optional[str] = None
+    collection_name: Optional[str] = None
+    admin_email: Optional[str] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    tenancy: Optional[str] = None
+    cluster: Optional[str] = None
+    
+    class Config:
+        populate_by_name = True
+
+
+class OrganizationListResponse(BaseModel):
+    items: List[OrganizationListItem]
+    next_cursor: Optional[str] = None
+
+
+class TenantImportResponse(BaseModel):
+    inserted: int
+    failed: int
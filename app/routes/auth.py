@@ -1,17 +1,59 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Request, Response, status
 from fastapi.security import OAuth2PasswordRequestForm
+from typing import Optional
+from app.models.admin import AdminLogin, AdminRefresh, TokenData, TokenResponse
 from app.services.auth_service import AuthService
+from app.services.container import get_auth_service, get_token_revocation_service
+from app.services.token_revocation_service import TokenRevocationService
 from app.utils.security import get_current_admin
 
 router = APIRouter(prefix="/admin", tags=["Admin Authentication"])
 
 
-@router.post("/login")
-async def admin_login(payload: dict, service: AuthService = Depends()):
-    token = await service.login(payload)
-    return token
+@router.post("/login", response_model=TokenResponse)
+async def admin_login(
+    payload: AdminLogin,
+    request: Request,
+    service: AuthService = Depends(get_auth_service),
+):
+    client_ip = request.client.host if request.client else None
+    admin = await service.authenticate_admin(payload, client_ip)
+    if not admin:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid email or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return await service.generate_tokens(admin)
 
 
-@router.get("/me")
+@router.post("/refresh", response_model=TokenResponse)
+async def refresh_tokens(
+    payload: AdminRefresh,
+    service: AuthService = Depends(get_auth_service),
+):
+    tokens = await service.refresh(payload.refresh_token)
+    if not tokens:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return tokens
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT, response_class=Response)
+async def admin_logout(
+    payload: Optional[AdminRefresh] = Body(None),
+    admin=Depends(get_current_admin),
+    service: AuthService = Depends(get_auth_service),
+    revocations: TokenRevocationService = Depends(get_token_revocation_service),
+):
+    # Without a refresh token every session of the admin is ended
+    await service.revoke_sessions(admin.admin_id, payload.refresh_token if payload else None)
+    await revocations.revoke(admin)
+
+
+@router.get("/me", response_model=TokenData)
 async def get_current_admin_info(admin=Depends(get_current_admin)):
     return admin
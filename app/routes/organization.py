@@ -1,53 +1,267 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from typing import Optional
 from app.services.organization_service import OrganizationService
-from app.models.organization import OrganizationCreate, OrganizationUpdate
-from app.utils.security import get_current_admin
+from app.services.job_service import JobService
+from app.services.container import (
+    get_database_service,
+    get_job_service,
+    get_organization_service
+)
+from app.services.database_service import DatabaseService
+from app.models.organization import (
+    OrganizationCreate,
+    OrganizationUpdate,
+    BulkOrganizationResponse,
+    OrganizationListResponse,
+    OrganizationResponse,
+    TenantImportResponse
+)
+from app.models.job import JobAccepted, JobStatusResponse
+from app.utils.security import get_current_admin, require_admin_or_operator, require_operator
+from app.utils.http_cache import http_date, is_not_modified, organization_etag
+from app.utils.tenant_io import (
+    MEDIA_TYPES,
+    TenantImportError,
+    content_encoding_is_gzip,
+    decode_stream,
+    encode_stream
+)
+from app.config import settings
+import orjson
 
 router = APIRouter(prefix="/org", tags=["Organization"])
 
 
-@router.post("/create", status_code=201)
+def job_accepted(job_id: str) -> JobAccepted:
+    return JobAccepted(
+        job_id=job_id,
+        status="queued",
+        status_url=f"{router.prefix}/jobs/{job_id}"
+    )
+
+
+@router.post("/create", status_code=201, response_model=OrganizationResponse)
 async def create_organization(
     payload: OrganizationCreate,
-    service: OrganizationService = Depends(),
+    service: OrganizationService = Depends(get_organization_service),
 ):
-    org = service.create_organization(payload)
+    org = await service.create_organization(payload)
     if not org:
         raise HTTPException(status_code=400, detail="Organization already exists")
     return org
 
 
-@router.get("/get")
+async def read_limited_body(request: Request, max_bytes: int) -> bytes:
+    """Read a request body, refusing it as soon as it exceeds max_bytes"""
+    too_large = HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Request body is limited to {max_bytes} bytes"
+    )
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+        raise too_large
+    
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > max_bytes:
+            raise too_large
+    return bytes(body)
+
+
+@router.post(
+    "/bulk_create",
+    response_model=BulkOrganizationResponse,
+    dependencies=[Depends(require_operator)],
+    openapi_extra={"requestBody": {
+        "required": True,
+        "content": {"application/json": {"schema": {
+            "type": "array",
+            "items": OrganizationCreate.model_json_schema()
+        }}}
+    }}
+)
+async def bulk_create_organizations(
+    request: Request,
+    service: OrganizationService = Depends(get_organization_service),
+):
+    # The body is read by hand so its size is checked before it is parsed,
+    # and so an invalid item fails alone rather than the whole batch
+    body = await read_limited_body(request, settings.bulk_create_max_bytes)
+    try:
+        payload = orjson.loads(body)
+    except orjson.JSONDecodeError:
+        payload = None
+    if not isinstance(payload, list):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Body must be a JSON array of organizations"
+        )
+    # A batch larger than the throttle's burst could never be let through
+    max_items = min(settings.bulk_create_max_items, settings.bulk_create_items_burst)
+    if len(payload) > max_items:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {max_items} organizations per request"
+        )
+    
+    client_ip = request.client.host if request.client else None
+    results = await service.bulk_create_organizations(payload, client_ip)
+    created = sum(1 for result in results if result.success)
+    return BulkOrganizationResponse(
+        created=created,
+        failed=len(results) - created,
+        results=results
+    )
+
+
+@router.get(
+    "/get",
+    response_model=OrganizationResponse,
+    responses={304: {"description": "Not modified since the given ETag or date"}}
+)
 async def get_organization(
     organization_name: str,
-    service: OrganizationService = Depends(),
+    request: Request,
+    response: Response,
+    service: OrganizationService = Depends(get_organization_service),
 ):
-    org = service.get_organization_by_name(organization_name)
+    org = await service.get_organization_by_name(organization_name)
     if not org:
         raise HTTPException(status_code=404, detail="Organization not found")
+    
+    last_modified = org.get("updated_at") or org["created_at"]
+    validators = {
+        "ETag": organization_etag(org),
+        "Last-Modified": http_date(last_modified),
+        # Clients may keep the response but must check it before reuse
+        "Cache-Control": "no-cache"
+    }
+    if is_not_modified(request.headers, validators["ETag"], last_modified):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=validators)
+    response.headers.update(validators)
     return org
 
 
-@router.put("/update")
+@router.get("/list", response_model=OrganizationListResponse)
+async def list_organizations(
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    name_prefix: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma separated fields to return"),
+    operator: bool = Depends(require_admin_or_operator),
+    service: OrganizationService = Depends(get_organization_service),
+):
+    try:
+        orgs, next_cursor = await service.list_organizations(
+            limit=limit,
+            cursor=cursor,
+            name_prefix=name_prefix,
+            fields=[field.strip() for field in fields.split(",")] if fields else None,
+            operator=operator
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return OrganizationListResponse(items=orgs, next_cursor=next_cursor)
+
+
+@router.put("/update", status_code=status.HTTP_202_ACCEPTED, response_model=JobAccepted)
 async def update_organization(
     old_org_name: str,
     payload: OrganizationUpdate,
     admin=Depends(get_current_admin),
-    service: OrganizationService = Depends(),
+    service: OrganizationService = Depends(get_organization_service),
 ):
-    updated = service.update_organization(old_org_name, payload, admin["id"])
-    if not updated:
+    job_id = await service.submit_organization_update(old_org_name, payload, admin.admin_id)
+    if not job_id:
         raise HTTPException(status_code=400, detail="Update failed")
-    return updated
+    return job_accepted(job_id)
 
 
-@router.delete("/delete")
+@router.delete("/delete", status_code=status.HTTP_202_ACCEPTED, response_model=JobAccepted)
 async def delete_organization(
     organization_name: str,
     admin=Depends(get_current_admin),
-    service: OrganizationService = Depends(),
+    service: OrganizationService = Depends(get_organization_service),
 ):
-    deleted = service.delete_organization(organization_name, admin["id"])
-    if not deleted:
+    job_id = await service.submit_organization_delete(organization_name, admin.admin_id)
+    if not job_id:
         raise HTTPException(status_code=400, detail="Delete failed")
-    return {"success": True}
+    return job_accepted(job_id)
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatusResponse)
+async def get_job_status(
+    job_id: str,
+    admin=Depends(get_current_admin),
+    jobs: JobService = Depends(get_job_service),
+):
+    job = await jobs.get_job(job_id)
+    if not job or job.get("owner_id") != admin.admin_id:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return JobStatusResponse(job_id=str(job["_id"]), **job)
+
+
+@router.get("/export")
+async def export_organization_data(
+    organization_name: str,
+    fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|bson)$"),
+    gzip: bool = False,
+    admin=Depends(get_current_admin),
+    service: OrganizationService = Depends(get_organization_service),
+    database: DatabaseService = Depends(get_database_service),
+):
+    org = await service.get_owned_organization(organization_name, admin.admin_id)
+    if not org:
+        raise HTTPException(status_code=404, detail="Organization not found")
+    
+    headers = {
+        "Content-Disposition": (
+            f'attachment; filename="{organization_name}.{fmt}"'
+        )
+    }
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    
+    return StreamingResponse(
+        encode_stream(
+            database.iter_raw_documents(org),
+            fmt,
+            gzip=gzip,
+            chunk_bytes=settings.export_chunk_bytes
+        ),
+        media_type=MEDIA_TYPES[fmt],
+        headers=headers
+    )
+
+
+@router.post("/import", response_model=TenantImportResponse)
+async def import_organization_data(
+    organization_name: str,
+    request: Request,
+    fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|bson)$"),
+    admin=Depends(get_current_admin),
+    service: OrganizationService = Depends(get_organization_service),
+    database: DatabaseService = Depends(get_database_service),
+):
+    org = await service.get_owned_organization(organization_name, admin.admin_id)
+    if not org:
+        raise HTTPException(status_code=404, detail="Organization not found")
+    
+    documents = decode_stream(
+        request.stream(),
+        fmt,
+        gzip=content_encoding_is_gzip(request.headers.get("content-encoding"))
+    )
+    try:
+        counts = await database.insert_stream(org, documents)
+    except TenantImportError as e:
+        detail = str(e)
+        if e.counts:
+            detail += (
+                f"; {e.counts['inserted']} documents imported before the error "
+                f"were kept"
+            )
+        raise HTTPException(status_code=400, detail=detail)
+    return counts
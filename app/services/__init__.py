@@ -1,9 +1,40 @@
 from app.services.organization_service import OrganizationService
 from app.services.auth_service import AuthService
 from app.services.database_service import DatabaseService
+from app.services.collection_copier import CollectionCopier, CopyProgress
+from app.services.cluster_placement import ClusterPlacement
+from app.services.container import (
+    ServiceContainer,
+    services,
+    get_auth_service,
+    get_database_service,
+    get_job_service,
+    get_organization_service,
+    get_token_revocation_service
+)
+from app.services.job_service import JobService, JobStatus
+from app.services.token_revocation_service import TokenRevocationService
+from app.services.refresh_token_service import RefreshTokenService
+from app.services.sync_facade import SyncServiceFacade, SyncServices
 
 __all__ = [
     "OrganizationService",
     "AuthService",
-    "DatabaseService"
+    "DatabaseService",
+    "CollectionCopier",
+    "CopyProgress",
+    "ClusterPlacement",
+    "ServiceContainer",
+    "services",
+    "get_auth_service",
+    "get_database_service",
+    "get_job_service",
+    "JobService",
+    "JobStatus",
+    "get_organization_service",
+    "get_token_revocation_service",
+    "TokenRevocationService",
+    "RefreshTokenService",
+    "SyncServiceFacade",
+    "SyncServices"
 ]
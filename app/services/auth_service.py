@@ -1,10 +1,16 @@
-from app.database.mongodb import mongodb
+from app.database.mongodb import async_mongodb
+from app.database.indexes import IndexReport, reconcile_indexes
+from app.database.bulk import insert_many_unordered
 from app.models.admin import AdminCreate, AdminLogin, TokenResponse, AdminInDB
-from app.utils.security import security_manager
+from app.services.refresh_token_service import RefreshTokenService
+from app.services.login_throttle import LoginThrottle, LoginThrottled, build_login_throttle
+from app.utils.security import security_manager, PasswordHashPoolBusy
 from app.config import settings
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, List, Optional, Set
 from bson import ObjectId
+from pymongo import IndexModel
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,19 +19,27 @@ logger = logging.getLogger(__name__)
 class AuthService:
     """Service for authentication operations"""
     
-    def __init__(self):
-        self.db = mongodb.get_database()
+    def __init__(
+        self,
+        refresh_tokens: Optional[RefreshTokenService] = None,
+        login_throttle: Optional[LoginThrottle] = None
+    ):
+        self.db = async_mongodb.get_database()
         self.admins_collection = self.db["admins"]
-        self._ensure_indexes()
+        self.refresh_tokens = refresh_tokens or RefreshTokenService()
+        self.login_throttle = login_throttle or build_login_throttle()
+        self._rehash_tasks: Set[asyncio.Task] = set()
     
-    def _ensure_indexes(self):
+    async def _ensure_indexes(self) -> IndexReport:
         """Ensure required indexes exist"""
-        # Create unique index on email
-        self.admins_collection.create_index("email", unique=True)
-        # Create index on organization_id
-        self.admins_collection.create_index("organization_id")
+        return await reconcile_indexes(self.admins_collection, [
+            # Unique index on email
+            IndexModel("email", unique=True),
+            # Index on organization_id
+            IndexModel("organization_id"),
+        ])
     
-    def create_admin(self, admin_data: AdminCreate) -> Optional[str]:
+    async def create_admin(self, admin_data: AdminCreate) -> Optional[str]:
         """
         Create a new admin user
         
@@ -37,17 +51,14 @@ class AuthService:
         """
         try:
             # Check if admin with email already exists
-            logger.info(f"Checking if admin with email {admin_data.email} already exists...")
-            existing_admin = self.admins_collection.find_one({"email": admin_data.email})
+            existing_admin = await self.admins_collection.find_one({"email": admin_data.email})
             
             if existing_admin:
-                logger.warning(f"Admin with email {admin_data.email} already exists. ID: {existing_admin['_id']}")
+                logger.warning("Admin with email %s already exists", admin_data.email)
                 return None
 
             # Hash password
-            logger.info(f"Hashing password for admin with email: {admin_data.email}")
-            hashed_password = security_manager.hash_password(admin_data.password)
-            logger.info(f"Password hashed successfully for {admin_data.email}")
+            hashed_password = await security_manager.hash_password_async(admin_data.password)
 
             # Create admin document
             admin_doc = {
@@ -59,58 +70,185 @@ class AuthService:
             }
 
             # Insert admin into the database
-            logger.info(f"Inserting admin document into database: {admin_doc}")
-            result = self.admins_collection.insert_one(admin_doc)
+            result = await self.admins_collection.insert_one(admin_doc)
             
             # Verify that the admin was inserted
             if not result.acknowledged:
                 logger.error(f"Failed to insert admin with email {admin_data.email}")
                 return None
             
-            logger.info(f"Admin created successfully with ID: {result.inserted_id}")
+            logger.info(
+                "Admin %s created",
+                result.inserted_id,
+                extra={"event": "admin.created", "organization_id": admin_data.organization_id}
+            )
             return str(result.inserted_id)
         
+        except PasswordHashPoolBusy:
+            raise
         except Exception as e:
             logger.error(f"Error creating admin: {e}")
             return None
 
     
-    def authenticate_admin(self, login_data: AdminLogin) -> Optional[dict]:
+    async def insert_admins(self, admin_docs: List[dict]) -> Dict[int, str]:
+        """
+        Insert prepared admin documents in one unordered bulk write
+        
+        Args:
+            admin_docs: Admin documents with _id and hashed_password set
+            
+        Returns:
+            Position of every admin that was not inserted, mapped to the reason
+        """
+        return await insert_many_unordered(self.admins_collection, admin_docs)
+    
+    async def find_existing_emails(self, emails: List[str]) -> Set[str]:
+        """
+        Find which of the given emails already belong to an admin
+        
+        Args:
+            emails: Emails to check
+            
+        Returns:
+            Set of emails already in use
+        """
+        cursor = self.admins_collection.find(
+            {"email": {"$in": emails}},
+            {"_id": 0, "email": 1}
+        )
+        return {admin["email"] async for admin in cursor}
+    
+    async def authenticate_admin(
+        self,
+        login_data: AdminLogin,
+        client_ip: Optional[str] = None
+    ) -> Optional[dict]:
         """
         Authenticate an admin user
         
         Args:
             login_data: Login credentials
+            client_ip: Address the attempt came from, for throttling
             
         Returns:
             Admin document if authenticated, None otherwise
+            
+        Raises:
+            LoginThrottled: If the attempt is rejected before any lookup
+                or hashing
+        """
+        try:
+            # Throttled attempts never reach the database or bcrypt
+            if self.login_throttle is not None:
+                await self.login_throttle.check(login_data.email, client_ip)
+            
+            admin = await self._verify_credentials(login_data)
+            if admin is not None:
+                self._schedule_rehash(admin, login_data.password)
+            
+            if self.login_throttle is not None:
+                if admin is None:
+                    await self.login_throttle.record_failure(login_data.email)
+                else:
+                    await self.login_throttle.record_success(login_data.email)
+            
+            return admin
+        except (PasswordHashPoolBusy, LoginThrottled):
+            raise
+        except Exception as e:
+            logger.error(f"Error authenticating admin: {e}")
+            return None
+    
+    async def _verify_credentials(self, login_data: AdminLogin) -> Optional[dict]:
+        """
+        Check an admin's email and password
+        
+        Args:
+            login_data: Login credentials
+            
+        Returns:
+            Admin document if the credentials are valid, None otherwise
         """
         try:
             # Find admin by email
-            admin = self.admins_collection.find_one({"email": login_data.email})
+            admin = await self.admins_collection.find_one({"email": login_data.email})
             
             if not admin:
-                logger.warning(f"Admin not found: {login_data.email}")
+                logger.warning(
+                    "Admin not found: %s",
+                    login_data.email,
+                    extra={"event": "auth.failed", "reason": "unknown_email"}
+                )
                 return None
             
             # Verify password
-            if not security_manager.verify_password(
+            if not await security_manager.verify_password_async(
                 login_data.password,
                 admin["hashed_password"]
             ):
-                logger.warning(f"Invalid password for admin: {login_data.email}")
+                logger.warning(
+                    "Invalid password for admin: %s",
+                    login_data.email,
+                    extra={"event": "auth.failed", "reason": "invalid_password", "admin_id": str(admin["_id"])}
+                )
                 return None
             
             # Check if admin is active
             if not admin.get("is_active", True):
-                logger.warning(f"Inactive admin attempted login: {login_data.email}")
+                logger.warning(
+                    "Inactive admin attempted login: %s",
+                    login_data.email,
+                    extra={"event": "auth.failed", "reason": "inactive", "admin_id": str(admin["_id"])}
+                )
                 return None
             
             return admin
+        except PasswordHashPoolBusy:
+            raise
         except Exception as e:
             logger.error(f"Error authenticating admin: {e}")
             return None
     
+    def _schedule_rehash(self, admin: dict, password: str):
+        """
+        Upgrade a stale password hash in the background
+        
+        The login response does not wait for the new hash; if the pool is
+        busy the hash is upgraded on a later login instead.
+        
+        Args:
+            admin: Authenticated admin document
+            password: Password the admin just logged in with
+        """
+        if not security_manager.password_needs_rehash(admin["hashed_password"]):
+            return
+        task = asyncio.create_task(
+            self._rehash_password(admin["_id"], admin["hashed_password"], password)
+        )
+        self._rehash_tasks.add(task)
+        task.add_done_callback(self._rehash_tasks.discard)
+    
+    async def _rehash_password(
+        self,
+        admin_id: ObjectId,
+        old_hash: str,
+        password: str
+    ):
+        try:
+            new_hash = await security_manager.hash_password_async(password)
+            # Only replace the hash that was verified, never a newer password
+            result = await self.admins_collection.update_one(
+                {"_id": admin_id, "hashed_password": old_hash},
+                {"$set": {"hashed_password": new_hash}}
+            )
+            if result.modified_count:
+                logger.info("Rehashed password of admin %s", admin_id, extra={"event": "admin.rehashed"})
+        except PasswordHashPoolBusy:
+            logger.info("Hash pool busy, rehash of admin %s postponed", admin_id)
+        except Exception as e:
+            logger.error(f"Error rehashing password of admin {admin_id}: {e}")
+    
     def generate_token(self, admin: dict) -> TokenResponse:
         """
         Generate JWT token for authenticated admin
@@ -139,7 +277,79 @@ class AuthService:
             expires_in=settings.jwt_expiration_minutes * 60  # in seconds
         )
     
-    def get_admin_by_id(self, admin_id: str) -> Optional[dict]:
+    async def generate_tokens(
+        self,
+        admin: dict,
+        family_id: Optional[str] = None
+    ) -> TokenResponse:
+        """
+        Generate an access token together with a refresh token
+        
+        Args:
+            admin: Admin document, or the claims of a consumed refresh token
+            family_id: Refresh token family being rotated, if any
+            
+        Returns:
+            TokenResponse with access and refresh tokens
+        """
+        tokens = self.generate_token(admin)
+        tokens.refresh_token = await self.refresh_tokens.issue(
+            {
+                "admin_id": str(admin["_id"]),
+                "email": admin["email"],
+                "organization_id": admin["organization_id"]
+            },
+            family_id=family_id
+        )
+        return tokens
+    
+    async def refresh(self, refresh_token: str) -> Optional[TokenResponse]:
+        """
+        Exchange a refresh token for new tokens without a password check
+        
+        Args:
+            refresh_token: Refresh token from a previous login or refresh
+            
+        Returns:
+            New access and refresh tokens, or None if the refresh token is
+            invalid, expired or was already used
+        """
+        try:
+            record = await self.refresh_tokens.consume(refresh_token)
+            if record is None:
+                return None
+            
+            admin = {
+                "_id": record["admin_id"],
+                "email": record["email"],
+                "organization_id": record["organization_id"]
+            }
+            return await self.generate_tokens(admin, family_id=record["family_id"])
+        except Exception as e:
+            logger.error(f"Error refreshing tokens: {e}")
+            return None
+    
+    async def revoke_sessions(
+        self,
+        admin_id: str,
+        refresh_token: Optional[str] = None
+    ) -> int:
+        """
+        Revoke refresh tokens at logout
+        
+        Args:
+            admin_id: Admin logging out
+            refresh_token: Refresh token of the session to end; every
+                session of the admin is ended when omitted
+            
+        Returns:
+            Number of revoked refresh tokens
+        """
+        if refresh_token:
+            return await self.refresh_tokens.revoke_family(refresh_token, admin_id)
+        return await self.refresh_tokens.revoke_admin(admin_id)
+    
+    async def get_admin_by_id(self, admin_id: str) -> Optional[dict]:
         """
         Get admin by ID
         
@@ -150,13 +360,33 @@ class AuthService:
             Admin document if found, None otherwise
         """
         try:
-            admin = self.admins_collection.find_one({"_id": ObjectId(admin_id)})
+            admin = await self.admins_collection.find_one({"_id": ObjectId(admin_id)})
             return admin
         except Exception as e:
             logger.error(f"Error getting admin by ID: {e}")
             return None
     
-    def get_admin_by_email(self, email: str) -> Optional[dict]:
+    async def get_admin_email(self, admin_id: str) -> Optional[str]:
+        """
+        Get only the email of an admin
+        
+        Args:
+            admin_id: Admin ID
+            
+        Returns:
+            Admin email if found, None otherwise
+        """
+        try:
+            admin = await self.admins_collection.find_one(
+                {"_id": ObjectId(admin_id)},
+                {"_id": 0, "email": 1}
+            )
+            return admin["email"] if admin else None
+        except Exception as e:
+            logger.error(f"Error getting admin email: {e}")
+            return None
+    
+    async def get_admin_by_email(self, email: str) -> Optional[dict]:
         """
         Get admin by email
         
@@ -167,13 +397,13 @@ class AuthService:
             Admin document if found, None otherwise
         """
         try:
-            admin = self.admins_collection.find_one({"email": email})
+            admin = await self.admins_collection.find_one({"email": email})
             return admin
         except Exception as e:
             logger.error(f"Error getting admin by email: {e}")
             return None
     
-    def update_admin_password(
+    async def update_admin_password(
         self,
         admin_id: str,
         new_password: str
@@ -189,19 +419,120 @@ class AuthService:
             True if updated successfully, False otherwise
         """
         try:
-            hashed_password = security_manager.hash_password(new_password)
+            hashed_password = await security_manager.hash_password_async(new_password)
+            return await self.set_admin_password_hash(admin_id, hashed_password)
+        except PasswordHashPoolBusy:
+            raise
+        except Exception as e:
+            logger.error(f"Error updating admin password: {e}")
+            return False
+    
+    async def set_admin_password_hash(
+        self,
+        admin_id: str,
+        hashed_password: str
+    ) -> bool:
+        """
+        Store an already hashed admin password
+        
+        Args:
+            admin_id: Admin ID
+            hashed_password: bcrypt hash of the new password
             
-            result = self.admins_collection.update_one(
+        Returns:
+            True if updated successfully, False otherwise
+        """
+        try:
+            result = await self.admins_collection.update_one(
                 {"_id": ObjectId(admin_id)},
                 {"$set": {"hashed_password": hashed_password}}
             )
+            # Sessions started with the old password must log in again
+            await self.refresh_tokens.revoke_admin(admin_id)
             
             return result.modified_count > 0
         except Exception as e:
-            logger.error(f"Error updating admin password: {e}")
+            logger.error(f"Error setting admin password: {e}")
+            return False
+    
+    async def stage_password_hash(
+        self,
+        admin_id: str,
+        change_id: str,
+        hashed_password: str
+    ) -> bool:
+        """
+        Store a password hash on the admin without putting it in use
+        
+        Args:
+            admin_id: Admin ID
+            change_id: Key that apply_staged_password must present
+            hashed_password: bcrypt hash of the new password
+            
+        Returns:
+            True if staged, False otherwise
+        """
+        try:
+            result = await self.admins_collection.update_one(
+                {"_id": ObjectId(admin_id)},
+                {"$set": {"pending_password": {
+                    "change_id": change_id,
+                    "hashed_password": hashed_password
+                }}}
+            )
+            return result.matched_count > 0
+        except Exception as e:
+            logger.error(f"Error staging admin password: {e}")
+            return False
+    
+    async def apply_staged_password(self, admin_id: str, change_id: str) -> bool:
+        """
+        Put a staged password hash in use and end the admin's sessions
+        
+        Args:
+            admin_id: Admin ID
+            change_id: Key the hash was staged with
+            
+        Returns:
+            True if the hash was applied, False if it is no longer staged
+        """
+        query = {"_id": ObjectId(admin_id), "pending_password.change_id": change_id}
+        admin = await self.admins_collection.find_one(query, {"pending_password": 1})
+        if admin is None:
             return False
+        
+        await self.admins_collection.update_one(
+            query,
+            {
+                "$set": {"hashed_password": admin["pending_password"]["hashed_password"]},
+                "$unset": {"pending_password": ""}
+            }
+        )
+        # Sessions started with the old password must log in again
+        await self.refresh_tokens.revoke_admin(admin_id)
+        return True
+    
+    async def discard_staged_password(self, admin_id: str, change_id: str):
+        """Drop a staged password hash whose update will not be applied"""
+        await self.admins_collection.update_one(
+            {"_id": ObjectId(admin_id), "pending_password.change_id": change_id},
+            {"$unset": {"pending_password": ""}}
+        )
+    
+    async def delete_admins(self, admin_ids: List[ObjectId]) -> int:
+        """
+        Delete admins that were just inserted, to roll back a bulk create
+        
+        Args:
+            admin_ids: IDs of the admin documents
+            
+        Returns:
+            Number of deleted admins
+        """
+        result = await self.admins_collection.delete_many({"_id": {"$in": admin_ids}})
+        return result.deleted_count
     
-    def delete_admin(self, admin_id: str) -> bool:
+    async def delete_admin(self, admin_id: str) -> bool:
         """
         Delete an admin user
         
@@ -212,7 +543,8 @@ class AuthService:
             True if deleted successfully, False otherwise
         """
         try:
-            result = self.admins_collection.delete_one({"_id": ObjectId(admin_id)})
+            result = await self.admins_collection.delete_one({"_id": ObjectId(admin_id)})
+            await self.refresh_tokens.revoke_admin(admin_id)
             return result.deleted_count > 0
         except Exception as e:
             logger.error(f"Error deleting admin: {e}")
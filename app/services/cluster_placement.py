@@ -0,0 +1,110 @@
+from app.database.clusters import DEFAULT_CLUSTER, ClusterRegistry
+from app.config import settings
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorCollection
+from typing import Dict, List, Optional
+import hashlib
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+LEAST_LOADED = "least_loaded"
+HASH = "hash"
+
+
+class ClusterPlacement:
+    """
+    Chooses the cluster a new organization's data is stored on
+
+    ``hash`` maps the organization ID onto the candidate clusters, so the
+    choice needs no I/O. ``least_loaded`` picks the candidate holding the
+    fewest organizations; counts are loaded with one aggregation at most
+    every ``refresh_seconds`` and bumped locally for every placement in
+    between. Placements are stored on the organization document, so
+    changing the policy or the candidates never moves existing tenants.
+    """
+
+    def __init__(
+        self,
+        organizations: AsyncIOMotorCollection,
+        registry: ClusterRegistry,
+        policy: str = LEAST_LOADED,
+        candidates: Optional[List[str]] = None,
+        refresh_seconds: float = 60.0
+    ):
+        self.organizations = organizations
+        self.policy = policy
+        self.candidates = candidates or registry.names()
+        unknown = set(self.candidates) - set(registry.names())
+        if unknown:
+            raise ValueError(f"Unknown placement clusters: {', '.join(sorted(unknown))}")
+        self.refresh_seconds = refresh_seconds
+        self._counts: Dict[str, int] = {}
+        self._loaded_at: Optional[float] = None
+
+    async def choose(self, org_id: ObjectId) -> str:
+        """
+        Pick the cluster for a new organization
+
+        Args:
+            org_id: ID the organization will be created with
+
+        Returns:
+            Cluster name
+        """
+        return (await self.choose_many([org_id]))[0]
+
+    async def choose_many(self, org_ids: List[ObjectId]) -> List[str]:
+        """Pick clusters for several new organizations, balancing across them"""
+        if len(self.candidates) == 1:
+            return [self.candidates[0]] * len(org_ids)
+
+        if self.policy == HASH:
+            return [self._hash(org_id) for org_id in org_ids]
+
+        if self._loaded_at is None or time.monotonic() - self._loaded_at > self.refresh_seconds:
+            await self._load_counts()
+
+        placements = []
+        for _ in org_ids:
+            cluster = min(self.candidates, key=lambda name: (self._counts.get(name, 0), name))
+            self._counts[cluster] = self._counts.get(cluster, 0) + 1
+            placements.append(cluster)
+        return placements
+
+    def forget(self, cluster: str):
+        """Account for an organization removed from a cluster"""
+        if self._counts.get(cluster):
+            self._counts[cluster] -= 1
+
+    def _hash(self, org_id: ObjectId) -> str:
+        digest = hashlib.sha256(str(org_id).encode()).digest()
+        return self.candidates[int.from_bytes(digest[:8], "big") % len(self.candidates)]
+
+    async def _load_counts(self):
+        # Each count is answered from the cluster index alone
+        counts: Dict[str, int] = {}
+        for cluster in self.candidates:
+            query = {"cluster": cluster}
+            if cluster == DEFAULT_CLUSTER:
+                # Organizations created before placement have no cluster
+                query = {"cluster": {"$in": [DEFAULT_CLUSTER, None]}}
+            counts[cluster] = await self.organizations.count_documents(query)
+        self._counts = counts
+        self._loaded_at = time.monotonic()
+        logger.info(f"Organizations per cluster: {counts}")
+
+
+def build_cluster_placement(
+    organizations: AsyncIOMotorCollection,
+    registry: ClusterRegistry
+) -> ClusterPlacement:
+    """Create the placement policy configured in Settings"""
+    return ClusterPlacement(
+        organizations,
+        registry,
+        policy=settings.placement_policy,
+        candidates=settings.placement_clusters or None,
+        refresh_seconds=settings.placement_refresh_seconds
+    )
@@ -0,0 +1,222 @@
+from app.database.bulk import DUPLICATE_KEY_ERROR
+from app.database.clusters import ClusterRegistry, cluster_registry
+from app.database.tenancy import TenantCollection
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo.errors import BulkWriteError
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+import inspect
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CopyProgress:
+    """Where a copy stands; passed to progress callbacks after every batch"""
+    checkpoint_id: str
+    copied: int = 0
+    batches: int = 0
+    total: Optional[int] = None
+    last_id: Any = None
+    server_side: bool = False
+    done: bool = False
+
+
+class CopyConflictError(Exception):
+    """Raised when the target holds a copied _id that is not the source's document"""
+
+
+ProgressCallback = Callable[[CopyProgress], Union[None, Awaitable[None]]]
+AnyCollection = Union[AsyncIOMotorCollection, TenantCollection]
+
+
+class CollectionCopier:
+    """
+    Streams documents from one collection into another in resumable batches
+
+    Documents are read in ``_id`` order with a batched cursor and written with
+    unordered bulk inserts. After every batch the last copied ``_id`` is saved
+    to the checkpoint collection, so an interrupted copy resumes after it;
+    duplicates left over from a partially written batch are ignored once
+    they are found in the target. When
+    source and target are plain collections sharing a client the copy runs
+    server side with $merge. Tenant-scoped collections are copied through
+    the client so their tenant key is applied and stripped.
+    """
+
+    def __init__(
+        self,
+        checkpoints: AsyncIOMotorCollection,
+        batch_size: int = 1000,
+        registry: Optional[ClusterRegistry] = None
+    ):
+        self.checkpoints = checkpoints
+        self.batch_size = batch_size
+        self.cluster_registry = registry or cluster_registry
+
+    def _cluster_of(self, collection: AnyCollection) -> str:
+        client = collection.database.client
+        cluster = self.cluster_registry.name_of(client)
+        if cluster is None:
+            # Never share a checkpoint with another client's namespace; at
+            # worst an interrupted copy starts over, which is safe
+            return f"client-{id(client):x}"
+        return cluster
+
+    def checkpoint_id_for(self, source: AnyCollection, target: AnyCollection) -> str:
+        """Checkpoint key of a copy; namespaces are qualified by their cluster"""
+        return (
+            f"{self._cluster_of(source)}/{source.full_name}->"
+            f"{self._cluster_of(target)}/{target.full_name}"
+        )
+
+    async def copy(
+        self,
+        source: AnyCollection,
+        target: AnyCollection,
+        progress: Optional[ProgressCallback] = None,
+        server_side: Optional[bool] = None,
+        checkpoint_id: Optional[str] = None
+    ) -> CopyProgress:
+        """
+        Copy every document of source into target
+
+        Args:
+            source: Collection or TenantCollection to read from
+            target: Collection or TenantCollection to write to, on any
+                database or cluster
+            progress: Optional callback invoked after every batch
+            server_side: Force or forbid $merge; by default it is used when
+                two plain collections share a client
+            checkpoint_id: Key of the checkpoint; derived from the clusters
+                and namespaces when omitted
+
+        Returns:
+            Final CopyProgress of the copy
+
+        Raises:
+            CopyConflictError: If a document cannot be written because the
+                target collection holds its _id for another tenant
+        """
+        if server_side is None:
+            server_side = (
+                isinstance(source, AsyncIOMotorCollection)
+                and isinstance(target, AsyncIOMotorCollection)
+                and source.database.client is target.database.client
+            )
+
+        state = CopyProgress(
+            checkpoint_id=checkpoint_id or self.checkpoint_id_for(source, target),
+            total=await source.estimated_document_count(),
+            server_side=server_side
+        )
+
+        if server_side:
+            await self._merge(source, target)
+            state.copied = state.total or 0
+            state.done = True
+            await self._report(progress, state)
+            return state
+
+        checkpoint = await self.checkpoints.find_one({"_id": state.checkpoint_id})
+        query: Dict[str, Any] = {}
+        if checkpoint:
+            state.last_id = checkpoint["last_id"]
+            state.copied = checkpoint.get("copied", 0)
+            state.batches = checkpoint.get("batches", 0)
+            query = {"_id": {"$gt": state.last_id}}
+            logger.info(
+                f"Resuming copy {state.checkpoint_id} after {state.copied} documents"
+            )
+
+        cursor = source.find(query).sort("_id", 1).batch_size(self.batch_size)
+        batch: List[Dict[str, Any]] = []
+        async for document in cursor:
+            batch.append(document)
+            if len(batch) >= self.batch_size:
+                await self._write_batch(target, batch, state)
+                await self._report(progress, state)
+                batch = []
+
+        if batch:
+            await self._write_batch(target, batch, state)
+
+        state.done = True
+        await self.checkpoints.delete_one({"_id": state.checkpoint_id})
+        await self._report(progress, state)
+        logger.info(f"Copy {state.checkpoint_id} finished: {state.copied} documents")
+        return state
+
+    async def _merge(
+        self,
+        source: AsyncIOMotorCollection,
+        target: AsyncIOMotorCollection
+    ):
+        # Matching on _id makes a re-run after a failure safe
+        pipeline = [{
+            "$merge": {
+                "into": {"db": target.database.name, "coll": target.name},
+                "on": "_id",
+                "whenMatched": "keepExisting",
+                "whenNotMatched": "insert"
+            }
+        }]
+        async for _ in source.aggregate(pipeline, allowDiskUse=True):
+            pass
+
+    async def _write_batch(
+        self,
+        target: AnyCollection,
+        batch: List[Dict[str, Any]],
+        state: CopyProgress
+    ):
+        try:
+            await target.insert_many(batch, ordered=False)
+        except BulkWriteError as e:
+            errors = e.details.get("writeErrors", [])
+            if any(error.get("code") != DUPLICATE_KEY_ERROR for error in errors):
+                raise
+            await self._check_duplicates(
+                target,
+                [batch[error["index"]]["_id"] for error in errors]
+            )
+
+        state.copied += len(batch)
+        state.batches += 1
+        state.last_id = batch[-1]["_id"]
+        await self.checkpoints.update_one(
+            {"_id": state.checkpoint_id},
+            {"$set": {
+                "last_id": state.last_id,
+                "copied": state.copied,
+                "batches": state.batches,
+                "updated_at": datetime.utcnow()
+            }},
+            upsert=True
+        )
+
+    @staticmethod
+    async def _check_duplicates(target: AnyCollection, ids: List[Any]):
+        # Documents written before an interruption are already there. In the
+        # shared collection _id is unique across tenants, so a duplicate the
+        # target's own view cannot see belongs to another tenant.
+        found = {
+            document["_id"]
+            async for document in target.find({"_id": {"$in": ids}}, {"_id": 1})
+        }
+        missing = [document_id for document_id in ids if document_id not in found]
+        if missing:
+            raise CopyConflictError(
+                f"{len(missing)} documents collide with another tenant's _id in "
+                f"{target.full_name}, first {missing[0]!r}"
+            )
+
+    @staticmethod
+    async def _report(progress: Optional[ProgressCallback], state: CopyProgress):
+        if progress is None:
+            return
+        result = progress(state)
+        if inspect.isawaitable(result):
+            await result
@@ -0,0 +1,193 @@
+from app.database.indexes import IndexReport
+from app.services.auth_service import AuthService
+from app.services.database_service import DatabaseService
+from app.services.organization_service import OrganizationService
+from app.services.job_service import JobService
+from app.services.organization_cache import OrganizationChangeListener
+from app.services.token_revocation_service import TokenRevocationService
+from app.services.login_throttle import MongoBucketStore
+from app.utils.security import access_token_cache, revoked_tokens
+from app.utils.loop_monitor import EventLoopMonitor
+from app.utils.structured_logging import logging_stats
+from app.config import settings
+from typing import Any, Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceContainer:
+    """Holds the service instances shared by every request"""
+
+    def __init__(self):
+        self.auth_service: Optional[AuthService] = None
+        self.database_service: Optional[DatabaseService] = None
+        self.organization_service: Optional[OrganizationService] = None
+        self.job_service: Optional[JobService] = None
+        self.token_revocation_service: Optional[TokenRevocationService] = None
+        self.organization_change_listener: Optional[OrganizationChangeListener] = None
+        self.loop_monitor: Optional[EventLoopMonitor] = None
+        self.index_reports: List[IndexReport] = []
+
+    async def startup(
+        self,
+        start_workers: bool = True,
+        start_background: bool = True
+    ) -> List[IndexReport]:
+        """
+        Build the shared services and reconcile their indexes once
+
+        Args:
+            start_workers: Start the background job workers in this process
+            start_background: Start the cache change listener, the revocation
+                sync task and the event loop monitor in this process
+
+        Returns:
+            One IndexReport per reconciled collection
+        """
+        self.auth_service = AuthService()
+        self.database_service = DatabaseService()
+        self.organization_service = OrganizationService(
+            auth_service=self.auth_service,
+            database_service=self.database_service
+        )
+        self.job_service = JobService()
+        self.organization_service.register_jobs(self.job_service)
+        self.token_revocation_service = TokenRevocationService()
+
+        self.index_reports = [
+            await self.auth_service._ensure_indexes(),
+            await self.auth_service.refresh_tokens._ensure_indexes(),
+            *await self.database_service._ensure_indexes(),
+            await self.organization_service._ensure_indexes(),
+            await self.job_service._ensure_indexes(),
+            await self.token_revocation_service._ensure_indexes()
+        ]
+
+        # The login and bulk create throttles may share one collection
+        throttle_stores = {
+            throttle.store.collection.name: throttle.store
+            for throttle in (
+                self.auth_service.login_throttle,
+                self.organization_service.bulk_create_throttle
+            )
+            if throttle is not None and isinstance(throttle.store, MongoBucketStore)
+        }
+        for store in throttle_stores.values():
+            self.index_reports.append(await store._ensure_indexes())
+
+        created = sum(len(report.created) for report in self.index_reports)
+        existing = sum(len(report.existing) for report in self.index_reports)
+        logger.info(
+            f"Services started: {created} indexes created, {existing} already existed"
+        )
+
+        cache = self.organization_service.cache
+        if start_background and cache is not None and settings.org_cache_change_stream:
+            self.organization_change_listener = OrganizationChangeListener(
+                cache,
+                self.organization_service.organizations_collection
+            )
+            self.organization_change_listener.start()
+
+        # Revoked tokens must be known before the first request is served
+        await self.token_revocation_service.sync()
+        if start_background:
+            self.token_revocation_service.start()
+
+        if start_workers:
+            self.job_service.start()
+
+        if start_background and settings.loop_monitor_enabled:
+            self.loop_monitor = EventLoopMonitor(
+                interval=settings.loop_monitor_interval_seconds,
+                stall_threshold=settings.loop_stall_threshold_seconds
+            )
+            self.loop_monitor.start()
+
+        return self.index_reports
+
+    def stats(self) -> Dict[str, Any]:
+        """Runtime counters of the shared services"""
+        stats: Dict[str, Any] = {
+            "access_token_cache": {
+                **access_token_cache.stats(),
+                "revoked_tokens": len(revoked_tokens)
+            }
+        }
+        if self.auth_service is not None and self.auth_service.login_throttle is not None:
+            stats["login_throttle"] = self.auth_service.login_throttle.stats()
+        if self.organization_service is not None:
+            stats["bulk_create_throttle"] = self.organization_service.bulk_create_throttle.stats()
+        if self.organization_service is not None and self.organization_service.cache is not None:
+            stats["organization_cache"] = self.organization_service.cache.stats()
+        if self.loop_monitor is not None:
+            stats["event_loop"] = self.loop_monitor.stats()
+        log_stats = logging_stats()
+        if log_stats is not None:
+            stats["logging"] = log_stats
+        return stats
+
+    async def shutdown(self):
+        """Stop background tasks and drop references to the shared services"""
+        if self.loop_monitor is not None:
+            await self.loop_monitor.stop()
+            self.loop_monitor = None
+
+        if self.job_service is not None:
+            await self.job_service.stop()
+
+        if self.token_revocation_service is not None:
+            await self.token_revocation_service.stop()
+
+        if self.organization_change_listener is not None:
+            await self.organization_change_listener.stop()
+            self.organization_change_listener = None
+
+        cache_stats = self.stats().get("organization_cache")
+        if cache_stats:
+            logger.info(f"Organization cache at shutdown: {cache_stats}")
+
+        self.auth_service = None
+        self.database_service = None
+        self.organization_service = None
+        self.job_service = None
+        self.token_revocation_service = None
+
+
+services = ServiceContainer()
+
+
+def get_auth_service() -> AuthService:
+    """FastAPI dependency returning the shared AuthService"""
+    if services.auth_service is None:
+        raise RuntimeError("Services are not started")
+    return services.auth_service
+
+
+def get_database_service() -> DatabaseService:
+    """FastAPI dependency returning the shared DatabaseService"""
+    if services.database_service is None:
+        raise RuntimeError("Services are not started")
+    return services.database_service
+
+
+def get_job_service() -> JobService:
+    """FastAPI dependency returning the shared JobService"""
+    if services.job_service is None:
+        raise RuntimeError("Services are not started")
+    return services.job_service
+
+
+def get_token_revocation_service() -> TokenRevocationService:
+    """FastAPI dependency returning the shared TokenRevocationService"""
+    if services.token_revocation_service is None:
+        raise RuntimeError("Services are not started")
+    return services.token_revocation_service
+
+
+def get_organization_service() -> OrganizationService:
+    """FastAPI dependency returning the shared OrganizationService"""
+    if services.organization_service is None:
+        raise RuntimeError("Services are not started")
+    return services.organization_service
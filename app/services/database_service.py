@@ -1,20 +1,156 @@
-from app.database.mongodb import mongodb
-from typing import List, Dict, Any, Optional
+from app.database.clusters import ClusterRegistry, cluster_registry
+from app.database.collection_registry import CollectionRegistry
+from app.database.bulk import insert_many_unordered
+from app.database.indexes import IndexReport, reconcile_indexes
+from app.database.tenancy import (
+    DEDICATED,
+    POOLED,
+    TenantCollection,
+    pooled_indexes
+)
+from app.services.collection_copier import CollectionCopier, ProgressCallback
+from app.utils.tenant_io import TenantImportError
+from app.config import settings
+from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorDatabase
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
+from pymongo.errors import CollectionInvalid
+from typing import AsyncIterator, List, Dict, Any, Optional, Union
 import logging
 
 logger = logging.getLogger(__name__)
 
+COPY_CHECKPOINTS_COLLECTION = "copy_checkpoints"
+
 
 class DatabaseService:
     """Service for managing database operations"""
     
-    def __init__(self):
-        self.db = mongodb.get_database()
+    def __init__(self, registry: Optional[ClusterRegistry] = None):
+        self.cluster_registry = registry or cluster_registry
+        self.db = self.cluster_registry.get_database()
+        self.collections = CollectionRegistry(self.db)
+        self._collections_by_cluster: Dict[str, CollectionRegistry] = {}
+    
+    async def _ensure_indexes(self) -> List[IndexReport]:
+        """Ensure the shared collection of pooled tenants is indexed on every cluster"""
+        return [
+            await reconcile_indexes(
+                self.database_for(cluster)[settings.pooled_collection_name],
+                pooled_indexes()
+            )
+            for cluster in self.cluster_registry.names()
+        ]
+    
+    def database_for(self, cluster: Optional[str] = None) -> AsyncIOMotorDatabase:
+        """
+        Get the database on a cluster
+        
+        Args:
+            cluster: Cluster name; the default cluster when omitted
+            
+        Returns:
+            The service database on that cluster
+        """
+        if not cluster:
+            return self.db
+        return self.cluster_registry.get_database(cluster)
+    
+    def _collections_on(self, cluster: Optional[str] = None) -> CollectionRegistry:
+        if not cluster:
+            return self.collections
+        registry = self._collections_by_cluster.get(cluster)
+        if registry is None:
+            registry = self._collections_by_cluster[cluster] = CollectionRegistry(
+                self.database_for(cluster)
+            )
+        return registry
     
-    def create_collection(
+    def tenant_collection(
+        self,
+        org: Dict[str, Any],
+        codec_options: Optional[CodecOptions] = None
+    ) -> Union[AsyncIOMotorCollection, TenantCollection]:
+        """
+        Get the collection holding an organization's data
+        
+        Args:
+            org: Organization document with collection_name, tenancy and
+                cluster
+            codec_options: Optional codec options for the returned collection
+            
+        Returns:
+            The dedicated collection, or a view of the shared collection
+            scoped to the organization, on the organization's cluster
+        """
+        db = self.database_for(org.get("cluster"))
+        if org.get("tenancy", DEDICATED) == POOLED:
+            collection = db.get_collection(
+                settings.pooled_collection_name,
+                codec_options=codec_options
+            )
+            return TenantCollection(collection, org["_id"])
+        return db.get_collection(org["collection_name"], codec_options=codec_options)
+    
+    async def create_tenant_storage(
+        self,
+        org: Dict[str, Any],
+        check_exists: bool = True
+    ) -> bool:
+        """
+        Prepare storage for a new organization
+        
+        Pooled organizations share a collection that is created and indexed
+        at startup, so only dedicated ones need any work.
+        
+        Args:
+            org: Organization document with collection_name, tenancy and
+                cluster
+            check_exists: Passed on to create_collection
+            
+        Returns:
+            True if the storage is ready, False otherwise
+        """
+        if org.get("tenancy", DEDICATED) == POOLED:
+            return True
+        return await self.create_collection(
+            org["collection_name"],
+            check_exists=check_exists,
+            cluster=org.get("cluster")
+        )
+    
+    async def drop_tenant_storage(self, org: Dict[str, Any]) -> bool:
+        """
+        Delete all data of an organization
+        
+        Args:
+            org: Organization document with collection_name, tenancy and
+                cluster
+            
+        Returns:
+            True if deleted successfully, False otherwise
+        """
+        if org.get("tenancy", DEDICATED) != POOLED:
+            return await self.delete_collection(
+                org["collection_name"],
+                cluster=org.get("cluster")
+            )
+        try:
+            result = await self.tenant_collection(org).delete_many({})
+            logger.info(
+                f"Deleted {result.deleted_count} pooled documents of {org['collection_name']}"
+            )
+            return True
+        except Exception as e:
+            logger.error(f"Error deleting pooled data of {org['collection_name']}: {e}")
+            return False
+    
+    async def create_collection(
         self,
         collection_name: str,
-        validator: Optional[Dict[str, Any]] = None
+        validator: Optional[Dict[str, Any]] = None,
+        check_exists: bool = True,
+        cluster: Optional[str] = None
     ) -> bool:
         """
         Create a new collection with optional validation schema
@@ -22,140 +158,271 @@ class DatabaseService:
         Args:
             collection_name: Name of the collection to create
             validator: Optional JSON schema validator
+            check_exists: Look the name up first; pass False for names that
+                were just generated and cannot exist yet
+            cluster: Cluster to create it on; the default cluster when omitted
             
         Returns:
             True if created successfully, False otherwise
         """
+        db = self.database_for(cluster)
+        collections = self._collections_on(cluster)
         try:
-            if collection_name in self.db.list_collection_names():
-                logger.warning(f"Collection {collection_name} already exists")
+            if check_exists and await collections.exists(collection_name):
+                logger.warning("Collection %s already exists", collection_name)
                 return False
             
             # Create collection with optional validation
             if validator:
-                self.db.create_collection(
+                await db.create_collection(
                     collection_name,
                     validator=validator
                 )
             else:
-                self.db.create_collection(collection_name)
+                await db.create_collection(collection_name)
+            collections.mark_created(collection_name)
             
             # Create basic indexes
-            self._create_default_indexes(collection_name)
+            await self._create_default_indexes(collection_name, cluster)
             
-            logger.info(f"Collection {collection_name} created successfully")
+            logger.info("Collection %s created", collection_name, extra={"event": "collection.created"})
             return True
+        except CollectionInvalid:
+            # Created concurrently by another process
+            collections.mark_created(collection_name)
+            logger.warning("Collection %s already exists", collection_name)
+            return False
         except Exception as e:
             logger.error(f"Error creating collection {collection_name}: {e}")
             return False
     
-    def _create_default_indexes(self, collection_name: str):
+    async def _create_default_indexes(
+        self,
+        collection_name: str,
+        cluster: Optional[str] = None
+    ):
         """
         Create default indexes for a collection
         
         Args:
             collection_name: Name of the collection
+            cluster: Cluster holding the collection
         """
-        collection = self.db[collection_name]
+        collection = self.database_for(cluster)[collection_name]
         
         # Create index on created_at for sorting
-        collection.create_index("created_at")
+        await collection.create_index("created_at")
         
         # Create index on updated_at
-        collection.create_index("updated_at")
+        await collection.create_index("updated_at")
         
-        logger.info(f"Default indexes created for {collection_name}")
+        logger.info("Default indexes created for %s", collection_name, extra={"event": "collection.indexed"})
     
-    def collection_exists(self, collection_name: str) -> bool:
+    async def collection_exists(
+        self,
+        collection_name: str,
+        cluster: Optional[str] = None
+    ) -> bool:
         """
         Check if a collection exists
         
         Args:
             collection_name: Name of the collection
+            cluster: Cluster to look on; the default cluster when omitted
             
         Returns:
             True if exists, False otherwise
         """
-        return collection_name in self.db.list_collection_names()
+        return await self._collections_on(cluster).exists(collection_name)
     
-    def delete_collection(self, collection_name: str) -> bool:
+    async def delete_collection(
+        self,
+        collection_name: str,
+        cluster: Optional[str] = None
+    ) -> bool:
         """
         Delete a collection
         
         Args:
             collection_name: Name of the collection to delete
+            cluster: Cluster holding it; the default cluster when omitted
             
         Returns:
             True if deleted successfully, False otherwise
         """
         try:
-            if not self.collection_exists(collection_name):
-                logger.warning(f"Collection {collection_name} does not exist")
+            if not await self.collection_exists(collection_name, cluster):
+                logger.warning("Collection %s does not exist", collection_name)
                 return False
             
-            self.db.drop_collection(collection_name)
-            logger.info(f"Collection {collection_name} deleted successfully")
+            await self.database_for(cluster).drop_collection(collection_name)
+            self._collections_on(cluster).mark_dropped(collection_name)
+            logger.info("Collection %s deleted", collection_name, extra={"event": "collection.deleted"})
             return True
         except Exception as e:
             logger.error(f"Error deleting collection {collection_name}: {e}")
             return False
     
-    def copy_collection_data(
+    async def copy_collection_data(
         self,
         source_collection: str,
-        target_collection: str
+        target_collection: str,
+        target_database: Optional[AsyncIOMotorDatabase] = None,
+        progress: Optional[ProgressCallback] = None,
+        batch_size: Optional[int] = None,
+        server_side: Optional[bool] = None,
+        cluster: Optional[str] = None
     ) -> bool:
         """
-        Copy all data from source collection to target collection
+        Stream all data from source collection to target collection
+        
+        Interrupted copies resume from their last checkpoint when called
+        again with the same source and target.
         
         Args:
             source_collection: Name of the source collection
             target_collection: Name of the target collection
+            target_database: Destination database, possibly on another
+                cluster; defaults to this service's database
+            progress: Optional callback invoked after every batch
+            batch_size: Documents per batch; defaults to Settings
+            server_side: Force or forbid a server-side $merge copy
+            cluster: Cluster holding the source collection
             
         Returns:
             True if copied successfully, False otherwise
         """
         try:
-            if not self.collection_exists(source_collection):
+            if not await self.collection_exists(source_collection, cluster):
                 logger.error(f"Source collection {source_collection} does not exist")
                 return False
             
-            source = self.db[source_collection]
-            target = self.db[target_collection]
-            
-            # Get all documents from source
-            documents = list(source.find())
+            source = self.database_for(cluster)[source_collection]
+            target = (
+                target_database if target_database is not None
+                else self.database_for(cluster)
+            )[target_collection]
             
-            if documents:
-                # Insert into target
-                target.insert_many(documents)
-                logger.info(
-                    f"Copied {len(documents)} documents from {source_collection} "
-                    f"to {target_collection}"
-                )
-            else:
-                logger.info(f"No documents to copy from {source_collection}")
+            copier = CollectionCopier(
+                self.db[COPY_CHECKPOINTS_COLLECTION],
+                batch_size=batch_size or settings.copy_batch_size
+            )
+            result = await copier.copy(
+                source,
+                target,
+                progress=progress,
+                server_side=server_side
+            )
             
+            logger.info(
+                f"Copied {result.copied} documents from {source_collection} "
+                f"to {target.full_name}"
+            )
             return True
         except Exception as e:
             logger.error(f"Error copying collection data: {e}")
             return False
     
-    def get_collection_stats(self, collection_name: str) -> Optional[Dict[str, Any]]:
+    async def iter_raw_documents(
+        self,
+        org: Dict[str, Any],
+        batch_size: Optional[int] = None
+    ) -> AsyncIterator[RawBSONDocument]:
+        """
+        Stream an organization's data as undecoded BSON documents
+        
+        Args:
+            org: Organization document with collection_name, tenancy and
+                cluster
+            batch_size: Documents fetched per cursor batch; defaults to Settings
+            
+        Yields:
+            Documents in _id order, without decoding them into dicts
+        """
+        collection = self.tenant_collection(
+            org,
+            codec_options=CodecOptions(document_class=RawBSONDocument)
+        )
+        cursor = collection.find().sort("_id", 1).batch_size(
+            batch_size or settings.copy_batch_size
+        )
+        async for document in cursor:
+            yield document
+    
+    async def insert_stream(
+        self,
+        org: Dict[str, Any],
+        documents: AsyncIterator[Dict[str, Any]],
+        batch_size: Optional[int] = None
+    ) -> Dict[str, int]:
+        """
+        Insert a stream of documents with batched unordered bulk writes
+        
+        At most one batch is held in memory at a time. Batches are not
+        rolled back: when the stream turns out to be malformed, the
+        documents of batches already written stay in the collection.
+        
+        Args:
+            org: Organization document with collection_name, tenancy and
+                cluster
+            documents: Documents to insert
+            batch_size: Documents per bulk write; defaults to Settings
+            
+        Returns:
+            Number of inserted and rejected documents
+            
+        Raises:
+            TenantImportError: If the stream cannot be decoded; its counts
+                are those of the batches written before the error
+        """
+        collection = self.tenant_collection(org)
+        batch_size = batch_size or settings.copy_batch_size
+        counts = {"inserted": 0, "failed": 0}
+        batch: List[Dict[str, Any]] = []
+        
+        async def flush():
+            failed = await insert_many_unordered(collection, batch)
+            counts["inserted"] += len(batch) - len(failed)
+            counts["failed"] += len(failed)
+            batch.clear()
+        
+        try:
+            async for document in documents:
+                batch.append(document)
+                if len(batch) >= batch_size:
+                    await flush()
+        except TenantImportError as e:
+            e.counts = dict(counts)
+            raise
+        if batch:
+            await flush()
+        
+        logger.info(
+            f"Imported {counts['inserted']} documents into {org['collection_name']}, "
+            f"{counts['failed']} rejected"
+        )
+        return counts
+    
+    async def get_collection_stats(
+        self,
+        collection_name: str,
+        cluster: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
         """
         Get statistics about a collection
         
         Args:
             collection_name: Name of the collection
+            cluster: Cluster holding it; the default cluster when omitted
             
         Returns:
             Dictionary with collection stats or None if error
         """
         try:
-            if not self.collection_exists(collection_name):
+            if not await self.collection_exists(collection_name, cluster):
                 return None
             
-            stats = self.db.command("collStats", collection_name)
+            stats = await self.database_for(cluster).command("collStats", collection_name)
             return {
                 "name": collection_name,
                 "count": stats.get("count", 0),
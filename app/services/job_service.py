@@ -0,0 +1,301 @@
+from app.database.mongodb import async_mongodb
+from app.database.indexes import IndexReport, reconcile_indexes
+from app.config import settings
+from bson import ObjectId
+from datetime import datetime, timedelta
+from pymongo import ASCENDING, IndexModel, ReturnDocument
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import asyncio
+import logging
+import uuid
+
+logger = logging.getLogger(__name__)
+
+
+class JobStatus:
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class JobContext:
+    """Handed to job handlers so they can report progress"""
+
+    def __init__(self, job_service: "JobService", job: Dict[str, Any]):
+        self._job_service = job_service
+        self.job = job
+
+    async def update_progress(self, **progress: Any):
+        await self._job_service.update_progress(self.job["_id"], progress)
+
+
+JobHandler = Callable[[Dict[str, Any], JobContext], Awaitable[Optional[Dict[str, Any]]]]
+
+
+class JobService:
+    """
+    Durable background job queue stored in MongoDB
+
+    Jobs are claimed atomically by local worker tasks and hold a lease that
+    is renewed while they run. A job whose worker died (for example during a
+    restart) is claimed again once its lease expires, up to
+    ``job_max_attempts`` times. A worker that finds its lease taken over
+    cancels the handler, so a job never runs twice at once. Workers only
+    claim job types they have a handler for.
+    """
+
+    def __init__(self):
+        self.db = async_mongodb.get_database()
+        self.jobs_collection = self.db["jobs"]
+        self.worker_id = uuid.uuid4().hex
+        self._handlers: Dict[str, JobHandler] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+
+    async def _ensure_indexes(self) -> IndexReport:
+        """Ensure required indexes exist"""
+        return await reconcile_indexes(self.jobs_collection, [
+            # Index used when claiming the oldest runnable job
+            IndexModel([("status", ASCENDING), ("created_at", ASCENDING)]),
+            # Finished jobs are removed once their retention period ends
+            IndexModel("expires_at", expireAfterSeconds=0),
+        ])
+
+    def register(self, job_type: str, handler: JobHandler):
+        """
+        Register the coroutine that runs jobs of a type
+
+        Args:
+            job_type: Job type name
+            handler: Coroutine called with the job document and a JobContext;
+                its return value is stored as the job result
+        """
+        self._handlers[job_type] = handler
+
+    async def enqueue(
+        self,
+        job_type: str,
+        params: Dict[str, Any],
+        owner_id: Optional[str] = None
+    ) -> str:
+        """
+        Queue a job
+
+        Args:
+            job_type: Registered job type
+            params: Parameters passed to the handler
+            owner_id: Admin allowed to read the job status
+
+        Returns:
+            ID of the queued job
+        """
+        if job_type not in self._handlers:
+            raise ValueError(f"Unknown job type: {job_type}")
+
+        now = datetime.utcnow()
+        result = await self.jobs_collection.insert_one({
+            "type": job_type,
+            "params": params,
+            "owner_id": owner_id,
+            "status": JobStatus.QUEUED,
+            "progress": {},
+            "attempts": 0,
+            "created_at": now,
+            "updated_at": now
+        })
+
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+        logger.info("Queued %s job %s", job_type, result.inserted_id, extra={"event": "job.queued"})
+        return str(result.inserted_id)
+
+    async def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a job without its parameters
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            Job document if found, None otherwise
+        """
+        try:
+            return await self.jobs_collection.find_one(
+                {"_id": ObjectId(job_id)},
+                {"params": 0, "lease_expires_at": 0, "worker_id": 0}
+            )
+        except Exception as e:
+            logger.error(f"Error getting job {job_id}: {e}")
+            return None
+
+    async def update_progress(self, job_id: ObjectId, progress: Dict[str, Any]):
+        await self.jobs_collection.update_one(
+            {"_id": job_id},
+            {"$set": {
+                **{f"progress.{key}": value for key, value in progress.items()},
+                "updated_at": datetime.utcnow()
+            }}
+        )
+
+    def start(self, workers: Optional[int] = None):
+        """Start the local worker tasks"""
+        workers = settings.job_workers if workers is None else workers
+        self._wakeup = asyncio.Event()
+        for index in range(workers):
+            self._tasks.append(asyncio.create_task(self._worker(index)))
+        logger.info(f"Started {workers} job workers")
+
+    async def stop(self):
+        """Stop the local workers; their running jobs are retried elsewhere"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _worker(self, index: int):
+        while True:
+            try:
+                job = await self._claim()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Job worker {index} failed to claim a job: {e}")
+                job = None
+
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(
+                        self._wakeup.wait(),
+                        timeout=settings.job_poll_interval_seconds
+                    )
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await self._run(job)
+
+    async def _claim(self) -> Optional[Dict[str, Any]]:
+        now = datetime.utcnow()
+        await self._fail_exhausted(now)
+        return await self.jobs_collection.find_one_and_update(
+            {
+                "$or": [
+                    {"status": JobStatus.QUEUED},
+                    {"status": JobStatus.RUNNING, "lease_expires_at": {"$lt": now}}
+                ],
+                "attempts": {"$lt": settings.job_max_attempts},
+                "type": {"$in": list(self._handlers)}
+            },
+            {
+                "$set": {
+                    "status": JobStatus.RUNNING,
+                    "worker_id": self.worker_id,
+                    "started_at": now,
+                    "updated_at": now,
+                    "lease_expires_at": now + timedelta(seconds=settings.job_lease_seconds)
+                },
+                "$inc": {"attempts": 1}
+            },
+            sort=[("created_at", ASCENDING)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def _fail_exhausted(self, now: datetime):
+        # Jobs whose worker kept dying are not retried forever
+        await self.jobs_collection.update_many(
+            {
+                "status": JobStatus.RUNNING,
+                "lease_expires_at": {"$lt": now},
+                "attempts": {"$gte": settings.job_max_attempts}
+            },
+            {
+                "$set": {
+                    "status": JobStatus.FAILED,
+                    "error": "Job exceeded its maximum number of attempts",
+                    "finished_at": now,
+                    "updated_at": now,
+                    "expires_at": now + timedelta(hours=settings.job_retention_hours)
+                },
+                "$unset": {"params": ""}
+            }
+        )
+
+    async def _run(self, job: Dict[str, Any]):
+        handler = self._handlers[job["type"]]
+        work = asyncio.create_task(handler(job, JobContext(self, job)))
+        heartbeat = asyncio.create_task(self._heartbeat(job["_id"], work))
+        try:
+            result = await work
+        except asyncio.CancelledError:
+            if heartbeat.done() and not heartbeat.cancelled():
+                # Another worker holds the job now and will finish it
+                logger.warning(
+                    "%s job %s lost its lease and was cancelled",
+                    job["type"],
+                    job["_id"],
+                    extra={"event": "job.lease_lost"}
+                )
+                return
+            raise
+        except Exception as e:
+            logger.error(f"{job['type']} job {job['_id']} failed: {e}")
+            await self._finish(job["_id"], JobStatus.FAILED, error=str(e))
+        else:
+            await self._finish(job["_id"], JobStatus.SUCCEEDED, result=result)
+            logger.info("%s job %s succeeded", job["type"], job["_id"], extra={"event": "job.succeeded"})
+        finally:
+            heartbeat.cancel()
+
+    async def _heartbeat(self, job_id: ObjectId, work: asyncio.Task):
+        """
+        Renew the job's lease until cancelled
+
+        Failed renewals are logged and retried on the next beat; the lease
+        only runs out if they keep failing. Returns after cancelling the
+        handler when the job is no longer leased to this worker.
+        """
+        interval = settings.job_lease_seconds / 3
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                result = await self.jobs_collection.update_one(
+                    {"_id": job_id, "worker_id": self.worker_id, "status": JobStatus.RUNNING},
+                    {"$set": {
+                        "lease_expires_at": datetime.utcnow()
+                        + timedelta(seconds=settings.job_lease_seconds)
+                    }}
+                )
+            except Exception as e:
+                logger.error(f"Failed to renew the lease of job {job_id}: {e}")
+                continue
+            if result.matched_count == 0:
+                work.cancel()
+                return
+
+    async def _finish(
+        self,
+        job_id: ObjectId,
+        status: str,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None
+    ):
+        now = datetime.utcnow()
+        # A worker that lost its lease must not overwrite the new holder's outcome
+        await self.jobs_collection.update_one(
+            {"_id": job_id, "worker_id": self.worker_id},
+            {
+                "$set": {
+                    "status": status,
+                    "result": result,
+                    "error": error,
+                    "finished_at": now,
+                    "updated_at": now,
+                    "expires_at": now + timedelta(hours=settings.job_retention_hours)
+                },
+                # Parameters are not needed once the job is finished
+                "$unset": {"params": "", "lease_expires_at": ""}
+            }
+        )
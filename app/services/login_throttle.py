@@ -0,0 +1,326 @@
+from app.database.mongodb import async_mongodb
+from app.database.indexes import IndexReport, reconcile_indexes
+from app.config import settings
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import IndexModel
+from pymongo.errors import DuplicateKeyError
+from typing import Any, Callable, Dict, Optional, Tuple
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+BucketState = Dict[str, Any]
+BucketUpdate = Callable[[Optional[BucketState]], Tuple[BucketState, Any]]
+
+
+class Throttled(Exception):
+    """Raised when a request is rejected before doing any expensive work"""
+
+    def __init__(self, retry_after: float, message: Optional[str] = None):
+        super().__init__(message or f"Too many requests, retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+class LoginThrottled(Throttled):
+    """Raised when a login attempt is rejected before checking the password"""
+
+    def __init__(self, retry_after: float):
+        super().__init__(retry_after, f"Too many login attempts, retry in {retry_after:.0f}s")
+
+
+@dataclass(frozen=True)
+class BucketPolicy:
+    """Token bucket holding up to ``capacity`` attempts, refilled continuously"""
+    capacity: float
+    refill_per_second: float
+
+    def refill(self, state: Optional[BucketState], now: float) -> BucketState:
+        if state is None:
+            return {"tokens": self.capacity, "updated_at": now, "failures": 0, "blocked_until": 0.0}
+        elapsed = max(now - state["updated_at"], 0.0)
+        return {
+            **state,
+            "tokens": min(self.capacity, state["tokens"] + elapsed * self.refill_per_second),
+            "updated_at": now
+        }
+
+    def idle_seconds(self) -> float:
+        """Time after which an unused bucket is full again"""
+        return self.capacity / self.refill_per_second if self.refill_per_second else 0.0
+
+
+class MemoryBucketStore:
+    """Buckets of this process, bounded to the most recently used keys"""
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, BucketState]" = OrderedDict()
+
+    async def update(self, key: str, update: BucketUpdate, expires_at: float) -> Any:
+        state, result = update(self._buckets.get(key))
+        self._buckets[key] = state
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return result
+
+
+class MongoBucketStore:
+    """
+    Buckets shared by every process through MongoDB
+
+    Updates use compare-and-set on a version field, so concurrent attempts
+    from several processes never lose a decrement. A TTL index drops buckets
+    once they would be full and unblocked again.
+    """
+
+    def __init__(self, collection: AsyncIOMotorCollection, max_retries: int = 5):
+        self.collection = collection
+        self.max_retries = max_retries
+
+    async def _ensure_indexes(self) -> IndexReport:
+        return await reconcile_indexes(self.collection, [
+            IndexModel("expires_at", expireAfterSeconds=0),
+        ])
+
+    async def update(self, key: str, update: BucketUpdate, expires_at: float) -> Any:
+        result = None
+        for _ in range(self.max_retries):
+            doc = await self.collection.find_one({"_id": key})
+            state, result = update(
+                {name: doc[name] for name in ("tokens", "updated_at", "failures", "blocked_until")}
+                if doc else None
+            )
+            fields = {**state, "expires_at": datetime.utcfromtimestamp(expires_at)}
+            if doc is None:
+                try:
+                    await self.collection.insert_one({"_id": key, "version": 1, **fields})
+                    return result
+                except DuplicateKeyError:
+                    continue
+            written = await self.collection.update_one(
+                {"_id": key, "version": doc["version"]},
+                {"$set": fields, "$inc": {"version": 1}}
+            )
+            if written.matched_count:
+                return result
+        # Heavy contention on one key; the last decision stands
+        return result
+
+
+class LoginThrottle:
+    """
+    Token-bucket login throttling by email and by client IP
+
+    Every attempt takes a token from the bucket of the email and of the
+    client IP and is rejected while either is empty. After
+    ``free_failures`` consecutive failed logins for an email, further
+    attempts are refused for a delay that doubles with each failure, up to
+    ``max_delay``. Rejections happen before the admin lookup and before any
+    password hashing, so a flood of attempts costs no bcrypt CPU.
+    """
+
+    def __init__(
+        self,
+        store: Any,
+        email_policy: BucketPolicy,
+        ip_policy: BucketPolicy,
+        free_failures: int = 3,
+        failure_delay: float = 1.0,
+        max_delay: float = 300.0
+    ):
+        self.store = store
+        self.email_policy = email_policy
+        self.ip_policy = ip_policy
+        self.free_failures = free_failures
+        self.failure_delay = failure_delay
+        self.max_delay = max_delay
+        self.counters = {
+            "attempts": 0,
+            "allowed": 0,
+            "rejected_rate": 0,
+            "rejected_delay": 0,
+            "failures": 0,
+            "successes": 0,
+            "store_errors": 0
+        }
+
+    def _expires_at(self, policy: BucketPolicy, now: float) -> float:
+        return now + policy.idle_seconds() + self.max_delay
+
+    async def check(self, email: str, client_ip: Optional[str] = None):
+        """
+        Take one attempt from the email and IP buckets
+
+        Raises:
+            LoginThrottled: If either bucket is empty or the email is in a
+                failure delay
+        """
+        self.counters["attempts"] += 1
+        keys = [(f"email:{email.lower()}", self.email_policy)]
+        if client_ip:
+            keys.insert(0, (f"ip:{client_ip}", self.ip_policy))
+
+        now = time.time()
+        for key, policy in keys:
+            def take(state: Optional[BucketState]) -> Tuple[BucketState, Tuple[str, float]]:
+                state = policy.refill(state, now)
+                if state["blocked_until"] > now:
+                    return state, ("rejected_delay", state["blocked_until"] - now)
+                if state["tokens"] < 1:
+                    return state, ("rejected_rate", (1 - state["tokens"]) / policy.refill_per_second)
+                state["tokens"] -= 1
+                return state, ("allowed", 0.0)
+
+            try:
+                outcome, retry_after = await self.store.update(
+                    key, take, self._expires_at(policy, now)
+                )
+            except Exception as e:
+                # A broken shared store must not lock every admin out
+                self.counters["store_errors"] += 1
+                logger.error(f"Login throttle store failed: {e}")
+                continue
+
+            if outcome != "allowed":
+                self.counters[outcome] += 1
+                raise LoginThrottled(retry_after)
+
+        self.counters["allowed"] += 1
+
+    async def record_failure(self, email: str):
+        """Count a failed login and start or extend the email's delay"""
+        self.counters["failures"] += 1
+        now = time.time()
+
+        def fail(state: Optional[BucketState]) -> Tuple[BucketState, None]:
+            state = self.email_policy.refill(state, now)
+            state["failures"] += 1
+            excess = state["failures"] - self.free_failures
+            if excess > 0:
+                delay = min(self.failure_delay * 2 ** (excess - 1), self.max_delay)
+                state["blocked_until"] = now + delay
+            return state, None
+
+        await self._update_email(email, fail, now)
+
+    async def record_success(self, email: str):
+        """Clear the failure count of an email after a successful login"""
+        self.counters["successes"] += 1
+        now = time.time()
+
+        def succeed(state: Optional[BucketState]) -> Tuple[BucketState, None]:
+            state = self.email_policy.refill(state, now)
+            state["failures"] = 0
+            state["blocked_until"] = 0.0
+            return state, None
+
+        await self._update_email(email, succeed, now)
+
+    async def _update_email(self, email: str, update: BucketUpdate, now: float):
+        try:
+            await self.store.update(
+                f"email:{email.lower()}",
+                update,
+                self._expires_at(self.email_policy, now)
+            )
+        except Exception as e:
+            self.counters["store_errors"] += 1
+            logger.error(f"Login throttle store failed: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self.counters)
+
+
+class CostThrottle:
+    """
+    One token bucket per client, charged by the work a request asks for
+
+    Bulk provisioning takes a token per organization, since each one costs
+    a password hash. A request the bucket cannot cover is rejected whole,
+    before anything is hashed.
+    """
+
+    def __init__(self, store: Any, policy: BucketPolicy, namespace: str):
+        self.store = store
+        self.policy = policy
+        self.namespace = namespace
+        self.counters = {"allowed": 0, "rejected": 0, "store_errors": 0}
+
+    async def check(self, client_ip: Optional[str], cost: float):
+        """
+        Take cost tokens from the client's bucket
+
+        Raises:
+            Throttled: If the bucket holds fewer than cost tokens
+        """
+        now = time.time()
+
+        def take(state: Optional[BucketState]) -> Tuple[BucketState, float]:
+            state = self.policy.refill(state, now)
+            if state["tokens"] < cost:
+                return state, (cost - state["tokens"]) / self.policy.refill_per_second
+            state["tokens"] -= cost
+            return state, 0.0
+
+        try:
+            retry_after = await self.store.update(
+                f"{self.namespace}:ip:{client_ip or 'unknown'}",
+                take,
+                now + self.policy.idle_seconds()
+            )
+        except Exception as e:
+            self.counters["store_errors"] += 1
+            logger.error(f"{self.namespace} throttle store failed: {e}")
+            return
+
+        if retry_after:
+            self.counters["rejected"] += 1
+            raise Throttled(retry_after)
+        self.counters["allowed"] += 1
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self.counters)
+
+
+def _build_store() -> Any:
+    if settings.login_throttle_store == "mongo":
+        return MongoBucketStore(async_mongodb.get_database()["login_throttle"])
+    return MemoryBucketStore(max_keys=settings.login_throttle_max_keys)
+
+
+def build_bulk_create_throttle() -> CostThrottle:
+    """Create the per-item throttle of bulk provisioning configured in Settings"""
+    return CostThrottle(
+        _build_store(),
+        BucketPolicy(
+            capacity=settings.bulk_create_items_burst,
+            refill_per_second=settings.bulk_create_items_per_minute / 60
+        ),
+        namespace="bulk_create"
+    )
+
+
+def build_login_throttle() -> Optional[LoginThrottle]:
+    """Create the login throttle configured in Settings, if enabled"""
+    if not settings.login_throttle_enabled:
+        return None
+
+    return LoginThrottle(
+        _build_store(),
+        email_policy=BucketPolicy(
+            capacity=settings.login_email_burst,
+            refill_per_second=settings.login_email_per_minute / 60
+        ),
+        ip_policy=BucketPolicy(
+            capacity=settings.login_ip_burst,
+            refill_per_second=settings.login_ip_per_minute / 60
+        ),
+        free_failures=settings.login_free_failures,
+        failure_delay=settings.login_failure_delay_seconds,
+        max_delay=settings.login_max_delay_seconds
+    )
@@ -0,0 +1,277 @@
+from app.config import settings
+from app.database.clusters import DEFAULT_CLUSTER
+from app.database.tenancy import DEDICATED
+from bson import ObjectId
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from motor.motor_asyncio import AsyncIOMotorCollection
+from typing import Any, Dict, Optional, Tuple, Union
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class CachedOrganization:
+    """Compact, immutable copy of the organization fields served by the API"""
+    id: ObjectId
+    organization_name: str
+    collection_name: str
+    admin_id: Optional[str]
+    admin_email: str
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    tenancy: str = DEDICATED
+    cluster: str = DEFAULT_CLUSTER
+    version: int = 0
+
+    @classmethod
+    def from_document(cls, org: Dict[str, Any]) -> "CachedOrganization":
+        return cls(
+            id=org["_id"],
+            organization_name=org["organization_name"],
+            collection_name=org["collection_name"],
+            admin_id=org.get("admin_id"),
+            admin_email=org.get("admin_email", "N/A"),
+            created_at=org["created_at"],
+            updated_at=org.get("updated_at"),
+            tenancy=org.get("tenancy", DEDICATED),
+            cluster=org.get("cluster") or DEFAULT_CLUSTER,
+            version=org.get("version", 0)
+        )
+
+    def to_document(self) -> Dict[str, Any]:
+        """Build a fresh document so callers can never mutate the cache"""
+        org = {
+            "_id": self.id,
+            "organization_name": self.organization_name,
+            "collection_name": self.collection_name,
+            "admin_id": self.admin_id,
+            "admin_email": self.admin_email,
+            "created_at": self.created_at,
+            "tenancy": self.tenancy,
+            "cluster": self.cluster,
+            "version": self.version
+        }
+        if self.updated_at is not None:
+            org["updated_at"] = self.updated_at
+        return org
+
+
+# Returned by lookups when the cache has nothing for the key
+MISS = object()
+
+
+class OrganizationCache:
+    """
+    Bounded LRU cache of organizations keyed by name
+
+    Entries expire after ``ttl_seconds``. Unknown names are remembered for
+    ``negative_ttl_seconds`` so repeated lookups of missing organizations do
+    not reach MongoDB either. Readers pass the ``generation`` they saw before
+    querying, so a load that raced with an invalidation is not stored.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10000,
+        ttl_seconds: float = 60.0,
+        negative_ttl_seconds: float = 5.0
+    ):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Optional[CachedOrganization]]]" = OrderedDict()
+        self._names_by_id: Dict[str, str] = {}
+        self.generation = 0
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, organization_name: str) -> Union[CachedOrganization, None, object]:
+        """
+        Look up an organization by name
+
+        Returns:
+            The cached organization, None if the name is cached as missing,
+            or MISS if the cache has no valid entry
+        """
+        entry = self._entries.get(organization_name)
+        if entry is None:
+            self.misses += 1
+            return MISS
+
+        expires_at, org = entry
+        if expires_at <= time.monotonic():
+            self._remove(organization_name)
+            self.misses += 1
+            return MISS
+
+        self._entries.move_to_end(organization_name)
+        if org is None:
+            self.negative_hits += 1
+        else:
+            self.hits += 1
+        return org
+
+    def get_by_id(self, org_id: str) -> Union[CachedOrganization, object]:
+        """Look up an organization by ID; unknown IDs are never negatively cached"""
+        organization_name = self._names_by_id.get(org_id)
+        if organization_name is None:
+            self.misses += 1
+            return MISS
+        org = self.get(organization_name)
+        return MISS if org is None else org
+
+    def put(
+        self,
+        org: Dict[str, Any],
+        generation: Optional[int] = None
+    ) -> CachedOrganization:
+        """Cache an organization document and return its compact form"""
+        cached = CachedOrganization.from_document(org)
+        if generation is not None and generation != self.generation:
+            return cached
+        self._store(
+            cached.organization_name,
+            cached,
+            time.monotonic() + self.ttl_seconds
+        )
+        self._names_by_id[str(cached.id)] = cached.organization_name
+        return cached
+
+    def put_missing(self, organization_name: str, generation: Optional[int] = None):
+        """Remember that an organization name does not exist"""
+        if generation is not None and generation != self.generation:
+            return
+        if self.negative_ttl_seconds > 0:
+            self._store(
+                organization_name,
+                None,
+                time.monotonic() + self.negative_ttl_seconds
+            )
+
+    def invalidate(
+        self,
+        organization_name: Optional[str] = None,
+        org_id: Optional[str] = None
+    ):
+        """Drop the entries for an organization name and/or ID"""
+        self.generation += 1
+        if org_id is not None:
+            name_for_id = self._names_by_id.get(str(org_id))
+            if name_for_id is not None:
+                self._remove(name_for_id)
+                self.invalidations += 1
+        if organization_name is not None and organization_name in self._entries:
+            self._remove(organization_name)
+            self.invalidations += 1
+
+    def clear(self):
+        self.generation += 1
+        self._entries.clear()
+        self._names_by_id.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.negative_hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits + self.negative_hits) / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations
+        }
+
+    def _store(
+        self,
+        organization_name: str,
+        org: Optional[CachedOrganization],
+        expires_at: float
+    ):
+        if organization_name in self._entries:
+            self._remove(organization_name)
+        self._entries[organization_name] = (expires_at, org)
+        while len(self._entries) > self.max_size:
+            evicted_name = next(iter(self._entries))
+            self._remove(evicted_name)
+            self.evictions += 1
+
+    def _remove(self, organization_name: str):
+        _, org = self._entries.pop(organization_name, (0.0, None))
+        if org is not None and self._names_by_id.get(str(org.id)) == organization_name:
+            del self._names_by_id[str(org.id)]
+
+
+class OrganizationChangeListener:
+    """
+    Invalidates cache entries from a MongoDB change stream
+
+    Lets writes made by other replicas evict entries here before their TTL
+    runs out. Requires a replica set or sharded cluster.
+    """
+
+    def __init__(
+        self,
+        cache: OrganizationCache,
+        collection: AsyncIOMotorCollection,
+        retry_seconds: float = 5.0
+    ):
+        self.cache = cache
+        self.collection = collection
+        self.retry_seconds = retry_seconds
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def handle_change(self, change: Dict[str, Any]):
+        org_id = change.get("documentKey", {}).get("_id")
+        full_document = change.get("fullDocument") or {}
+        self.cache.invalidate(
+            organization_name=full_document.get("organization_name"),
+            org_id=str(org_id) if org_id is not None else None
+        )
+
+    async def _run(self):
+        while True:
+            try:
+                async with self.collection.watch() as stream:
+                    logger.info("Watching organizations for cache invalidation")
+                    async for change in stream:
+                        self.handle_change(change)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Events may have been missed, so nothing cached can be trusted
+                logger.error(f"Organization change stream failed: {e}")
+                self.cache.clear()
+                await asyncio.sleep(self.retry_seconds)
+
+
+def build_organization_cache() -> Optional[OrganizationCache]:
+    """Create the organization cache configured in Settings, if enabled"""
+    if not settings.org_cache_enabled:
+        return None
+    return OrganizationCache(
+        max_size=settings.org_cache_max_size,
+        ttl_seconds=settings.org_cache_ttl_seconds,
+        negative_ttl_seconds=settings.org_cache_negative_ttl_seconds
+    )
@@ -1,74 +1,153 @@
-from app.database.mongodb import mongodb
+from app.database.mongodb import async_mongodb
+from app.database.indexes import IndexReport, reconcile_indexes
+from app.database.bulk import insert_many_unordered
+from app.database.clusters import DEFAULT_CLUSTER
 from app.models.organization import (
     OrganizationCreate,
     OrganizationUpdate,
-    OrganizationInDB
+    OrganizationInDB,
+    BulkOrganizationResult
 )
 from app.models.admin import AdminCreate
 from app.services.auth_service import AuthService
 from app.services.database_service import DatabaseService
+from app.services.job_service import JobContext, JobService
+from app.services.cluster_placement import ClusterPlacement, build_cluster_placement
+from app.services.login_throttle import CostThrottle, build_bulk_create_throttle
+from app.services.organization_cache import (
+    MISS,
+    OrganizationCache,
+    build_organization_cache
+)
+from app.utils.security import security_manager, PasswordHashPoolBusy
+from app.config import settings
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 from bson import ObjectId
+from pydantic import ValidationError
+from pymongo import ASCENDING, IndexModel
+import asyncio
+import base64
+import json
 import logging
+import re
+import uuid
 
 
 logger = logging.getLogger(__name__)
 
+UPDATE_ORGANIZATION_JOB = "update_organization"
+DELETE_ORGANIZATION_JOB = "delete_organization"
+
+# Fields returned by organization reads: those of OrganizationResponse plus
+# admin_id, which update and delete need for their ownership checks
+ORGANIZATION_PROJECTION = {
+    "organization_name": 1,
+    "collection_name": 1,
+    "admin_id": 1,
+    "admin_email": 1,
+    "created_at": 1,
+    "updated_at": 1,
+    "tenancy": 1,
+    "cluster": 1,
+    "version": 1
+}
+
+# Fields list_organizations may project; created_at, and organization_name
+# when listing by prefix, are always returned because the page cursor is
+# built from them
+LISTABLE_FIELDS = (
+    "organization_name",
+    "collection_name",
+    "updated_at",
+    "tenancy",
+    "cluster"
+)
+
+# Admin contact details are only listed to operators
+OPERATOR_LISTABLE_FIELDS = LISTABLE_FIELDS + ("admin_email",)
+
 class OrganizationService:
     """Service for organization management operations"""
     
-    def __init__(self):
-        self.db = mongodb.get_database()
+    def __init__(
+        self,
+        auth_service: Optional[AuthService] = None,
+        database_service: Optional[DatabaseService] = None,
+        cache: Optional[OrganizationCache] = None,
+        bulk_create_throttle: Optional[CostThrottle] = None,
+        placement: Optional[ClusterPlacement] = None
+    ):
+        self.db = async_mongodb.get_database()
         self.organizations_collection = self.db["organizations"]
-        self.auth_service = AuthService()
-        self.database_service = DatabaseService()
-        self._ensure_indexes()
+        self.auth_service = auth_service or AuthService()
+        self.database_service = database_service or DatabaseService()
+        self.cache = cache if cache is not None else build_organization_cache()
+        self.bulk_create_throttle = bulk_create_throttle or build_bulk_create_throttle()
+        self.placement = placement or build_cluster_placement(
+            self.organizations_collection,
+            self.database_service.cluster_registry
+        )
+        self.job_service: Optional[JobService] = None
     
-    def _ensure_indexes(self):
+    async def _ensure_indexes(self) -> IndexReport:
         """Ensure required indexes exist"""
-        # Create unique index on organization_name
-        self.organizations_collection.create_index("organization_name", unique=True)
-        # Create index on collection_name
-        self.organizations_collection.create_index("collection_name", unique=True)
+        return await reconcile_indexes(self.organizations_collection, [
+            # Unique index on organization_name
+            IndexModel("organization_name", unique=True),
+            # Unique index on collection_name
+            IndexModel("collection_name", unique=True),
+            # Keyset pagination order of list_organizations; prefix
+            # listings page through the organization_name index instead
+            IndexModel([("created_at", ASCENDING), ("_id", ASCENDING)]),
+            # Organization counts per cluster for placement
+            IndexModel("cluster"),
+        ])
     
-    def _generate_collection_name(self, organization_name: str) -> str:
+    def _generate_collection_name(self, org_id: ObjectId) -> str:
         """
         Generate collection name for organization
         
+        The name is derived from the immutable organization ID, so renaming
+        an organization never moves its data.
+        
         Args:
-            organization_name: Name of the organization
+            org_id: ID of the organization
             
         Returns:
-            Collection name in format: org_<organization_name>
+            Collection name in format: org_<organization_id>
         """
-        return f"org_{organization_name}"
+        return f"org_{org_id}"
     
-    def create_organization(self, org_data: OrganizationCreate) -> Optional[Dict[str, Any]]:
+    async def create_organization(self, org_data: OrganizationCreate) -> Optional[Dict[str, Any]]:
         try:
-            logger.info(f"Creating organization with data: {org_data.dict()}")
-            
             # Check if organization already exists
-            existing_org = self.organizations_collection.find_one({"organization_name": org_data.organization_name})
+            existing_org = await self.organizations_collection.find_one({"organization_name": org_data.organization_name})
             if existing_org:
-                logger.warning(f"Organization {org_data.organization_name} already exists")
+                logger.warning("Organization %s already exists", org_data.organization_name)
                 return None
 
-            # Generate collection name
-            collection_name = self._generate_collection_name(org_data.organization_name)
+            # Generate collection name from the ID the organization will get
+            org_object_id = ObjectId()
+            collection_name = self._generate_collection_name(org_object_id)
+            cluster = await self.placement.choose(org_object_id)
 
             # Create organization document
             org_doc = {
+                "_id": org_object_id,
                 "organization_name": org_data.organization_name,
                 "collection_name": collection_name,
+                "tenancy": settings.tenancy_mode,
+                "cluster": cluster,
                 "created_at": datetime.utcnow(),
-                "admin_id": None
+                "admin_id": None,
+                "version": 1
             }
             
-            logger.info(f"Inserting organization document: {org_doc}")
-            org_result = self.organizations_collection.insert_one(org_doc)
+            org_result = await self.organizations_collection.insert_one(org_doc)
             org_id = str(org_result.inserted_id)
-            logger.info(f"Inserted organization with ID: {org_id}")
+            # Drop any negative cache entry for the new name
+            self._invalidate_cache(org_data.organization_name)
             
             # Create admin user
             admin_data = AdminCreate(
@@ -77,41 +156,386 @@ class OrganizationService:
                 organization_id=org_id
             )
             
-            admin_id = self.auth_service.create_admin(admin_data)
+            try:
+                admin_id = await self.auth_service.create_admin(admin_data)
+            except PasswordHashPoolBusy:
+                await self.organizations_collection.delete_one({"_id": org_result.inserted_id})
+                raise
+            
             if not admin_id:
-                self.organizations_collection.delete_one({"_id": org_result.inserted_id})
+                await self.organizations_collection.delete_one({"_id": org_result.inserted_id})
                 logger.error("Failed to create admin user, rolling back organization")
                 return None
             
-            # Update organization with admin_id
-            self.organizations_collection.update_one(
+            # Update organization with admin_id; the admin email is stored
+            # alongside it so reads never need a second round trip. A read
+            # between insert and update may have cached an ETag already.
+            updated_at = datetime.utcnow()
+            await self.organizations_collection.update_one(
                 {"_id": org_result.inserted_id},
-                {"$set": {"admin_id": admin_id}}
+                {
+                    "$set": {
+                        "admin_id": admin_id,
+                        "admin_email": org_data.email,
+                        "updated_at": updated_at
+                    },
+                    "$inc": {"version": 1}
+                }
             )
+            self._invalidate_cache(org_data.organization_name, org_result.inserted_id)
             
             # Create dynamic collection for organization
-            collection_created = self.database_service.create_collection(collection_name)
-            if not collection_created:
-                logger.warning(f"Collection {collection_name} may already exist or failed to create")
-            
-            # Fetch and return created organization
-            created_org = self.organizations_collection.find_one({"_id": org_result.inserted_id})
-            admin = self.auth_service.get_admin_by_id(admin_id)
-            created_org["admin_email"] = admin["email"] if admin else org_data.email
-            
-            logger.info(f"Organization {org_data.organization_name} created successfully")
-            return created_org
+            storage_ready = await self.database_service.create_tenant_storage(org_doc)
+            if not storage_ready:
+                logger.warning("Collection %s may already exist or failed to create", collection_name)
+            
+            # Return created organization; every field is already known
+            org_doc["admin_id"] = admin_id
+            org_doc["admin_email"] = org_data.email
+            org_doc["updated_at"] = updated_at
+            org_doc["version"] += 1
+            
+            logger.info(
+                "Organization %s created",
+                org_data.organization_name,
+                extra={"event": "organization.created", "organization_id": org_id, "cluster": cluster}
+            )
+            return org_doc
+        except PasswordHashPoolBusy:
+            raise
         except Exception as e:
             logger.error(f"Error creating organization: {e}")
             return None
 
     
-    def get_organization_by_name(
+    @staticmethod
+    def _validation_message(error: ValidationError) -> str:
+        return "; ".join(
+            f"{'.'.join(str(part) for part in detail['loc']) or 'item'}: {detail['msg']}"
+            for detail in error.errors()
+        )
+    
+    async def bulk_create_organizations(
+        self,
+        items: List[Any],
+        client_ip: Optional[str] = None
+    ) -> List[BulkOrganizationResult]:
+        """
+        Create many organizations with a handful of round trips
+        
+        Items are validated one by one, names and emails are checked with
+        one query each, passwords are hashed in parallel, organizations and
+        admins are written with one unordered insert_many each and tenant
+        collections are created concurrently. A failing item, including an
+        invalid one, only fails itself; organizations whose tenant storage
+        could not be created are rolled back.
+        
+        Args:
+            items: Organizations to create, as parsed from the request body
+            client_ip: Address of the caller, charged one throttle token
+                per password to hash
+            
+        Returns:
+            One result per input item, in input order
+            
+        Raises:
+            Throttled: If the caller's bucket cannot cover the passwords
+        """
+        results = []
+        orgs_data: Dict[int, OrganizationCreate] = {}
+        for index, item in enumerate(items):
+            result = BulkOrganizationResult(index=index, success=False)
+            try:
+                orgs_data[index] = OrganizationCreate.model_validate(item)
+                result.organization_name = orgs_data[index].organization_name
+            except ValidationError as e:
+                if isinstance(item, dict) and isinstance(item.get("organization_name"), str):
+                    result.organization_name = item["organization_name"]
+                result.error = self._validation_message(e)
+            results.append(result)
+        
+        if not orgs_data:
+            return results
+        
+        # Reject duplicates within the batch and against existing data
+        names = [org_data.organization_name for org_data in orgs_data.values()]
+        emails = [org_data.email for org_data in orgs_data.values()]
+        existing_names = {
+            org["organization_name"]
+            async for org in self.organizations_collection.find(
+                {"organization_name": {"$in": names}},
+                {"_id": 0, "organization_name": 1}
+            )
+        }
+        existing_emails = await self.auth_service.find_existing_emails(emails)
+        
+        seen_names, seen_emails = set(), set()
+        pending = []
+        for index, org_data in orgs_data.items():
+            result = results[index]
+            if org_data.organization_name in existing_names or org_data.organization_name in seen_names:
+                result.error = "Organization already exists"
+            elif org_data.email in existing_emails or org_data.email in seen_emails:
+                result.error = "Admin email already exists"
+            else:
+                pending.append(result)
+            seen_names.add(org_data.organization_name)
+            seen_emails.add(org_data.email)
+        
+        if not pending:
+            return results
+        
+        # Throttled batches are rejected before any password is hashed
+        await self.bulk_create_throttle.check(client_ip, len(pending))
+        
+        hashed_passwords = await security_manager.hash_passwords_async(
+            [orgs_data[result.index].password for result in pending]
+        )
+        
+        # IDs are generated up front so both documents reference each other
+        now = datetime.utcnow()
+        org_ids = [ObjectId() for _ in pending]
+        placements = await self.placement.choose_many(org_ids)
+        org_docs, admin_docs = [], []
+        for result, hashed_password, org_id, cluster in zip(
+            pending, hashed_passwords, org_ids, placements
+        ):
+            org_data = orgs_data[result.index]
+            admin_id = ObjectId()
+            org_docs.append({
+                "_id": org_id,
+                "organization_name": org_data.organization_name,
+                "collection_name": self._generate_collection_name(org_id),
+                "tenancy": settings.tenancy_mode,
+                "cluster": cluster,
+                "created_at": now,
+                "admin_id": str(admin_id),
+                "admin_email": org_data.email,
+                "version": 1
+            })
+            admin_docs.append({
+                "_id": admin_id,
+                "email": org_data.email,
+                "hashed_password": hashed_password,
+                "organization_id": str(org_id),
+                "created_at": now,
+                "is_active": True
+            })
+        
+        failed_orgs = await insert_many_unordered(self.organizations_collection, org_docs)
+        for position, reason in failed_orgs.items():
+            pending[position].error = f"Organization not created: {reason}"
+        
+        inserted = [position for position in range(len(pending)) if position not in failed_orgs]
+        failed_admins = await self.auth_service.insert_admins(
+            [admin_docs[position] for position in inserted]
+        )
+        if failed_admins:
+            rolled_back = []
+            for admin_position, reason in failed_admins.items():
+                position = inserted[admin_position]
+                pending[position].error = f"Admin not created: {reason}"
+                rolled_back.append(org_docs[position]["_id"])
+            await self.organizations_collection.delete_many({"_id": {"$in": rolled_back}})
+            inserted = [position for position in inserted if pending[position].error is None]
+        
+        # Create tenant collections concurrently
+        limiter = asyncio.Semaphore(settings.bulk_create_collection_concurrency)
+        
+        async def create_tenant_collection(org_doc: Dict[str, Any]) -> bool:
+            async with limiter:
+                return await self.database_service.create_tenant_storage(
+                    org_doc,
+                    check_exists=False
+                )
+        
+        storage_ready = await asyncio.gather(*(
+            create_tenant_collection(org_docs[position]) for position in inserted
+        ))
+        without_storage = [
+            position for position, ready in zip(inserted, storage_ready) if not ready
+        ]
+        if without_storage:
+            for position in without_storage:
+                pending[position].error = "Tenant storage not created"
+            await self.organizations_collection.delete_many(
+                {"_id": {"$in": [org_docs[position]["_id"] for position in without_storage]}}
+            )
+            await self.auth_service.delete_admins(
+                [admin_docs[position]["_id"] for position in without_storage]
+            )
+            inserted = [position for position in inserted if pending[position].error is None]
+        
+        for position in inserted:
+            org_doc = org_docs[position]
+            self._invalidate_cache(org_doc["organization_name"])
+            pending[position].success = True
+            pending[position].organization_id = str(org_doc["_id"])
+            pending[position].collection_name = org_doc["collection_name"]
+        
+        logger.info(
+            "Bulk created %d of %d organizations",
+            len(inserted),
+            len(items),
+            extra={"event": "organization.bulk_created"}
+        )
+        return results
+    
+    @staticmethod
+    def _encode_cursor(org: Dict[str, Any], by_name: bool) -> str:
+        if by_name:
+            position = {"name": org["organization_name"]}
+        else:
+            position = {
+                "created_at": org["created_at"].isoformat(),
+                "id": str(org["_id"])
+            }
+        return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+    
+    @staticmethod
+    def _decode_cursor(cursor: str, by_name: bool) -> Dict[str, Any]:
+        try:
+            position = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            if by_name:
+                if not isinstance(position["name"], str):
+                    raise TypeError("name is not a string")
+                return position
+            return {
+                "created_at": datetime.fromisoformat(position["created_at"]),
+                "id": ObjectId(position["id"])
+            }
+        except Exception as e:
+            raise ValueError("Invalid page cursor") from e
+    
+    async def list_organizations(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        name_prefix: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        operator: bool = False
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        List organizations with keyset pagination
+        
+        Organizations come in creation order, each page continuing after the
+        (created_at, _id) position encoded in the cursor. With a name_prefix
+        they come in name order instead, so the prefix range and the page
+        position are both served by the unique organization_name index.
+        Either way a page's cost does not depend on how deep it is.
+        
+        Args:
+            limit: Maximum number of organizations to return
+            cursor: next_cursor of the previous page with the same name_prefix
+            name_prefix: Only return organizations whose name starts with it
+            fields: Fields to return besides _id and created_at; all
+                listable fields when omitted
+            operator: Whether the caller may see admin contact details
+            
+        Returns:
+            Page of organizations and the cursor of the next page, or None
+            when this is the last page
+            
+        Raises:
+            ValueError: If the cursor or a field name is invalid
+        """
+        listable = OPERATOR_LISTABLE_FIELDS if operator else LISTABLE_FIELDS
+        fields = fields or list(listable)
+        unknown = set(fields) - set(listable)
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        
+        by_name = bool(name_prefix)
+        position = self._decode_cursor(cursor, by_name) if cursor else None
+        query: Dict[str, Any] = {}
+        if by_name:
+            query["organization_name"] = {"$regex": f"^{re.escape(name_prefix.lower())}"}
+            if position:
+                query["organization_name"]["$gt"] = position["name"]
+            sort = [("organization_name", ASCENDING)]
+        else:
+            if position:
+                query["$or"] = [
+                    {"created_at": {"$gt": position["created_at"]}},
+                    {"created_at": position["created_at"], "_id": {"$gt": position["id"]}}
+                ]
+            sort = [("created_at", ASCENDING), ("_id", ASCENDING)]
+        
+        projection = {field: 1 for field in fields}
+        projection["created_at"] = 1
+        if by_name:
+            projection["organization_name"] = 1
+        
+        # One extra document tells whether another page exists
+        orgs = await self.organizations_collection.find(query, projection).sort(
+            sort
+        ).limit(limit + 1).to_list(length=limit + 1)
+        
+        next_cursor = None
+        if len(orgs) > limit:
+            orgs = orgs[:limit]
+            next_cursor = self._encode_cursor(orgs[-1], by_name)
+        
+        return orgs, next_cursor
+    
+    async def _find_organization(self, query: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Load an organization from MongoDB in a single projected query
+        
+        Args:
+            query: Filter matching a single organization
+            
+        Returns:
+            Organization document if found, None otherwise
+        """
+        org = await self.organizations_collection.find_one(
+            query,
+            ORGANIZATION_PROJECTION
+        )
+        
+        if org and "admin_email" not in org:
+            await self._backfill_admin_email(org)
+        
+        return org
+    
+    async def _backfill_admin_email(self, org: Dict[str, Any]):
+        """
+        Copy the admin email onto an organization created before it was stored
+        
+        Args:
+            org: Organization document, updated in place
+        """
+        admin_email = None
+        if org.get("admin_id"):
+            admin_email = await self.auth_service.get_admin_email(org["admin_id"])
+        
+        if admin_email is None:
+            org["admin_email"] = "N/A"
+            return
+        
+        org["admin_email"] = admin_email
+        await self.organizations_collection.update_one(
+            {"_id": org["_id"], "admin_email": {"$exists": False}},
+            {"$set": {"admin_email": admin_email}}
+        )
+    
+    def _invalidate_cache(
+        self,
+        organization_name: Optional[str] = None,
+        org_id: Optional[Any] = None
+    ):
+        if self.cache is not None:
+            self.cache.invalidate(
+                organization_name=organization_name,
+                org_id=str(org_id) if org_id is not None else None
+            )
+    
+    async def get_organization_by_name(
         self,
         organization_name: str
     ) -> Optional[Dict[str, Any]]:
         """
-        Get organization by name
+        Get organization by name, served from the cache when possible
         
         Args:
             organization_name: Name of the organization
@@ -120,23 +544,31 @@ class OrganizationService:
             Organization document if found, None otherwise
         """
         try:
-            org = self.organizations_collection.find_one(
+            generation = None
+            if self.cache is not None:
+                cached = self.cache.get(organization_name)
+                if cached is not MISS:
+                    return cached.to_document() if cached else None
+                generation = self.cache.generation
+            
+            org = await self._find_organization(
                 {"organization_name": organization_name}
             )
             
-            if org:
-                # Get admin email
-                admin = self.auth_service.get_admin_by_id(org["admin_id"])
-                org["admin_email"] = admin["email"] if admin else "N/A"
+            if self.cache is not None:
+                if org:
+                    self.cache.put(org, generation)
+                else:
+                    self.cache.put_missing(organization_name, generation)
             
             return org
         except Exception as e:
             logger.error(f"Error getting organization: {e}")
             return None
     
-    def get_organization_by_id(self, org_id: str) -> Optional[Dict[str, Any]]:
+    async def get_organization_by_id(self, org_id: str) -> Optional[Dict[str, Any]]:
         """
-        Get organization by ID
+        Get organization by ID, served from the cache when possible
         
         Args:
             org_id: Organization ID
@@ -145,26 +577,121 @@ class OrganizationService:
             Organization document if found, None otherwise
         """
         try:
-            org = self.organizations_collection.find_one({"_id": ObjectId(org_id)})
+            generation = None
+            if self.cache is not None:
+                cached = self.cache.get_by_id(org_id)
+                if cached is not MISS:
+                    return cached.to_document()
+                generation = self.cache.generation
+            
+            org = await self._find_organization({"_id": ObjectId(org_id)})
             
-            if org:
-                # Get admin email
-                admin = self.auth_service.get_admin_by_id(org["admin_id"])
-                org["admin_email"] = admin["email"] if admin else "N/A"
+            if org and self.cache is not None:
+                self.cache.put(org, generation)
             
             return org
         except Exception as e:
             logger.error(f"Error getting organization by ID: {e}")
             return None
     
-    def update_organization(
+    async def _authorize_update(
+        self,
+        old_org_name: str,
+        new_org_name: str,
+        admin_id: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Check that an update may go ahead
+        
+        Args:
+            old_org_name: Current organization name
+            new_org_name: Requested organization name
+            admin_id: Admin ID performing the update
+            
+        Returns:
+            Existing organization document if allowed, None otherwise
+        """
+        # Get existing organization
+        existing_org = await self.get_organization_by_name(old_org_name)
+        
+        if not existing_org:
+            logger.error(f"Organization {old_org_name} not found")
+            return None
+        
+        # Verify admin owns this organization
+        if existing_org["admin_id"] != admin_id:
+            logger.error("Admin does not have permission to update this organization")
+            return None
+        
+        # Check if new name is different and already exists
+        if new_org_name != old_org_name:
+            new_org_exists = await self.organizations_collection.find_one(
+                {"organization_name": new_org_name},
+                {"_id": 1}
+            )
+            
+            if new_org_exists:
+                logger.error(f"Organization {new_org_name} already exists")
+                return None
+        
+        return existing_org
+    
+    async def _apply_update(
+        self,
+        existing_org: Dict[str, Any],
+        new_org_name: str,
+        hashed_password: Optional[str]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Write an authorized update
+        
+        Args:
+            existing_org: Organization document before the update
+            new_org_name: New organization name, possibly unchanged
+            hashed_password: New admin password hash, if any
+            
+        Returns:
+            Updated organization document
+        """
+        old_org_name = existing_org["organization_name"]
+        update_doc = {"updated_at": datetime.utcnow()}
+        if new_org_name != old_org_name:
+            # The tenant collection is keyed by ID, so only the name changes
+            update_doc["organization_name"] = new_org_name
+        
+        # Update organization; the version backs the ETag of /org/get
+        await self.organizations_collection.update_one(
+            {"_id": existing_org["_id"]},
+            {"$set": update_doc, "$inc": {"version": 1}}
+        )
+        self._invalidate_cache(old_org_name, existing_org["_id"])
+        self._invalidate_cache(new_org_name)
+        
+        # Update admin password if provided
+        if hashed_password:
+            await self.auth_service.set_admin_password_hash(
+                existing_org["admin_id"],
+                hashed_password
+            )
+        
+        # Return updated organization
+        updated_org = await self.get_organization_by_name(new_org_name)
+        
+        logger.info(
+            "Organization %s updated",
+            old_org_name,
+            extra={"event": "organization.updated", "organization_id": str(existing_org["_id"])}
+        )
+        return updated_org
+    
+    async def update_organization(
         self,
         old_org_name: str,
         update_data: OrganizationUpdate,
         admin_id: str
     ) -> Optional[Dict[str, Any]]:
         """
-        Update organization and migrate data to new collection
+        Update organization; a rename only changes metadata
         
         Args:
             old_org_name: Current organization name
@@ -175,87 +702,185 @@ class OrganizationService:
             Updated organization document if successful, None otherwise
         """
         try:
-            # Get existing organization
-            existing_org = self.get_organization_by_name(old_org_name)
-            
+            existing_org = await self._authorize_update(
+                old_org_name,
+                update_data.organization_name,
+                admin_id
+            )
             if not existing_org:
-                logger.error(f"Organization {old_org_name} not found")
-                return None
-            
-            # Verify admin owns this organization
-            if existing_org["admin_id"] != admin_id:
-                logger.error("Admin does not have permission to update this organization")
                 return None
             
-            # Check if new name is different and already exists
-            if update_data.organization_name != old_org_name:
-                new_org_exists = self.organizations_collection.find_one(
-                    {"organization_name": update_data.organization_name}
-                )
-                
-                if new_org_exists:
-                    logger.error(
-                        f"Organization {update_data.organization_name} already exists"
-                    )
-                    return None
-                
-                # Generate new collection name
-                new_collection_name = self._generate_collection_name(
-                    update_data.organization_name
+            hashed_password = None
+            if update_data.password:
+                hashed_password = await security_manager.hash_password_async(
+                    update_data.password
                 )
-                old_collection_name = existing_org["collection_name"]
-                
-                # Create new collection
-                self.database_service.create_collection(new_collection_name)
-                
-                # Copy data from old collection to new
-                if self.database_service.collection_exists(old_collection_name):
-                    self.database_service.copy_collection_data(
-                        old_collection_name,
-                        new_collection_name
-                    )
-                    
-                    # Delete old collection
-                    self.database_service.delete_collection(old_collection_name)
-                
-                # Update organization document
-                update_doc = {
-                    "organization_name": update_data.organization_name,
-                    "collection_name": new_collection_name,
-                    "updated_at": datetime.utcnow()
-                }
-            else:
-                # Only update admin credentials if name hasn't changed
-                update_doc = {
-                    "updated_at": datetime.utcnow()
-                }
             
-            # Update organization
-            self.organizations_collection.update_one(
-                {"_id": existing_org["_id"]},
-                {"$set": update_doc}
+            return await self._apply_update(
+                existing_org,
+                update_data.organization_name,
+                hashed_password
+            )
+        except PasswordHashPoolBusy:
+            raise
+        except Exception as e:
+            logger.error(f"Error updating organization: {e}")
+            return None
+    
+    async def submit_organization_update(
+        self,
+        old_org_name: str,
+        update_data: OrganizationUpdate,
+        admin_id: str
+    ) -> Optional[str]:
+        """
+        Validate an update and queue it as a background job
+        
+        A new password is hashed now and staged on the admin document; the
+        job puts it in use once the rest of the update is written, so no
+        credential is ever written to the job document and a failed update
+        leaves the old password in place.
+        
+        Args:
+            old_org_name: Current organization name
+            update_data: Updated organization data
+            admin_id: Admin ID performing the update
+            
+        Returns:
+            Job ID if queued, None if the update is not allowed
+        """
+        try:
+            existing_org = await self._authorize_update(
+                old_org_name,
+                update_data.organization_name,
+                admin_id
             )
+            if not existing_org:
+                return None
             
-            # Update admin password if provided
+            params = {
+                "organization_id": str(existing_org["_id"]),
+                "organization_name": update_data.organization_name
+            }
             if update_data.password:
-                self.auth_service.update_admin_password(
-                    admin_id,
+                hashed_password = await security_manager.hash_password_async(
                     update_data.password
                 )
+                params["password_change_id"] = uuid.uuid4().hex
+                staged = await self.auth_service.stage_password_hash(
+                    existing_org["admin_id"],
+                    params["password_change_id"],
+                    hashed_password
+                )
+                if not staged:
+                    return None
             
-            # Return updated organization
-            updated_org = self.get_organization_by_name(
-                update_data.organization_name
-            )
-            
-            logger.info(f"Organization {old_org_name} updated successfully")
-            return updated_org
-            
+            try:
+                return await self.job_service.enqueue(
+                    UPDATE_ORGANIZATION_JOB,
+                    params,
+                    owner_id=admin_id
+                )
+            except Exception:
+                if "password_change_id" in params:
+                    await self.auth_service.discard_staged_password(
+                        existing_org["admin_id"],
+                        params["password_change_id"]
+                    )
+                raise
+        except PasswordHashPoolBusy:
+            raise
         except Exception as e:
-            logger.error(f"Error updating organization: {e}")
+            logger.error(f"Error queueing organization update: {e}")
             return None
     
-    def delete_organization(
+    async def get_owned_organization(
+        self,
+        organization_name: str,
+        admin_id: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get an organization only if the admin owns it
+        
+        Args:
+            organization_name: Name of the organization
+            admin_id: Admin ID making the request
+            
+        Returns:
+            Organization document if owned by the admin, None otherwise
+        """
+        # Get organization
+        org = await self.get_organization_by_name(organization_name)
+        
+        if not org:
+            logger.error(f"Organization {organization_name} not found")
+            return None
+        
+        # Verify admin owns this organization
+        if org["admin_id"] != admin_id:
+            logger.error(f"Admin does not own organization {organization_name}")
+            return None
+        
+        return org
+    
+    async def _authorize_delete(
+        self,
+        organization_name: str,
+        admin_id: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Check that a delete may go ahead
+        
+        Args:
+            organization_name: Name of the organization
+            admin_id: Admin ID performing the deletion
+            
+        Returns:
+            Organization document if allowed, None otherwise
+        """
+        return await self.get_owned_organization(organization_name, admin_id)
+    
+    async def _apply_delete(
+        self,
+        org: Dict[str, Any],
+        context: Optional[JobContext] = None
+    ) -> bool:
+        """
+        Delete an authorized organization and its data
+        
+        Args:
+            org: Organization document
+            context: Job context to report progress to, if run as a job
+            
+        Returns:
+            True if the organization document was deleted
+        """
+        # Delete organization collection
+        if context:
+            await context.update_progress(step="drop_collection")
+        await self.database_service.drop_tenant_storage(org)
+        
+        # Delete admin user
+        if context:
+            await context.update_progress(step="delete_admin")
+        await self.auth_service.delete_admin(org["admin_id"])
+        
+        # Delete organization document
+        result = await self.organizations_collection.delete_one(
+            {"_id": org["_id"]}
+        )
+        self._invalidate_cache(org["organization_name"], org["_id"])
+        if result.deleted_count:
+            self.placement.forget(org.get("cluster") or DEFAULT_CLUSTER)
+        
+        logger.info(
+            "Organization %s deleted",
+            org["organization_name"],
+            extra={"event": "organization.deleted", "organization_id": str(org["_id"])}
+        )
+        return result.deleted_count > 0
+    
+    async def delete_organization(
         self,
         organization_name: str,
         admin_id: str
@@ -271,33 +896,104 @@ class OrganizationService:
             True if deleted successfully, False otherwise
         """
         try:
-            # Get organization
-            org = self.get_organization_by_name(organization_name)
-            
+            org = await self._authorize_delete(organization_name, admin_id)
             if not org:
-                logger.error(f"Organization {organization_name} not found")
                 return False
             
-            # Verify admin owns this organization
-            if org["admin_id"] != admin_id:
-                logger.error("Admin does not have permission to delete this organization")
-                return False
+            return await self._apply_delete(org)
             
-            # Delete organization collection
-            self.database_service.delete_collection(org["collection_name"])
+        except Exception as e:
+            logger.error(f"Error deleting organization: {e}")
+            return False
+    
+    async def submit_organization_delete(
+        self,
+        organization_name: str,
+        admin_id: str
+    ) -> Optional[str]:
+        """
+        Validate a delete and queue it as a background job
+        
+        Args:
+            organization_name: Name of the organization
+            admin_id: Admin ID performing the deletion
             
-            # Delete admin user
-            self.auth_service.delete_admin(org["admin_id"])
+        Returns:
+            Job ID if queued, None if the delete is not allowed
+        """
+        try:
+            org = await self._authorize_delete(organization_name, admin_id)
+            if not org:
+                return None
             
-            # Delete organization document
-            result = self.organizations_collection.delete_one(
-                {"_id": org["_id"]}
+            return await self.job_service.enqueue(
+                DELETE_ORGANIZATION_JOB,
+                {"organization_id": str(org["_id"])},
+                owner_id=admin_id
             )
-            
-            logger.info(f"Organization {organization_name} deleted successfully")
-            return result.deleted_count > 0
-            
         except Exception as e:
-            logger.error(f"Error deleting organization: {e}")
-            return False
+            logger.error(f"Error queueing organization delete: {e}")
+            return None
+    
+    def register_jobs(self, job_service: JobService):
+        """
+        Register the background jobs run for this service
+        
+        Args:
+            job_service: Job queue that will run them
+        """
+        self.job_service = job_service
+        job_service.register(UPDATE_ORGANIZATION_JOB, self._run_update_job)
+        job_service.register(DELETE_ORGANIZATION_JOB, self._run_delete_job)
+    
+    async def _run_update_job(
+        self,
+        job: Dict[str, Any],
+        context: JobContext
+    ) -> Dict[str, Any]:
+        params = job["params"]
+        existing_org = await self._find_organization(
+            {"_id": ObjectId(params["organization_id"])}
+        )
+        if not existing_org:
+            raise ValueError("Organization no longer exists")
+        
+        change_id = params.get("password_change_id")
+        try:
+            await context.update_progress(step="update_organization")
+            updated_org = await self._apply_update(
+                existing_org,
+                params["organization_name"],
+                None
+            )
+        except Exception:
+            if change_id:
+                await self.auth_service.discard_staged_password(
+                    existing_org["admin_id"],
+                    change_id
+                )
+            raise
+        
+        if change_id:
+            await context.update_progress(step="update_password")
+            await self.auth_service.apply_staged_password(existing_org["admin_id"], change_id)
+        return {
+            "organization_id": params["organization_id"],
+            "organization_name": updated_org["organization_name"]
+        }
+    
+    async def _run_delete_job(
+        self,
+        job: Dict[str, Any],
+        context: JobContext
+    ) -> Dict[str, Any]:
+        params = job["params"]
+        org = await self._find_organization(
+            {"_id": ObjectId(params["organization_id"])}
+        )
+        if not org:
+            # Already deleted by an earlier attempt
+            return {"organization_id": params["organization_id"], "deleted": True}
         
+        deleted = await self._apply_delete(org, context)
+        return {"organization_id": params["organization_id"], "deleted": deleted}
@@ -0,0 +1,143 @@
+from app.database.mongodb import async_mongodb
+from app.database.indexes import IndexReport, reconcile_indexes
+from app.config import settings
+from datetime import datetime, timedelta
+from pymongo import IndexModel, ReturnDocument
+from typing import Any, Dict, Optional
+import hashlib
+import logging
+import secrets
+import uuid
+
+logger = logging.getLogger(__name__)
+
+
+class RefreshTokenService:
+    """
+    Issues and rotates opaque refresh tokens
+
+    Only the SHA-256 digest of a token is stored, as the document ``_id``, so
+    checking one is a single indexed lookup and a leaked collection cannot
+    be replayed. Every refresh consumes the presented token and issues a new
+    one in the same family. Presenting a consumed token again means it was
+    copied, so the whole family is revoked and its holder has to log in.
+    A TTL index removes tokens once they expire.
+    """
+
+    def __init__(self):
+        self.db = async_mongodb.get_database()
+        self.refresh_tokens_collection = self.db["refresh_tokens"]
+
+    async def _ensure_indexes(self) -> IndexReport:
+        """Ensure required indexes exist"""
+        return await reconcile_indexes(self.refresh_tokens_collection, [
+            # Tokens are removed once they expire
+            IndexModel("expires_at", expireAfterSeconds=0),
+            # Revoking a family after reuse
+            IndexModel("family_id"),
+            # Revoking every token of an admin
+            IndexModel("admin_id"),
+        ])
+
+    @staticmethod
+    def _digest(refresh_token: str) -> str:
+        return hashlib.sha256(refresh_token.encode()).hexdigest()
+
+    async def issue(
+        self,
+        claims: Dict[str, Any],
+        family_id: Optional[str] = None
+    ) -> str:
+        """
+        Issue a refresh token
+
+        Args:
+            claims: admin_id, email and organization_id of the admin
+            family_id: Family of the token being rotated; a new family
+                is started when omitted
+
+        Returns:
+            The refresh token; it is not stored anywhere in clear
+        """
+        refresh_token = secrets.token_urlsafe(32)
+        now = datetime.utcnow()
+        await self.refresh_tokens_collection.insert_one({
+            "_id": self._digest(refresh_token),
+            "family_id": family_id or uuid.uuid4().hex,
+            "admin_id": claims["admin_id"],
+            "email": claims["email"],
+            "organization_id": claims["organization_id"],
+            "created_at": now,
+            "used_at": None,
+            "expires_at": now + timedelta(days=settings.refresh_token_expiration_days)
+        })
+        return refresh_token
+
+    async def consume(self, refresh_token: str) -> Optional[Dict[str, Any]]:
+        """
+        Mark a refresh token as used
+
+        Args:
+            refresh_token: Token presented by the client
+
+        Returns:
+            The token's record if it was valid and unused, None otherwise
+        """
+        digest = self._digest(refresh_token)
+        now = datetime.utcnow()
+        record = await self.refresh_tokens_collection.find_one_and_update(
+            {"_id": digest, "used_at": None, "expires_at": {"$gt": now}},
+            {"$set": {"used_at": now}},
+            return_document=ReturnDocument.AFTER
+        )
+        if record is not None:
+            return record
+
+        reused = await self.refresh_tokens_collection.find_one(
+            {"_id": digest, "used_at": {"$ne": None}},
+            {"family_id": 1, "admin_id": 1}
+        )
+        if reused is not None:
+            result = await self.refresh_tokens_collection.delete_many(
+                {"family_id": reused["family_id"]}
+            )
+            logger.warning(
+                f"Refresh token reuse for admin {reused['admin_id']}, "
+                f"revoked {result.deleted_count} tokens of its family"
+            )
+        return None
+
+    async def revoke_admin(self, admin_id: str) -> int:
+        """
+        Revoke every refresh token of an admin
+
+        Args:
+            admin_id: Admin ID
+
+        Returns:
+            Number of revoked tokens
+        """
+        result = await self.refresh_tokens_collection.delete_many({"admin_id": admin_id})
+        return result.deleted_count
+
+    async def revoke_family(self, refresh_token: str, admin_id: str) -> int:
+        """
+        Revoke the session a refresh token belongs to
+
+        Args:
+            refresh_token: Any token of the session, used or not
+            admin_id: Admin the token must belong to
+
+        Returns:
+            Number of revoked tokens
+        """
+        record = await self.refresh_tokens_collection.find_one(
+            {"_id": self._digest(refresh_token), "admin_id": admin_id},
+            {"family_id": 1}
+        )
+        if record is None:
+            return 0
+        result = await self.refresh_tokens_collection.delete_many(
+            {"family_id": record["family_id"]}
+        )
+        return result.deleted_count
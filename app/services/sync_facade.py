@@ -0,0 +1,68 @@
+from app.database.mongodb import async_mongodb
+from app.database.clusters import cluster_registry
+from app.services.container import ServiceContainer
+from typing import Any, Optional
+import asyncio
+import functools
+import inspect
+
+
+class SyncServiceFacade:
+    """
+    Blocking wrapper around an async service for scripts and shells
+
+    Coroutine methods of the wrapped service are run to completion on the
+    facade's private event loop; every other attribute is passed through.
+    """
+
+    def __init__(self, service: Any, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self._service = service
+        self._loop = loop or asyncio.new_event_loop()
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._service, name)
+        if not inspect.iscoroutinefunction(attr):
+            return attr
+
+        @functools.wraps(attr)
+        def call(*args, **kwargs):
+            return self._loop.run_until_complete(attr(*args, **kwargs))
+
+        return call
+
+
+class SyncServices:
+    """
+    Blocking access to the application services outside of the API process
+
+    Example:
+        services = SyncServices()
+        org = services.organization_service.get_organization_by_name("acme")
+        services.close()
+    """
+
+    def __init__(self):
+        self._loop = asyncio.new_event_loop()
+        self._container = ServiceContainer()
+        # Jobs are left to the API workers and the private loop only runs while
+        # a call is made, so no background task is started
+        self._loop.run_until_complete(
+            self._container.startup(start_workers=False, start_background=False)
+        )
+
+        self.auth_service = SyncServiceFacade(self._container.auth_service, self._loop)
+        self.database_service = SyncServiceFacade(
+            self._container.database_service,
+            self._loop
+        )
+        self.organization_service = SyncServiceFacade(
+            self._container.organization_service,
+            self._loop
+        )
+
+    def close(self):
+        """Release the services and the private event loop"""
+        self._loop.run_until_complete(self._container.shutdown())
+        cluster_registry.close()
+        async_mongodb.close()
+        self._loop.close()
@@ -0,0 +1,111 @@
+from app.database.mongodb import async_mongodb
+from app.database.indexes import IndexReport, reconcile_indexes
+from app.models.admin import TokenData
+from app.utils.security import revoked_tokens
+from app.utils.token_cache import RevocationList
+from app.config import settings
+from datetime import datetime, timedelta, timezone
+from pymongo import IndexModel
+from typing import Optional
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Re-read revocations this far behind the last sync to tolerate clock skew
+# between the processes writing them
+SYNC_OVERLAP = timedelta(seconds=60)
+
+
+class TokenRevocationService:
+    """
+    Records revoked access tokens and keeps the in-memory list in sync
+
+    Revocations are written to the revoked_tokens collection, which a TTL
+    index empties once the tokens would have expired. Every process polls
+    it every ``token_revocation_sync_seconds`` for new entries, so request
+    authentication itself never queries MongoDB. A token revoked in another
+    process is rejected here within one sync interval.
+    """
+
+    def __init__(self, revocations: RevocationList = revoked_tokens):
+        self.db = async_mongodb.get_database()
+        self.revoked_collection = self.db["revoked_tokens"]
+        self.revocations = revocations
+        self._synced_at: Optional[datetime] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def _ensure_indexes(self) -> IndexReport:
+        """Ensure required indexes exist"""
+        return await reconcile_indexes(self.revoked_collection, [
+            # Entries are removed once the token has expired
+            IndexModel("expires_at", expireAfterSeconds=0),
+            # Incremental sync of recent revocations
+            IndexModel("revoked_at"),
+        ])
+
+    async def revoke(self, token_data: TokenData) -> bool:
+        """
+        Revoke an access token until it expires
+
+        Args:
+            token_data: Verified token to revoke
+
+        Returns:
+            True if revoked, False if the token has no ID to revoke it by
+        """
+        if token_data.jti is None or token_data.exp is None:
+            return False
+
+        expires_at = token_data.exp.timestamp()
+        await self.revoked_collection.update_one(
+            {"_id": token_data.jti},
+            {"$set": {
+                "admin_id": token_data.admin_id,
+                "revoked_at": datetime.utcnow(),
+                "expires_at": datetime.utcfromtimestamp(expires_at)
+            }},
+            upsert=True
+        )
+        self.revocations.add(token_data.jti, expires_at)
+        logger.info("Revoked token of admin %s", token_data.admin_id, extra={"event": "token.revoked"})
+        return True
+
+    async def sync(self):
+        """Load revocations recorded since the last sync"""
+        now = datetime.utcnow()
+        query = {"expires_at": {"$gt": now}}
+        if self._synced_at is not None:
+            query["revoked_at"] = {"$gte": self._synced_at - SYNC_OVERLAP}
+
+        cursor = self.revoked_collection.find(query, {"expires_at": 1})
+        self.revocations.update([
+            # MongoDB returns naive UTC datetimes
+            (entry["_id"], entry["expires_at"].replace(tzinfo=timezone.utc).timestamp())
+            async for entry in cursor
+        ])
+        self.revocations.prune()
+        self._synced_at = now
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await self.sync()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Token revocation sync failed: {e}")
+            await asyncio.sleep(settings.token_revocation_sync_seconds)
@@ -1,3 +1,22 @@
-from app.utils.security import security_manager, SecurityManager
+from app.utils.security import (
+    security_manager,
+    SecurityManager,
+    password_hash_pool,
+    PasswordHashPool,
+    PasswordHashPoolBusy,
+    access_token_cache,
+    revoked_tokens
+)
+from app.utils.token_cache import AccessTokenCache, RevocationList
 
-__all__ = ["security_manager", "SecurityManager"]
+__all__ = [
+    "security_manager",
+    "SecurityManager",
+    "password_hash_pool",
+    "PasswordHashPool",
+    "PasswordHashPoolBusy",
+    "access_token_cache",
+    "revoked_tokens",
+    "AccessTokenCache",
+    "RevocationList"
+]
@@ -0,0 +1,100 @@
+"""
+Pick the bcrypt cost factor for a target hashing time on this host
+
+    python -m app.utils.bcrypt_calibration [--target-ms 250] [--samples 3]
+
+Each cost from --min-rounds upwards is timed until one exceeds the target;
+the highest cost that stays within it is suggested as BCRYPT_ROUNDS. Run it
+on the hardware, and under the CPU limits, the API will run with.
+"""
+from passlib.hash import bcrypt
+from typing import Dict, List
+import argparse
+import statistics
+import time
+
+SAMPLE_PASSWORD = "calibration-password"
+
+
+def measure_rounds(rounds: int, samples: int = 3) -> float:
+    """
+    Time hashing one password
+
+    Args:
+        rounds: bcrypt cost factor
+        samples: Hashes to time
+
+    Returns:
+        Median hashing time in milliseconds
+    """
+    hasher = bcrypt.using(rounds=rounds)
+    timings: List[float] = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        hasher.hash(SAMPLE_PASSWORD)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate(
+    target_ms: float,
+    min_rounds: int = 8,
+    max_rounds: int = 16,
+    samples: int = 3
+) -> Dict[str, object]:
+    """
+    Find the highest cost whose hashing time stays within the target
+
+    Every extra round doubles the time, so measuring stops at the first
+    cost over the target.
+
+    Args:
+        target_ms: Acceptable hashing time in milliseconds
+        min_rounds: Lowest cost considered; suggested even if over target
+        max_rounds: Highest cost considered
+        samples: Hashes timed per cost
+
+    Returns:
+        Suggested rounds and the measured milliseconds per cost
+    """
+    measurements: Dict[int, float] = {}
+    suggested = min_rounds
+    for rounds in range(min_rounds, max_rounds + 1):
+        measurements[rounds] = measure_rounds(rounds, samples)
+        if measurements[rounds] > target_ms:
+            break
+        suggested = rounds
+    return {"rounds": suggested, "milliseconds": measurements}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--target-ms",
+        type=float,
+        default=250.0,
+        help="acceptable time to hash one password (default: 250)"
+    )
+    parser.add_argument("--min-rounds", type=int, default=8)
+    parser.add_argument("--max-rounds", type=int, default=16)
+    parser.add_argument(
+        "--samples",
+        type=int,
+        default=3,
+        help="hashes timed per cost factor (default: 3)"
+    )
+    args = parser.parse_args()
+
+    result = calibrate(
+        args.target_ms,
+        min_rounds=args.min_rounds,
+        max_rounds=args.max_rounds,
+        samples=args.samples
+    )
+    for rounds, milliseconds in result["milliseconds"].items():
+        print(f"rounds={rounds:2d}  {milliseconds:8.1f} ms")
+    print(f"BCRYPT_ROUNDS={result['rounds']}")
+
+
+if __name__ == "__main__":
+    main()
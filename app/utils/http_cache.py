@@ -0,0 +1,58 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+
+def organization_etag(org: Dict[str, Any]) -> str:
+    """
+    Strong ETag of an organization's representation
+
+    Every write that changes what /org/get returns increments the
+    organization's version, so ID and version identify the response.
+    """
+    return f'"{org["_id"]}-{org.get("version", 0)}"'
+
+
+def http_date(value: datetime) -> str:
+    """Format a naive UTC datetime from MongoDB as an HTTP date"""
+    return format_datetime(value.replace(tzinfo=timezone.utc, microsecond=0), usegmt=True)
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag"""
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (candidate.strip() for candidate in if_none_match.split(","))
+    return etag.removeprefix("W/") in (candidate.removeprefix("W/") for candidate in candidates)
+
+
+def is_not_modified(
+    headers: Any,
+    etag: str,
+    last_modified: Optional[datetime] = None
+) -> bool:
+    """
+    Whether a conditional GET can be answered with 304 Not Modified
+
+    If-None-Match takes precedence; If-Modified-Since is only consulted
+    when the request has no If-None-Match (RFC 9110, section 13.2.2).
+
+    Args:
+        headers: Request headers
+        etag: Current ETag of the resource
+        last_modified: Naive UTC time the resource last changed
+    """
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag_matches(if_none_match, etag)
+
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return last_modified.replace(tzinfo=timezone.utc, microsecond=0) <= since
@@ -0,0 +1,70 @@
+from app.utils.metrics import EVENT_LOOP_LAG
+from typing import Dict, Optional
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class EventLoopMonitor:
+    """
+    Measures how late the event loop resumes a sleeping task
+
+    A task sleeps for ``interval`` seconds at a time; any delay beyond that
+    is time the loop spent running something else without yielding, such
+    as a blocking driver call or a password hash. Delays over
+    ``stall_threshold`` are logged as stalls.
+    """
+
+    def __init__(self, interval: float = 0.1, stall_threshold: float = 0.1):
+        self.interval = interval
+        self.stall_threshold = stall_threshold
+        self.samples = 0
+        self.stalls = 0
+        self.lag_total = 0.0
+        self.lag_max = 0.0
+        self.lag_last = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            due = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.record(max(loop.time() - due, 0.0))
+
+    def record(self, lag: float):
+        self.samples += 1
+        self.lag_total += lag
+        self.lag_last = lag
+        self.lag_max = max(self.lag_max, lag)
+        EVENT_LOOP_LAG.observe(lag)
+        if lag > self.stall_threshold:
+            self.stalls += 1
+            logger.warning(
+                "Event loop stalled for %.0f ms",
+                lag * 1000,
+                extra={"event": "loop.stalled", "lag_seconds": round(lag, 6)}
+            )
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "samples": self.samples,
+            "stalls": self.stalls,
+            "lag_last_seconds": round(self.lag_last, 6),
+            "lag_mean_seconds": round(self.lag_total / self.samples, 6) if self.samples else 0.0,
+            "lag_max_seconds": round(self.lag_max, 6)
+        }
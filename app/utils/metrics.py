@@ -0,0 +1,248 @@
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest
+)
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import REGISTRY, Collector
+from pymongo import monitoring
+from app.utils.request_stats import request_stats_listener
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+import re
+import threading
+import time
+
+# Tenant collections are one per organization; labelling each of them
+# would give every tenant its own time series
+TENANT_COLLECTION = re.compile(r"^org_[0-9a-f]{24}$")
+UNMATCHED_ROUTE = "unmatched"
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by route template and status code",
+    ["method", "route", "status"]
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route"]
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being served"
+)
+MONGODB_COMMAND_DURATION = Histogram(
+    "mongodb_command_duration_seconds",
+    "MongoDB command latency by command and collection",
+    ["command", "collection"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+MONGODB_COMMAND_FAILURES = Counter(
+    "mongodb_command_failures_total",
+    "Failed MongoDB commands by command and collection",
+    ["command", "collection"]
+)
+MONGODB_POOL_CHECKOUT_WAIT = Histogram(
+    "mongodb_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled MongoDB connection",
+    ["address"],
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+)
+MONGODB_POOL_CHECKOUT_FAILURES = Counter(
+    "mongodb_pool_checkout_failures_total",
+    "Failed MongoDB connection checkouts by reason",
+    ["address", "reason"]
+)
+MONGODB_POOL_CONNECTIONS = Gauge(
+    "mongodb_pool_connections",
+    "Open pooled MongoDB connections",
+    ["address"]
+)
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "Delay of the event loop in resuming a sleeping task",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+PASSWORD_HASH_DURATION = Histogram(
+    "password_hash_duration_seconds",
+    "Time to hash or verify a password, including the wait for a pool slot",
+    ["operation"]
+)
+
+
+def _collection_label(collection: Any) -> str:
+    if not isinstance(collection, str):
+        return ""
+    return "org_*" if TENANT_COLLECTION.match(collection) else collection
+
+
+def _address_label(address: Tuple[str, Optional[int]]) -> str:
+    host, port = address
+    return f"{host}:{port}" if port else host
+
+
+class CommandMetricsListener(monitoring.CommandListener):
+    """Records the latency of every MongoDB command"""
+
+    def __init__(self):
+        self._collections: Dict[Tuple[Any, int], str] = {}
+
+    def started(self, event: monitoring.CommandStartedEvent):
+        command = event.command
+        # getMore names its collection separately from the cursor ID
+        collection = command.get("collection") if event.command_name == "getMore" else command.get(event.command_name)
+        self._collections[(event.connection_id, event.request_id)] = _collection_label(collection)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent):
+        collection = self._collections.pop((event.connection_id, event.request_id), "")
+        MONGODB_COMMAND_DURATION.labels(event.command_name, collection).observe(
+            event.duration_micros / 1e6
+        )
+
+    def failed(self, event: monitoring.CommandFailedEvent):
+        collection = self._collections.pop((event.connection_id, event.request_id), "")
+        MONGODB_COMMAND_DURATION.labels(event.command_name, collection).observe(
+            event.duration_micros / 1e6
+        )
+        MONGODB_COMMAND_FAILURES.labels(event.command_name, collection).inc()
+
+
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """Records connection checkout waits and open connections per server"""
+
+    def __init__(self):
+        # Checkouts start and finish on the same thread
+        self._started = threading.local()
+
+    def connection_check_out_started(self, event):
+        self._started.at = time.perf_counter()
+
+    def connection_checked_out(self, event):
+        started = getattr(self._started, "at", None)
+        if started is not None:
+            MONGODB_POOL_CHECKOUT_WAIT.labels(_address_label(event.address)).observe(
+                time.perf_counter() - started
+            )
+            self._started.at = None
+
+    def connection_check_out_failed(self, event):
+        self._started.at = None
+        MONGODB_POOL_CHECKOUT_FAILURES.labels(
+            _address_label(event.address),
+            str(event.reason)
+        ).inc()
+
+    def connection_created(self, event):
+        MONGODB_POOL_CONNECTIONS.labels(_address_label(event.address)).inc()
+
+    def connection_closed(self, event):
+        MONGODB_POOL_CONNECTIONS.labels(_address_label(event.address)).dec()
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_checked_in(self, event):
+        pass
+
+
+def mongodb_event_listeners() -> list:
+    """Listeners to pass as event_listeners to every MongoDB client"""
+    return [command_listener, pool_listener, request_stats_listener]
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request counts and latency per route template
+
+    Requests are labelled with the matched route's path template (for
+    example ``/org/jobs/{job_id}``), so label cardinality stays bounded.
+    """
+
+    def __init__(self, app: Callable):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message: Dict[str, Any]):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            route = scope.get("route")
+            template = getattr(route, "path", UNMATCHED_ROUTE)
+            HTTP_REQUEST_DURATION.labels(scope["method"], template).observe(elapsed)
+            HTTP_REQUESTS.labels(scope["method"], template, str(status_code)).inc()
+
+
+class StatsCollector(Collector):
+    """
+    Exposes nested numeric stats as gauges
+
+    ``{"organization_cache": {"hits": 3}}`` becomes
+    ``app_organization_cache_hits 3``.
+    """
+
+    def __init__(self, stats: Callable[[], Dict[str, Any]], prefix: str = "app"):
+        self.stats = stats
+        self.prefix = prefix
+
+    def collect(self) -> Iterator[GaugeMetricFamily]:
+        try:
+            stats = self.stats()
+        except Exception:
+            return
+        for name, value in self._flatten(self.prefix, stats):
+            yield GaugeMetricFamily(name, f"Runtime counter {name}", value=value)
+
+    def _flatten(self, prefix: str, value: Any) -> Iterator[Tuple[str, float]]:
+        if isinstance(value, dict):
+            for key, nested in value.items():
+                yield from self._flatten(f"{prefix}_{key}", nested)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            yield re.sub(r"[^a-zA-Z0-9_]", "_", prefix), float(value)
+
+
+_stats_collectors: Dict[str, StatsCollector] = {}
+
+
+def register_stats(stats: Callable[[], Dict[str, Any]], prefix: str = "app"):
+    """Expose a stats callable on /metrics, once per prefix"""
+    if prefix not in _stats_collectors:
+        _stats_collectors[prefix] = StatsCollector(stats, prefix)
+        REGISTRY.register(_stats_collectors[prefix])
+
+
+def metrics_payload() -> Tuple[bytes, str]:
+    """Current metrics in the Prometheus text format, with its content type"""
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+command_listener = CommandMetricsListener()
+pool_listener = PoolMetricsListener()
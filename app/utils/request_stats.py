@@ -0,0 +1,149 @@
+from app.config import settings
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pymongo import monitoring
+from typing import Any, Callable, Dict, Iterator, Optional
+import bson
+import threading
+
+DB_STATS_HEADER = "X-DB-Stats"
+DB_COMMANDS_HEADER = "X-DB-Commands"
+
+
+class RequestStats:
+    """MongoDB commands, bytes and time spent on behalf of one request"""
+
+    def __init__(self):
+        self.commands = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.duration_micros = 0
+        self.by_command: Counter = Counter()
+        # Motor runs the commands of one request on several executor threads
+        self._lock = threading.Lock()
+
+    def record_started(self, command_name: str, bytes_sent: int):
+        with self._lock:
+            self.commands += 1
+            self.bytes_sent += bytes_sent
+            self.by_command[command_name] += 1
+
+    def record_finished(self, duration_micros: int, bytes_received: int):
+        with self._lock:
+            self.duration_micros += duration_micros
+            self.bytes_received += bytes_received
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "commands": self.commands,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "duration_ms": round(self.duration_micros / 1000, 3)
+        }
+
+    def header_value(self) -> str:
+        return ";".join(f"{name}={value}" for name, value in self.to_dict().items())
+
+    def commands_header_value(self) -> str:
+        return ",".join(f"{name}={count}" for name, count in sorted(self.by_command.items()))
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    """Stats of the request being served, if accounting is on for it"""
+    return _current.get()
+
+
+@contextmanager
+def track_request_stats() -> Iterator[RequestStats]:
+    """
+    Attribute MongoDB commands issued in this context to a new RequestStats
+
+    Tasks created and Motor operations started inside the block inherit the
+    context, so their commands are counted as well.
+    """
+    stats = RequestStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def parse_db_stats(value: str) -> Dict[str, float]:
+    """
+    Parse an X-DB-Stats header value
+
+    Args:
+        value: e.g. ``commands=3;bytes_sent=512;bytes_received=840;duration_ms=1.2``
+
+    Returns:
+        The values by name
+    """
+    stats: Dict[str, float] = {}
+    for item in value.split(";"):
+        name, _, number = item.partition("=")
+        if name:
+            stats[name.strip()] = float(number)
+    return stats
+
+
+def _bson_size(document: Any) -> int:
+    try:
+        return len(bson.encode(document))
+    except Exception:
+        return 0
+
+
+class RequestStatsListener(monitoring.CommandListener):
+    """Adds every MongoDB command to the stats of the request issuing it"""
+
+    def started(self, event: monitoring.CommandStartedEvent):
+        stats = _current.get()
+        if stats is not None:
+            stats.record_started(event.command_name, _bson_size(event.command))
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent):
+        stats = _current.get()
+        if stats is not None:
+            stats.record_finished(event.duration_micros, _bson_size(event.reply))
+
+    def failed(self, event: monitoring.CommandFailedEvent):
+        stats = _current.get()
+        if stats is not None:
+            stats.record_finished(event.duration_micros, 0)
+
+
+class RequestStatsMiddleware:
+    """
+    ASGI middleware returning each request's MongoDB usage in headers
+
+    Only active while ``settings.db_stats_header`` is on. The headers are
+    written when the response starts, so commands issued while streaming
+    the body are not included.
+    """
+
+    def __init__(self, app: Callable):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable):
+        if scope["type"] != "http" or not settings.db_stats_header:
+            await self.app(scope, receive, send)
+            return
+
+        with track_request_stats() as stats:
+            async def send_with_stats(message: Dict[str, Any]):
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers", []))
+                    headers.append((DB_STATS_HEADER.lower().encode(), stats.header_value().encode()))
+                    headers.append((DB_COMMANDS_HEADER.lower().encode(), stats.commands_header_value().encode()))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_with_stats)
+
+
+request_stats_listener = RequestStatsListener()
@@ -0,0 +1,24 @@
+from bson import ObjectId
+from fastapi.responses import ORJSONResponse
+from typing import Any
+import orjson
+
+
+def _default(value: Any) -> Any:
+    # orjson handles datetime, UUID and dataclasses natively; only BSON
+    # types need help
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class MongoJSONResponse(ORJSONResponse):
+    """
+    orjson-encoded JSON response that also accepts ObjectId values
+
+    Used as the application's default response class, so route results
+    are encoded by orjson rather than by the standard json module.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
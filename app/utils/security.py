@@ -1,25 +1,157 @@
 from passlib.context import CryptContext
 from jose import JWTError, jwt
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, List, Tuple
 from app.config import settings
 from app.models.admin import TokenData
+from app.utils.token_cache import AccessTokenCache, RevocationList
+from app.utils.metrics import PASSWORD_HASH_DURATION
 from fastapi import Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
+from fastapi.security import APIKeyHeader, OAuth2PasswordBearer
+import asyncio
+import hmac
+import multiprocessing
+import os
+import time
+import uuid
 
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.bcrypt_rounds
+)
+
+
+class PasswordHashPoolBusy(Exception):
+    """Raised when too many password hashes are already queued"""
+
+
+def _hash_password(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify_password(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+def _apply_to_chunk(func: Callable[[Any], Any], chunk: List[Any]) -> List[Any]:
+    return [func(item) for item in chunk]
+
+
+class PasswordHashPool:
+    """
+    Runs bcrypt in worker processes so it never blocks the event loop
+
+    At most ``max_concurrency`` hashes run at once; up to ``max_queue``
+    more may wait for a slot, after which callers get PasswordHashPoolBusy.
+    """
+    
+    def __init__(
+        self,
+        workers: int = 0,
+        max_concurrency: int = 0,
+        max_queue: int = 256
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_concurrency = max_concurrency or self.workers
+        self.max_queue = max_queue
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._pending = 0
+    
+    @property
+    def queue_depth(self) -> int:
+        """Number of hashes waiting for a free slot"""
+        return max(self._pending - self.max_concurrency, 0)
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Spawned workers do not inherit the event loop or driver threads
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+    
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        if self._pending >= self.max_concurrency + self.max_queue:
+            raise PasswordHashPoolBusy(
+                f"Password hash queue is full ({self.max_queue} waiting)"
+            )
+        
+        self._pending += 1
+        started = time.perf_counter()
+        try:
+            async with self._semaphore:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self._pending -= 1
+            PASSWORD_HASH_DURATION.labels(func.__name__.lstrip("_")).observe(
+                time.perf_counter() - started
+            )
+    
+    async def map(
+        self,
+        func: Callable[[Any], Any],
+        items: List[Any],
+        chunk_size: int = 32
+    ) -> List[Any]:
+        """
+        Apply func to many items, one pool slot per chunk
+        
+        At most ``max_concurrency`` chunks are submitted at a time, so a large
+        batch never fills the wait queue and interactive callers only wait
+        for the chunks already running.
+        """
+        chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+        limiter = asyncio.Semaphore(self.max_concurrency)
+        
+        async def run_chunk(chunk: List[Any]) -> List[Any]:
+            async with limiter:
+                return await self.run(_apply_to_chunk, func, chunk)
+        
+        results = await asyncio.gather(*(run_chunk(chunk) for chunk in chunks))
+        return [result for chunk_results in results for result in chunk_results]
+    
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
 
 
 class SecurityManager:
     
     @staticmethod
     def hash_password(password: str) -> str:
-        return pwd_context.hash(password)
+        return _hash_password(password)
     
     @staticmethod
     def verify_password(plain_password: str, hashed_password: str) -> bool:
-        return pwd_context.verify(plain_password, hashed_password)
+        return _verify_password(plain_password, hashed_password)
+    
+    @staticmethod
+    def password_needs_rehash(hashed_password: str) -> bool:
+        """True if a stored hash uses another scheme or cost than configured"""
+        return pwd_context.needs_update(hashed_password)
+    
+    @staticmethod
+    async def hash_password_async(password: str) -> str:
+        return await password_hash_pool.run(_hash_password, password)
+    
+    @staticmethod
+    async def hash_passwords_async(passwords: List[str]) -> List[str]:
+        return await password_hash_pool.map(_hash_password, passwords)
+    
+    @staticmethod
+    async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+        return await password_hash_pool.run(
+            _verify_password,
+            plain_password,
+            hashed_password
+        )
     
     @staticmethod
     def create_access_token(
@@ -35,7 +167,9 @@ class SecurityManager:
                 minutes=settings.jwt_expiration_minutes
             )
         
+        # jti identifies the token so it can be revoked
         to_encode.update({"exp": expire})
+        to_encode.setdefault("jti", uuid.uuid4().hex)
         
         encoded_jwt = jwt.encode(
             to_encode,
@@ -47,6 +181,11 @@ class SecurityManager:
     
     @staticmethod
     def decode_access_token(token: str) -> Optional[TokenData]:
+        token_data, _ = SecurityManager._decode_access_token(token)
+        return token_data
+    
+    @staticmethod
+    def _decode_access_token(token: str) -> Tuple[Optional[TokenData], Optional[float]]:
         try:
             payload = jwt.decode(
                 token,
@@ -59,22 +198,52 @@ class SecurityManager:
             organization_id: str = payload.get("organization_id")
             
             if admin_id is None or email is None or organization_id is None:
-                return None
+                return None, None
             
             return TokenData(
                 admin_id=admin_id,
                 email=email,
                 organization_id=organization_id,
-                exp=datetime.fromtimestamp(payload.get("exp"))
-            )
+                exp=datetime.fromtimestamp(payload.get("exp")),
+                jti=payload.get("jti")
+            ), payload.get("exp")
         except JWTError:
+            return None, None
+    
+    @staticmethod
+    def verify_access_token(token: str) -> Optional[TokenData]:
+        """
+        Verify an access token, reusing earlier verifications of it
+        
+        The signature is checked once per token; later calls are answered
+        from access_token_cache until the token expires. Revoked tokens are
+        rejected with an in-memory lookup.
+        
+        Args:
+            token: Encoded JWT
+            
+        Returns:
+            TokenData if the token is valid and not revoked, None otherwise
+        """
+        digest = access_token_cache.digest(token)
+        token_data = access_token_cache.get(digest)
+        if token_data is None:
+            token_data, expires_at = SecurityManager._decode_access_token(token)
+            if token_data is None:
+                return None
+            if expires_at is not None:
+                access_token_cache.put(digest, token_data, expires_at)
+        
+        if token_data.jti in revoked_tokens:
+            access_token_cache.revoked += 1
             return None
+        return token_data
         
         
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="admin/login")
 
 def get_current_admin(token: str = Depends(oauth2_scheme)):
-    token_data = security_manager.decode_access_token(token)
+    token_data = security_manager.verify_access_token(token)
     if token_data is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -84,4 +253,51 @@ def get_current_admin(token: str = Depends(oauth2_scheme)):
     return token_data
 
 
+operator_key_scheme = APIKeyHeader(name="X-Operator-Key", auto_error=False)
+
+def is_operator(key: Optional[str] = Depends(operator_key_scheme)) -> bool:
+    """Whether the request carries the configured operator key"""
+    expected = settings.operator_api_key
+    if not expected or not key:
+        return False
+    return hmac.compare_digest(key.encode(), expected.encode())
+
+def require_operator(operator: bool = Depends(is_operator)):
+    if not operator:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Operator credential required",
+        )
+
+def require_metrics_access(operator: bool = Depends(is_operator)):
+    """Guard of the runtime counters, open when metrics_public is set"""
+    if not settings.metrics_public:
+        require_operator(operator)
+
+
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="admin/login", auto_error=False)
+
+def require_admin_or_operator(
+    operator: bool = Depends(is_operator),
+    token: Optional[str] = Depends(optional_oauth2_scheme)
+) -> bool:
+    """Accept an operator key or an admin token; True for operators"""
+    if operator:
+        return True
+    if token and security_manager.verify_access_token(token) is not None:
+        return False
+    raise HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Admin token or operator credential required",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+password_hash_pool = PasswordHashPool(
+    workers=settings.password_hash_workers,
+    max_concurrency=settings.password_hash_max_concurrency,
+    max_queue=settings.password_hash_max_queue
+)
+access_token_cache = AccessTokenCache(max_size=settings.token_cache_max_size)
+revoked_tokens = RevocationList()
 security_manager = SecurityManager()
@@ -0,0 +1,195 @@
+from app.config import settings
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from pydantic import BaseModel
+from typing import Any, Dict, Mapping, Optional
+import copy
+import json
+import logging
+import queue
+import random
+import sys
+
+REDACTED = "[REDACTED]"
+SENSITIVE_KEYS = frozenset({
+    "password",
+    "hashed_password",
+    "new_password",
+    "token",
+    "access_token",
+    "refresh_token",
+    "authorization",
+    "secret",
+    "jwt_secret_key"
+})
+
+# Attributes every LogRecord has; anything else was passed in extra=
+_RECORD_ATTRIBUTES = frozenset(
+    vars(logging.LogRecord("", 0, "", 0, "", None, None))
+) | {"message", "asctime", "taskName"}
+
+
+def redact(value: Any) -> Any:
+    """
+    Copy of value with sensitive keys masked at any depth
+
+    Pydantic models are dumped first, so their secret fields are masked too.
+    Other values are returned as they are.
+    """
+    if isinstance(value, BaseModel):
+        value = value.model_dump()
+    if isinstance(value, Mapping):
+        return {
+            key: REDACTED if str(key).lower() in SENSITIVE_KEYS else redact(item)
+            for key, item in value.items()
+        }
+    if type(value) in (list, tuple):
+        return type(value)(redact(item) for item in value)
+    return value
+
+
+def record_fields(record: logging.LogRecord) -> Dict[str, Any]:
+    """Structured fields attached to a record with extra="""
+    return {
+        key: value
+        for key, value in vars(record).items()
+        if key not in _RECORD_ATTRIBUTES and not key.startswith("_")
+    }
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, with extra= fields as top-level keys"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            **record_fields(record)
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exc_info"] = record.exc_text
+        return json.dumps(payload, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Plain log lines followed by the extra= fields as key=value pairs"""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        fields = " ".join(f"{key}={value}" for key, value in record_fields(record).items())
+        line = super().formatMessage(record)
+        return f"{line} {fields}" if fields else line
+
+
+class RedactingQueueHandler(QueueHandler):
+    """
+    Hands records to a QueueListener thread without formatting them
+
+    The request only copies the record and masks sensitive arguments and
+    fields; message formatting and I/O happen on the listener thread.
+    Records with an ``event`` field at INFO or below are kept with the
+    event's sample rate. When the queue is full records are dropped rather
+    than blocking the caller.
+    """
+
+    def __init__(
+        self,
+        log_queue: queue.Queue,
+        sample_rates: Optional[Dict[str, float]] = None,
+        default_sample_rate: float = 1.0
+    ):
+        super().__init__(log_queue)
+        self.sample_rates = sample_rates or {}
+        self.default_sample_rate = default_sample_rate
+        self.counters = {"dropped": 0, "sampled_out": 0}
+
+    def _sample_rate(self, record: logging.LogRecord) -> float:
+        event = getattr(record, "event", None)
+        if event is None or record.levelno > logging.INFO:
+            return 1.0
+        return self.sample_rates.get(event, self.default_sample_rate)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        if record.args:
+            record.args = redact(record.args)
+        for key, value in record_fields(record).items():
+            setattr(record, key, REDACTED if key.lower() in SENSITIVE_KEYS else redact(value))
+        if record.exc_info:
+            # Tracebacks hold every frame alive; render them while they exist
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def emit(self, record: logging.LogRecord):
+        rate = self._sample_rate(record)
+        if rate < 1.0:
+            if random.random() >= rate:
+                self.counters["sampled_out"] += 1
+                return
+            record.sample_rate = rate
+        try:
+            self.enqueue(self.prepare(record))
+        except queue.Full:
+            self.counters["dropped"] += 1
+        except Exception:
+            self.handleError(record)
+
+    def enqueue(self, record: logging.LogRecord):
+        self.queue.put_nowait(record)
+
+    def stats(self) -> Dict[str, int]:
+        return {**self.counters, "queued": self.queue.qsize()}
+
+
+_handler: Optional[RedactingQueueHandler] = None
+_listener: Optional[QueueListener] = None
+
+
+def configure_logging() -> RedactingQueueHandler:
+    """
+    Route the root logger through a queue to a background writer thread
+
+    Calling it again returns the handler already installed.
+    """
+    global _handler, _listener
+    if _handler is not None:
+        return _handler
+
+    output = logging.StreamHandler(sys.stderr)
+    output.setFormatter(JsonFormatter() if settings.log_format == "json" else TextFormatter())
+
+    log_queue: queue.Queue = queue.Queue(settings.log_queue_size)
+    _handler = RedactingQueueHandler(
+        log_queue,
+        sample_rates=settings.log_sample_rates,
+        default_sample_rate=settings.log_sample_rate
+    )
+    _listener = QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+
+    root = logging.getLogger()
+    root.addHandler(_handler)
+    root.setLevel(settings.log_level.upper())
+    return _handler
+
+
+def shutdown_logging():
+    """Write out queued records and detach the queue handler"""
+    global _handler, _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    if _handler is not None:
+        logging.getLogger().removeHandler(_handler)
+        _handler = None
+
+
+def logging_stats() -> Optional[Dict[str, int]]:
+    return _handler.stats() if _handler is not None else None
@@ -0,0 +1,187 @@
+from bson import decode as bson_decode, json_util
+from bson.errors import BSONError
+from bson.raw_bson import RawBSONDocument
+from typing import Any, AsyncIterator, Dict, Optional
+import struct
+import zlib
+
+NDJSON = "ndjson"
+BSON_FORMAT = "bson"
+FORMATS = (NDJSON, BSON_FORMAT)
+
+MEDIA_TYPES = {
+    NDJSON: "application/x-ndjson",
+    BSON_FORMAT: "application/bson"
+}
+
+# MongoDB's document size limit, used to reject corrupt length prefixes
+MAX_BSON_DOCUMENT_SIZE = 16 * 1024 * 1024
+GZIP_WBITS = 31
+DECOMPRESS_CHUNK_BYTES = 1024 * 1024
+
+
+class TenantImportError(ValueError):
+    """
+    Raised when an import stream cannot be decoded
+
+    ``counts`` holds the inserted and rejected documents of the batches
+    written before the error, when raised during an import.
+    """
+
+    def __init__(self, message: str):
+        super().__init__(message)
+        self.counts: Optional[Dict[str, int]] = None
+
+
+def encode_document(document: RawBSONDocument, fmt: str) -> bytes:
+    """
+    Serialize one document for export
+
+    Args:
+        document: Raw document read from MongoDB
+        fmt: ndjson or bson
+
+    Returns:
+        Encoded bytes; NDJSON lines use relaxed Extended JSON
+    """
+    if fmt == BSON_FORMAT:
+        return document.raw
+    return json_util.dumps(document, json_options=json_util.RELAXED_JSON_OPTIONS).encode() + b"\n"
+
+
+async def encode_stream(
+    documents: AsyncIterator[RawBSONDocument],
+    fmt: str,
+    gzip: bool = False,
+    chunk_bytes: int = 64 * 1024
+) -> AsyncIterator[bytes]:
+    """
+    Turn a document cursor into response body chunks
+
+    Args:
+        documents: Documents to export
+        fmt: ndjson or bson
+        gzip: Compress the stream
+        chunk_bytes: Approximate size of each yielded chunk
+
+    Yields:
+        Body chunks of roughly chunk_bytes
+    """
+    compressor = zlib.compressobj(wbits=GZIP_WBITS) if gzip else None
+    buffer = bytearray()
+
+    async for document in documents:
+        buffer += encode_document(document, fmt)
+        if len(buffer) >= chunk_bytes:
+            chunk = compressor.compress(bytes(buffer)) if compressor else bytes(buffer)
+            buffer.clear()
+            if chunk:
+                yield chunk
+
+    tail = bytes(buffer)
+    if compressor:
+        tail = compressor.compress(tail) + compressor.flush()
+    if tail:
+        yield tail
+
+
+async def decode_stream(
+    chunks: AsyncIterator[bytes],
+    fmt: str,
+    gzip: bool = False
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Parse an uploaded body into documents without buffering it whole
+
+    Args:
+        chunks: Request body chunks
+        fmt: ndjson or bson
+        gzip: The body is gzip compressed
+
+    Yields:
+        Decoded documents
+    """
+    decompressor = zlib.decompressobj(wbits=GZIP_WBITS) if gzip else None
+    buffer = bytearray()
+
+    async for chunk in chunks:
+        while chunk:
+            if decompressor:
+                # Bounded output keeps a small compressed body from
+                # expanding into memory all at once
+                data = _decompress(decompressor, chunk)
+                chunk = decompressor.unconsumed_tail
+            else:
+                data, chunk = chunk, b""
+            buffer += data
+            for document in _drain(buffer, fmt):
+                yield document
+
+    if decompressor:
+        try:
+            buffer += decompressor.flush()
+        except zlib.error as e:
+            raise TenantImportError(f"Invalid gzip stream: {e}") from e
+        if not decompressor.eof:
+            raise TenantImportError("Gzip stream ends before its end marker")
+        for document in _drain(buffer, fmt):
+            yield document
+
+    if fmt == NDJSON and buffer.strip():
+        # Last line without a trailing newline
+        yield _decode_line(bytes(buffer))
+    elif fmt == BSON_FORMAT and buffer:
+        raise TenantImportError("Stream ends in the middle of a BSON document")
+
+
+def _decompress(decompressor: Any, chunk: bytes) -> bytes:
+    try:
+        return decompressor.decompress(chunk, DECOMPRESS_CHUNK_BYTES)
+    except zlib.error as e:
+        raise TenantImportError(f"Invalid gzip stream: {e}") from e
+
+
+def _drain(buffer: bytearray, fmt: str):
+    """Yield and remove every complete document at the start of buffer"""
+    if fmt == NDJSON:
+        while True:
+            newline = buffer.find(b"\n")
+            if newline < 0:
+                if len(buffer) > MAX_BSON_DOCUMENT_SIZE * 4:
+                    raise TenantImportError("NDJSON line is too long")
+                return
+            line = bytes(buffer[:newline])
+            del buffer[:newline + 1]
+            if line.strip():
+                yield _decode_line(line)
+    else:
+        while len(buffer) >= 4:
+            (size,) = struct.unpack_from("<i", buffer)
+            if size < 5 or size > MAX_BSON_DOCUMENT_SIZE:
+                raise TenantImportError(f"Invalid BSON document size {size}")
+            if len(buffer) < size:
+                return
+            document = bytes(buffer[:size])
+            del buffer[:size]
+            try:
+                yield bson_decode(document)
+            except BSONError as e:
+                raise TenantImportError(f"Invalid BSON document: {e}") from e
+
+
+def _decode_line(line: bytes) -> Dict[str, Any]:
+    # Malformed Extended JSON fails inside json_util's object hook with
+    # whatever its parsers raise: InvalidId for a bad $oid, IndexError for
+    # a bad $date, TypeError for wrongly typed values
+    try:
+        document = json_util.loads(line)
+    except (ValueError, TypeError, LookupError, BSONError) as e:
+        raise TenantImportError(f"Invalid NDJSON line: {e}") from e
+    if not isinstance(document, dict):
+        raise TenantImportError("NDJSON lines must be JSON objects")
+    return document
+
+
+def content_encoding_is_gzip(content_encoding: Optional[str]) -> bool:
+    return (content_encoding or "").strip().lower() == "gzip"
+
@@ -0,0 +1,101 @@
+from app.models.admin import TokenData
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+import hashlib
+import time
+
+
+class AccessTokenCache:
+    """
+    Bounded LRU of verified access tokens
+
+    Entries are keyed by the SHA-256 digest of the exact token string, so a
+    hit can only come from a token whose signature was already verified.
+    Each entry is served until the token's own ``exp``.
+    """
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self._entries: "OrderedDict[bytes, Tuple[float, TokenData]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.revoked = 0
+
+    @staticmethod
+    def digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, digest: bytes) -> Optional[TokenData]:
+        entry = self._entries.get(digest)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, token_data = entry
+        if expires_at <= time.time():
+            del self._entries[digest]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(digest)
+        self.hits += 1
+        return token_data
+
+    def put(self, digest: bytes, token_data: TokenData, expires_at: float):
+        self._entries[digest] = (expires_at, token_data)
+        self._entries.move_to_end(digest)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "revoked": self.revoked
+        }
+
+
+class RevocationList:
+    """
+    In-memory set of revoked token IDs (``jti``) with their expiry
+
+    Lookups never touch the database; TokenRevocationService keeps the set
+    in sync with the revoked_tokens collection. An ID is forgotten once its
+    token would have expired anyway, so the set only holds tokens that are
+    still otherwise valid.
+    """
+
+    def __init__(self):
+        self._expires_at: Dict[str, float] = {}
+
+    def __contains__(self, jti: Optional[str]) -> bool:
+        return jti is not None and jti in self._expires_at
+
+    def __len__(self) -> int:
+        return len(self._expires_at)
+
+    def add(self, jti: str, expires_at: float):
+        self._expires_at[jti] = expires_at
+
+    def update(self, entries: Iterable[Tuple[str, float]]):
+        for jti, expires_at in entries:
+            self._expires_at[jti] = expires_at
+
+    def prune(self, now: Optional[float] = None):
+        """Forget revocations of tokens that have expired"""
+        now = time.time() if now is None else now
+        self._expires_at = {
+            jti: expires_at
+            for jti, expires_at in self._expires_at.items()
+            if expires_at > now
+        }
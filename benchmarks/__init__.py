@@ -0,0 +1 @@
+"""Benchmarks of the service and security hot paths; see python -m benchmarks --help"""
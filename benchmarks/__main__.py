@@ -0,0 +1,103 @@
+"""
+Run the benchmarks or compare two result files
+
+    python -m benchmarks run [--backend memory|mongod] [--output PATH]
+    python -m benchmarks compare [BASELINE] [CURRENT] [--threshold 0.10]
+
+compare exits with status 1 when a benchmark is slower than the baseline
+by more than the threshold.
+"""
+from benchmarks.compare import (
+    DEFAULT_METRIC,
+    DEFAULT_THRESHOLD,
+    compare,
+    environment_differences,
+    format_report
+)
+from benchmarks.harness import load_results, new_results, run_benchmark, save_results
+from typing import List, Optional
+import argparse
+import asyncio
+import sys
+
+BASELINE_PATH = "benchmarks/baseline.json"
+RESULTS_PATH = "benchmarks/results/latest.json"
+
+
+async def run(
+    backend: str,
+    mongodb_url: str,
+    output: str,
+    only: Optional[List[str]] = None,
+    iterations: Optional[int] = None
+):
+    # Imported here so compare works without the application's dependencies
+    from benchmarks import hot_paths
+    from app.config import settings
+
+    await hot_paths.connect(backend, mongodb_url)
+    try:
+        benchmarks = await hot_paths.build_benchmarks()
+        results = new_results(backend, bcrypt_rounds=settings.bcrypt_rounds)
+        for benchmark in benchmarks:
+            if only and not any(pattern in benchmark.name for pattern in only):
+                continue
+            summary = await run_benchmark(benchmark, iterations)
+            results["benchmarks"][benchmark.name] = summary
+            print(
+                f"{benchmark.name:<50} median {summary['median_ms']:>10.4f} ms"
+                f"  p95 {summary['p95_ms']:>10.4f} ms  {summary['ops_per_sec']:>10.1f} ops/s"
+            )
+    finally:
+        await hot_paths.disconnect(backend)
+
+    save_results(output, results)
+    print(f"Results written to {output}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("--backend", choices=("memory", "mongod"), default="memory")
+    run_parser.add_argument("--mongodb-url", default="mongodb://localhost:27017")
+    run_parser.add_argument("--output", default=RESULTS_PATH)
+    run_parser.add_argument(
+        "--only",
+        action="append",
+        help="run benchmarks whose name contains this; may be repeated"
+    )
+    run_parser.add_argument("--iterations", type=int, help="override every benchmark's iterations")
+
+    compare_parser = commands.add_parser("compare", help="compare results against a baseline")
+    compare_parser.add_argument("baseline", nargs="?", default=BASELINE_PATH)
+    compare_parser.add_argument("current", nargs="?", default=RESULTS_PATH)
+    compare_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="relative slowdown flagged as a regression (default: 0.10)"
+    )
+    compare_parser.add_argument("--metric", default=DEFAULT_METRIC)
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        asyncio.run(run(args.backend, args.mongodb_url, args.output, args.only, args.iterations))
+        return
+
+    baseline = load_results(args.baseline)
+    current = load_results(args.current)
+    for difference in environment_differences(baseline, current):
+        print(f"warning: runs differ in {difference}")
+    comparisons = compare(baseline, current, args.threshold, args.metric)
+    print(format_report(comparisons, args.metric))
+    regressions = [c.name for c in comparisons if c.status == "regression"]
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+DEFAULT_METRIC = "median_ms"
+DEFAULT_THRESHOLD = 0.10
+
+
+@dataclass
+class Comparison:
+    """One benchmark's change between a baseline and a new run"""
+    name: str
+    baseline: Optional[float]
+    current: Optional[float]
+    threshold: float
+
+    @property
+    def change(self) -> Optional[float]:
+        """Relative change; positive means slower"""
+        if not self.baseline or self.current is None:
+            return None
+        return (self.current - self.baseline) / self.baseline
+
+    @property
+    def status(self) -> str:
+        if self.baseline is None:
+            return "new"
+        if self.current is None:
+            return "missing"
+        if self.change > self.threshold:
+            return "regression"
+        if self.change < -self.threshold:
+            return "improvement"
+        return "ok"
+
+
+def compare(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+    metric: str = DEFAULT_METRIC
+) -> List[Comparison]:
+    """
+    Compare two result files benchmark by benchmark
+
+    Args:
+        baseline: Results the new run is judged against
+        current: Results of the new run
+        threshold: Relative slowdown tolerated before flagging a regression
+        metric: Timing compared, lower being better
+
+    Returns:
+        One Comparison per benchmark in either file, sorted by name
+    """
+    names = sorted(set(baseline["benchmarks"]) | set(current["benchmarks"]))
+    return [
+        Comparison(
+            name=name,
+            baseline=baseline["benchmarks"].get(name, {}).get(metric),
+            current=current["benchmarks"].get(name, {}).get(metric),
+            threshold=threshold
+        )
+        for name in names
+    ]
+
+
+def environment_differences(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[str]:
+    """Settings that differ between two runs and make timings incomparable"""
+    differences = []
+    if baseline.get("backend") != current.get("backend"):
+        differences.append(f"backend: {baseline.get('backend')} -> {current.get('backend')}")
+    for key in ("python", "machine", "cpu_count", "bcrypt_rounds"):
+        before = baseline.get("environment", {}).get(key)
+        after = current.get("environment", {}).get(key)
+        if before != after:
+            differences.append(f"{key}: {before} -> {after}")
+    return differences
+
+
+def format_report(comparisons: List[Comparison], metric: str = DEFAULT_METRIC) -> str:
+    width = max([len(c.name) for c in comparisons] + [len("benchmark")])
+    lines = [f"{'benchmark':<{width}}  {'baseline':>12}  {'current':>12}  {'change':>8}  status"]
+    for c in comparisons:
+        baseline = f"{c.baseline:.4f}" if c.baseline is not None else "-"
+        current = f"{c.current:.4f}" if c.current is not None else "-"
+        change = f"{c.change:+.1%}" if c.change is not None else "-"
+        lines.append(f"{c.name:<{width}}  {baseline:>12}  {current:>12}  {change:>8}  {c.status}")
+    lines.append(f"({metric})")
+    return "\n".join(lines)
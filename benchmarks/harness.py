@@ -0,0 +1,108 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+import asyncio
+import json
+import os
+import platform
+import statistics
+import time
+
+BenchmarkCall = Callable[[], Union[Any, Awaitable[Any]]]
+
+
+@dataclass
+class Benchmark:
+    """
+    One timed operation
+
+    ``call`` may be a plain function or a coroutine function. ``before``
+    runs ahead of every iteration, outside the timed section.
+    """
+    name: str
+    call: BenchmarkCall
+    iterations: int = 100
+    warmup: int = 5
+    before: Optional[BenchmarkCall] = None
+
+
+async def _invoke(call: Optional[BenchmarkCall]) -> Any:
+    if call is None:
+        return None
+    result = call()
+    if asyncio.iscoroutine(result):
+        result = await result
+    return result
+
+
+def summarize(timings_ns: List[int]) -> Dict[str, float]:
+    """
+    Summary statistics of per-iteration timings
+
+    Args:
+        timings_ns: Duration of every iteration in nanoseconds
+
+    Returns:
+        Milliseconds for min, median, mean, p95 and stdev, plus operations
+        per second derived from the mean
+    """
+    timings = sorted(t / 1e6 for t in timings_ns)
+    mean = statistics.fmean(timings)
+    return {
+        "iterations": len(timings),
+        "min_ms": round(timings[0], 4),
+        "median_ms": round(statistics.median(timings), 4),
+        "mean_ms": round(mean, 4),
+        "p95_ms": round(timings[min(int(len(timings) * 0.95), len(timings) - 1)], 4),
+        "stdev_ms": round(statistics.stdev(timings), 4) if len(timings) > 1 else 0.0,
+        "ops_per_sec": round(1000 / mean, 2) if mean else 0.0
+    }
+
+
+async def run_benchmark(benchmark: Benchmark, iterations: Optional[int] = None) -> Dict[str, float]:
+    """Warm up, then time every iteration of one benchmark"""
+    for _ in range(benchmark.warmup):
+        await _invoke(benchmark.before)
+        await _invoke(benchmark.call)
+
+    timings: List[int] = []
+    for _ in range(iterations or benchmark.iterations):
+        await _invoke(benchmark.before)
+        started = time.perf_counter_ns()
+        await _invoke(benchmark.call)
+        timings.append(time.perf_counter_ns() - started)
+    return summarize(timings)
+
+
+def environment(**extra: Any) -> Dict[str, Any]:
+    """Host details stored with results; timings only compare on like hosts"""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        **extra
+    }
+
+
+def save_results(path: str, results: Dict[str, Any]):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
+
+
+def new_results(backend: str, **extra: Any) -> Dict[str, Any]:
+    return {
+        "created_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "backend": backend,
+        "environment": environment(**extra),
+        "benchmarks": {}
+    }
@@ -0,0 +1,140 @@
+"""
+Benchmarks of the service and security hot paths
+
+The services run against MongoDB at ``--mongodb-url`` (in a throwaway
+database) or against mongomock-motor in this process. The in-process backend
+has no network or server cost, so it isolates the service's own overhead;
+only compare results recorded with the same backend.
+"""
+from app.config import settings
+from app.database.mongodb import async_mongodb
+from app.models.admin import AdminLogin
+from app.models.organization import OrganizationCreate, OrganizationUpdate
+from app.services.auth_service import AuthService
+from app.services.database_service import DatabaseService
+from app.services.organization_service import OrganizationService
+from app.utils.security import access_token_cache, password_hash_pool, security_manager
+from benchmarks.harness import Benchmark
+from itertools import count
+from typing import List
+
+MEMORY = "memory"
+MONGOD = "mongod"
+BACKENDS = (MEMORY, MONGOD)
+BENCHMARK_DATABASE = "org_benchmarks"
+PASSWORD = "BenchPass123"
+
+
+async def connect(backend: str, mongodb_url: str):
+    """Point the shared connection at the benchmark backend"""
+    # Repeated logins from one email would otherwise be throttled
+    settings.login_throttle_enabled = False
+    settings.database_name = BENCHMARK_DATABASE
+
+    if backend == MEMORY:
+        try:
+            from mongomock_motor import AsyncMongoMockClient
+        except ImportError:
+            raise SystemExit(
+                "The memory backend needs mongomock-motor: "
+                "pip install -r benchmarks/requirements.txt"
+            )
+        async_mongodb._client = AsyncMongoMockClient()
+        return
+
+    settings.mongodb_url = mongodb_url
+    await async_mongodb.connect()
+    await async_mongodb.get_database().client.drop_database(BENCHMARK_DATABASE)
+
+
+async def disconnect(backend: str):
+    if backend == MONGOD:
+        await async_mongodb.get_database().client.drop_database(BENCHMARK_DATABASE)
+    password_hash_pool.shutdown()
+    async_mongodb.close()
+
+
+async def build_benchmarks() -> List[Benchmark]:
+    """Create the services and the fixtures every benchmark reads"""
+    auth_service = AuthService()
+    database_service = DatabaseService()
+    organization_service = OrganizationService(
+        auth_service=auth_service,
+        database_service=database_service
+    )
+    await auth_service._ensure_indexes()
+    await database_service._ensure_indexes()
+    await organization_service._ensure_indexes()
+
+    org = await organization_service.create_organization(OrganizationCreate(
+        organization_name="bench_org",
+        email="admin@bench.io",
+        password=PASSWORD
+    ))
+    if org is None:
+        raise RuntimeError("Could not create the benchmark organization")
+    admin_id = org["admin_id"]
+    claims = {
+        "admin_id": admin_id,
+        "email": "admin@bench.io",
+        "organization_id": str(org["_id"])
+    }
+    access_token = security_manager.create_access_token(claims)
+
+    created = count()
+
+    async def create_organization():
+        n = next(created)
+        result = await organization_service.create_organization(OrganizationCreate(
+            organization_name=f"bench_new_{n}",
+            email=f"admin{n}@bench.io",
+            password=PASSWORD
+        ))
+        if result is None:
+            raise RuntimeError("create_organization failed")
+
+    async def get_organization_by_name():
+        if await organization_service.get_organization_by_name("bench_org") is None:
+            raise RuntimeError("get_organization_by_name found nothing")
+
+    def clear_cache():
+        if organization_service.cache is not None:
+            organization_service.cache.clear()
+
+    # Renames alternate between two names so every call is a real update
+    renames = {"bench_org": "bench_org_renamed", "bench_org_renamed": "bench_org"}
+    current_name = ["bench_org"]
+
+    async def update_organization():
+        new_name = renames[current_name[0]]
+        result = await organization_service.update_organization(
+            current_name[0],
+            OrganizationUpdate(organization_name=new_name, email="admin@bench.io", password=PASSWORD),
+            admin_id
+        )
+        if result is None:
+            raise RuntimeError("update_organization failed")
+        current_name[0] = new_name
+
+    def verify_access_token():
+        if security_manager.verify_access_token(access_token) is None:
+            raise RuntimeError("verify_access_token rejected the token")
+
+    async def authenticate_admin():
+        login = AdminLogin(email="admin@bench.io", password=PASSWORD)
+        if await auth_service.authenticate_admin(login) is None:
+            raise RuntimeError("authenticate_admin failed")
+
+    return [
+        Benchmark("security.create_access_token", lambda: security_manager.create_access_token(claims), iterations=2000, warmup=50),
+        # The path every authenticated request takes: a cache hit, and the
+        # signature check of a token seen for the first time
+        Benchmark("security.verify_access_token", verify_access_token, iterations=2000, warmup=50),
+        Benchmark("security.verify_access_token.uncached", verify_access_token, iterations=2000, warmup=50, before=access_token_cache.clear),
+        Benchmark("organization.get_organization_by_name", get_organization_by_name, iterations=500, warmup=10),
+        Benchmark("organization.get_organization_by_name.uncached", get_organization_by_name, iterations=500, warmup=10, before=clear_cache),
+        # Every iteration hashes a password, so these take bcrypt time
+        Benchmark("organization.create_organization", create_organization, iterations=20, warmup=2),
+        Benchmark("organization.update_organization", update_organization, iterations=20, warmup=2),
+        Benchmark("auth.authenticate_admin", authenticate_admin, iterations=20, warmup=2),
+    ]
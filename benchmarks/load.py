@@ -0,0 +1,309 @@
+"""
+HTTP load harness: a scripted request mix at a sweep of concurrency levels
+
+    python -m benchmarks.load [--base-url http://127.0.0.1:8000]
+        [--concurrency 1,2,4,8,16,32,64] [--duration 10]
+        [--mix get=60,login=20,update=10,create=10]
+
+Start the API against a throwaway database with login throttling off and
+/metrics open to the harness, e.g.
+
+    LOGIN_THROTTLE_ENABLED=false METRICS_PUBLIC=true DATABASE_NAME=org_load \\
+        uvicorn app.main:app --workers 1
+
+Every level runs that many virtual users for --duration seconds, each
+sending the next request as soon as the previous one answers. Latency
+percentiles and throughput are reported per level and per operation, along
+with the event loop lag the app measured during the level (read from
+/metrics).
+"""
+from benchmarks.harness import environment, save_results
+from dataclasses import dataclass, field
+from datetime import datetime
+from prometheus_client.parser import text_string_to_metric_families
+from typing import Any, Dict, List, Optional, Tuple
+import argparse
+import asyncio
+import httpx
+import math
+import random
+import time
+import uuid
+
+OPERATIONS = ("get", "login", "update", "create")
+DEFAULT_MIX = "get=60,login=20,update=10,create=10"
+PASSWORD = "LoadPass123"
+LAG_METRIC = "event_loop_lag_seconds"
+
+
+@dataclass
+class VirtualUser:
+    """Credentials of the organization one virtual user works with"""
+    organization_name: str
+    email: str
+    token: str
+
+
+@dataclass
+class LevelResult:
+    concurrency: int
+    duration: float
+    latencies: Dict[str, List[float]] = field(default_factory=dict)
+    statuses: Dict[str, Dict[str, int]] = field(default_factory=dict)
+
+    def record(self, operation: str, status: str, latency: float):
+        self.latencies.setdefault(operation, []).append(latency)
+        counts = self.statuses.setdefault(operation, {})
+        counts[status] = counts.get(status, 0) + 1
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    weights = {}
+    for item in mix.split(","):
+        name, _, weight = item.partition("=")
+        if name.strip() not in OPERATIONS:
+            raise SystemExit(f"Unknown operation {name!r}; choose from {', '.join(OPERATIONS)}")
+        weights[name.strip()] = float(weight)
+    return weights
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of already sorted values"""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(math.ceil(q * len(sorted_values)) - 1, 0)]
+
+
+def latency_summary(latencies: List[float], duration: float) -> Dict[str, float]:
+    values = sorted(latencies)
+    return {
+        "requests": len(values),
+        "throughput_rps": round(len(values) / duration, 2),
+        "p50_ms": round(percentile(values, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(values, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(values, 0.99) * 1000, 2)
+    }
+
+
+async def scrape_loop_lag(client: httpx.AsyncClient) -> Optional[Dict[str, Any]]:
+    """Cumulative event loop lag histogram exposed by the app"""
+    try:
+        response = await client.get("/metrics")
+        response.raise_for_status()
+    except httpx.HTTPError:
+        return None
+
+    histogram = {"buckets": {}, "sum": 0.0, "count": 0.0}
+    for family in text_string_to_metric_families(response.text):
+        if family.name != LAG_METRIC:
+            continue
+        for sample in family.samples:
+            if sample.name.endswith("_bucket"):
+                histogram["buckets"][float(sample.labels["le"])] = sample.value
+            elif sample.name.endswith("_sum"):
+                histogram["sum"] = sample.value
+            elif sample.name.endswith("_count"):
+                histogram["count"] = sample.value
+    return histogram if histogram["count"] else None
+
+
+def loop_lag_between(before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]]) -> Optional[Dict[str, float]]:
+    """
+    Event loop lag over one level, from two histogram scrapes
+
+    Percentiles are the upper bounds of the buckets they fall in.
+    """
+    if before is None or after is None:
+        return None
+    count = after["count"] - before["count"]
+    if count <= 0:
+        return None
+
+    def bucket_bound(q: float) -> float:
+        for bound in sorted(after["buckets"]):
+            if after["buckets"][bound] - before["buckets"].get(bound, 0.0) >= q * count:
+                return bound
+        return math.inf
+
+    return {
+        "samples": int(count),
+        "mean_ms": round((after["sum"] - before["sum"]) / count * 1000, 2),
+        "p99_le_ms": round(bucket_bound(0.99) * 1000, 2),
+        "max_le_ms": round(bucket_bound(1.0) * 1000, 2)
+    }
+
+
+async def prepare_users(client: httpx.AsyncClient, run_id: str, count: int) -> List[VirtualUser]:
+    """Create one organization per virtual user and log its admin in"""
+    users = []
+    for i in range(count):
+        name = f"load_{run_id}_{i}"
+        email = f"admin{i}@load{run_id}.io"
+        try:
+            await client.post("/org/create", json={
+                "organization_name": name,
+                "email": email,
+                "password": PASSWORD
+            })
+        except httpx.HTTPError:
+            # Whether the organization is usable is decided by the login
+            pass
+        response = await client.post("/admin/login", json={"email": email, "password": PASSWORD})
+        if response.status_code == 429:
+            raise SystemExit("Logins are throttled; start the API with LOGIN_THROTTLE_ENABLED=false")
+        if response.status_code != 200:
+            raise SystemExit(f"Could not set up {name}: login returned {response.status_code}")
+        users.append(VirtualUser(name, email, response.json()["access_token"]))
+    return users
+
+
+async def send(
+    client: httpx.AsyncClient,
+    operation: str,
+    user: VirtualUser,
+    users: List[VirtualUser],
+    created: List[int]
+) -> httpx.Response:
+    if operation == "get":
+        return await client.get(
+            "/org/get",
+            params={"organization_name": random.choice(users).organization_name}
+        )
+    if operation == "login":
+        return await client.post("/admin/login", json={"email": user.email, "password": PASSWORD})
+    if operation == "update":
+        # Keeping the name lets updates from one user never conflict
+        return await client.put(
+            "/org/update",
+            params={"old_org_name": user.organization_name},
+            json={"organization_name": user.organization_name, "email": user.email, "password": PASSWORD},
+            headers={"Authorization": f"Bearer {user.token}"}
+        )
+    created[0] += 1
+    suffix = f"{uuid.uuid4().hex[:8]}_{created[0]}"
+    return await client.post("/org/create", json={
+        "organization_name": f"load_new_{suffix}",
+        "email": f"admin_{suffix}@load.io",
+        "password": PASSWORD
+    })
+
+
+async def run_level(
+    base_url: str,
+    concurrency: int,
+    duration: float,
+    weights: Dict[str, float],
+    users: List[VirtualUser]
+) -> Tuple[LevelResult, Optional[Dict[str, float]]]:
+    operations, operation_weights = list(weights), list(weights.values())
+    result = LevelResult(concurrency, duration)
+    created = [0]
+    limits = httpx.Limits(max_connections=concurrency + 1, max_keepalive_connections=concurrency + 1)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+        lag_before = await scrape_loop_lag(client)
+        deadline = time.perf_counter() + duration
+
+        async def virtual_user(user: VirtualUser):
+            while time.perf_counter() < deadline:
+                operation = random.choices(operations, weights=operation_weights)[0]
+                started = time.perf_counter()
+                try:
+                    response = await send(client, operation, user, users, created)
+                    status = str(response.status_code)
+                except httpx.HTTPError as e:
+                    status = type(e).__name__
+                result.record(operation, status, time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(virtual_user(users[i % len(users)]) for i in range(concurrency)))
+        result.duration = time.perf_counter() - started
+        lag_after = await scrape_loop_lag(client)
+
+    return result, loop_lag_between(lag_before, lag_after)
+
+
+def level_report(result: LevelResult, loop_lag: Optional[Dict[str, float]]) -> Dict[str, Any]:
+    everything = [latency for latencies in result.latencies.values() for latency in latencies]
+    errors = sum(
+        count
+        for counts in result.statuses.values()
+        for status, count in counts.items()
+        if not status.startswith(("2", "3"))
+    )
+    return {
+        "concurrency": result.concurrency,
+        "duration_seconds": round(result.duration, 2),
+        "errors": errors,
+        **latency_summary(everything, result.duration),
+        "operations": {
+            operation: {**latency_summary(latencies, result.duration), "statuses": result.statuses[operation]}
+            for operation, latencies in sorted(result.latencies.items())
+        },
+        "event_loop_lag": loop_lag
+    }
+
+
+def print_level(report: Dict[str, Any]):
+    lag = report["event_loop_lag"]
+    lag_text = f"loop lag mean {lag['mean_ms']:.1f} ms p99<={lag['p99_le_ms']:.0f} ms" if lag else "loop lag n/a"
+    print(
+        f"c={report['concurrency']:<4} {report['throughput_rps']:>8.1f} req/s"
+        f"  p50 {report['p50_ms']:>8.1f}  p95 {report['p95_ms']:>8.1f}  p99 {report['p99_ms']:>8.1f} ms"
+        f"  errors {report['errors']:<5} {lag_text}"
+    )
+    for operation, summary in report["operations"].items():
+        statuses = " ".join(f"{status}:{count}" for status, count in sorted(summary["statuses"].items()))
+        print(
+            f"       {operation:<7} {summary['throughput_rps']:>8.1f} req/s"
+            f"  p50 {summary['p50_ms']:>8.1f}  p95 {summary['p95_ms']:>8.1f}  p99 {summary['p99_ms']:>8.1f} ms"
+            f"  [{statuses}]"
+        )
+
+
+async def sweep(
+    base_url: str,
+    levels: List[int],
+    duration: float,
+    weights: Dict[str, float]
+) -> Dict[str, Any]:
+    run_id = uuid.uuid4().hex[:6]
+    async with httpx.AsyncClient(base_url=base_url, timeout=60.0) as client:
+        users = await prepare_users(client, run_id, max(levels))
+
+    reports = []
+    for concurrency in levels:
+        result, loop_lag = await run_level(base_url, concurrency, duration, weights, users)
+        report = level_report(result, loop_lag)
+        print_level(report)
+        reports.append(report)
+
+    peak = max(reports, key=lambda report: report["throughput_rps"])
+    print(f"Peak throughput {peak['throughput_rps']:.1f} req/s at concurrency {peak['concurrency']}")
+    return {
+        "created_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "base_url": base_url,
+        "mix": weights,
+        "environment": environment(),
+        "levels": reports,
+        "peak": {"concurrency": peak["concurrency"], "throughput_rps": peak["throughput_rps"]}
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--concurrency", default="1,2,4,8,16,32,64", help="comma separated levels")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per level")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="operation weights")
+    parser.add_argument("--output", default="benchmarks/results/load.json")
+    args = parser.parse_args()
+
+    levels = [int(level) for level in args.concurrency.split(",")]
+    results = asyncio.run(sweep(args.base_url, levels, args.duration, parse_mix(args.mix)))
+    save_results(args.output, results)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+import pytest
+from app.config import settings
+from app.utils.request_stats import DB_COMMANDS_HEADER, DB_STATS_HEADER, parse_db_stats
+
+
+@pytest.fixture
+def round_trip_budget(monkeypatch):
+    """
+    Assert that a response stayed within a MongoDB round-trip budget
+
+    Turns on the X-DB-Stats header for the test and returns a checker:
+
+        response = client.get("/org/get?organization_name=acme")
+        round_trip_budget(response, 1)
+    """
+    monkeypatch.setattr(settings, "db_stats_header", True)
+
+    def check(response, max_commands: int):
+        assert DB_STATS_HEADER in response.headers, "response has no X-DB-Stats header"
+        commands = int(parse_db_stats(response.headers[DB_STATS_HEADER])["commands"])
+        assert commands <= max_commands, (
+            f"{response.request.method} {response.request.url.path} made {commands} "
+            f"MongoDB round trips, budget is {max_commands} "
+            f"({response.headers[DB_COMMANDS_HEADER]})"
+        )
+
+    return check
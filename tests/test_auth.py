@@ -5,6 +5,13 @@ from app.main import app
 client = TestClient(app)
 
 
+@pytest.fixture(scope="module", autouse=True)
+def app_lifespan():
+    """Run the application lifespan so shared services are started"""
+    with client:
+        yield
+
+
 class TestAuthenticationEndpoints:
     """Test suite for authentication endpoints"""
     
@@ -111,6 +118,53 @@ class TestAuthenticationEndpoints:
         assert "organization_id" in data
         assert data["email"] == "admin@authtest.com"
 
+    
+    def test_refresh_rotates_and_detects_reuse(self, created_org):
+        """Test that refresh tokens are single use and reuse revokes the family"""
+        login_payload = {
+            "email": "admin@authtest.com",
+            "password": "AuthTest123"
+        }
+        first = client.post("/admin/login", json=login_payload).json()["refresh_token"]
+        
+        response = client.post("/admin/refresh", json={"refresh_token": first})
+        assert response.status_code == 200
+        second = response.json()["refresh_token"]
+        assert second != first
+        
+        # Replaying the used token revokes the rotated one as well
+        assert client.post("/admin/refresh", json={"refresh_token": first}).status_code == 401
+        assert client.post("/admin/refresh", json={"refresh_token": second}).status_code == 401
+
+    
+    def test_logout_revokes_refresh_tokens(self):
+        """Test that refresh tokens stop working once their session logs out"""
+        client.post("/org/create", json={
+            "organization_name": "logout_test_org",
+            "email": "admin@logouttest.com",
+            "password": "AuthTest123"
+        })
+        login_payload = {
+            "email": "admin@logouttest.com",
+            "password": "AuthTest123"
+        }
+        session = client.post("/admin/login", json=login_payload).json()
+        other = client.post("/admin/login", json=login_payload).json()
+        
+        response = client.post(
+            "/admin/logout",
+            json={"refresh_token": session["refresh_token"]},
+            headers={"Authorization": f"Bearer {session['access_token']}"}
+        )
+        assert response.status_code == 204
+        assert client.post("/admin/refresh", json={"refresh_token": session["refresh_token"]}).status_code == 401
+        
+        # Other sessions survive unless logout is called without a refresh token
+        response = client.post("/admin/refresh", json={"refresh_token": other["refresh_token"]})
+        assert response.status_code == 200
+        other = response.json()
+        client.post("/admin/logout", headers={"Authorization": f"Bearer {other['access_token']}"})
+        assert client.post("/admin/refresh", json={"refresh_token": other["refresh_token"]}).status_code == 401
 
 @pytest.fixture(autouse=True)
 def cleanup():
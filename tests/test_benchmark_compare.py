@@ -0,0 +1,30 @@
+from benchmarks.compare import compare, environment_differences
+
+
+def make_results(benchmarks, bcrypt_rounds=12):
+    return {
+        "backend": "memory",
+        "environment": {"bcrypt_rounds": bcrypt_rounds},
+        "benchmarks": {name: {"median_ms": value} for name, value in benchmarks.items()}
+    }
+
+
+class TestBenchmarkCompare:
+    """Test suite for comparing benchmark results against a baseline"""
+
+    def test_compare_flags_slowdowns_beyond_threshold(self):
+        """Test that each benchmark is classified against the threshold"""
+        baseline = make_results({"fast": 1.0, "steady": 1.0, "gone": 1.0})
+        current = make_results({"fast": 0.5, "steady": 1.05, "slow": 2.0})
+        statuses = {c.name: c.status for c in compare(baseline, current, threshold=0.10)}
+        assert statuses == {"fast": "improvement", "steady": "ok", "gone": "missing", "slow": "new"}
+
+        current["benchmarks"]["steady"]["median_ms"] = 1.2
+        regressions = [c.name for c in compare(baseline, current, threshold=0.10) if c.status == "regression"]
+        assert regressions == ["steady"]
+
+    def test_environment_differences_reports_bcrypt_rounds(self):
+        """Test that a changed bcrypt cost is reported as an environment difference"""
+        assert environment_differences(make_results({}), make_results({}, bcrypt_rounds=4)) == [
+            "bcrypt_rounds: 12 -> 4"
+        ]
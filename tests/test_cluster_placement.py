@@ -0,0 +1,72 @@
+from bson import ObjectId
+from app.database.clusters import ClusterRegistry
+from app.services.cluster_placement import HASH, LEAST_LOADED, ClusterPlacement
+from app.services.collection_copier import CollectionCopier
+import asyncio
+
+
+class FakeOrganizations:
+    """Answers count_documents from fixed per-cluster counts"""
+    
+    def __init__(self, counts: dict):
+        self.counts = counts
+        self.queries = 0
+    
+    async def count_documents(self, query: dict) -> int:
+        self.queries += 1
+        cluster = query["cluster"]
+        if isinstance(cluster, dict):
+            cluster = "default"
+        return self.counts.get(cluster, 0)
+
+
+REGISTRY = ClusterRegistry(urls={"eu": "mongodb://eu", "us": "mongodb://us"})
+
+
+class TestClusterPlacement:
+    """Test suite for choosing the cluster of new organizations"""
+    
+    def test_least_loaded_fills_emptiest_cluster(self):
+        """Test that placements go to the least loaded clusters and are counted locally"""
+        organizations = FakeOrganizations({"default": 5, "eu": 3, "us": 4})
+        placement = ClusterPlacement(organizations, REGISTRY, policy=LEAST_LOADED)
+        
+        placed = asyncio.run(placement.choose_many([ObjectId() for _ in range(4)]))
+        
+        assert placed == ["eu", "eu", "us", "default"]
+        assert organizations.queries == 3
+    
+    def test_hash_is_stable_and_limited_to_candidates(self):
+        """Test that hash placement is deterministic and honours the candidates"""
+        placement = ClusterPlacement(
+            FakeOrganizations({}),
+            REGISTRY,
+            policy=HASH,
+            candidates=["eu", "us"]
+        )
+        org_ids = [ObjectId() for _ in range(20)]
+        
+        first = asyncio.run(placement.choose_many(org_ids))
+        
+        assert first == asyncio.run(placement.choose_many(org_ids))
+        assert set(first) <= {"eu", "us"}
+
+
+class TestCopyCheckpoints:
+    """Test suite for checkpoint keys of copies between clusters"""
+    
+    def test_checkpoint_ids_include_clusters(self):
+        """Test that same-named copies on different clusters get their own checkpoint"""
+        copier = CollectionCopier(checkpoints=None, registry=REGISTRY)
+        default, eu, us = (REGISTRY.get_database(cluster)["org_x"] for cluster in ("default", "eu", "us"))
+        
+        ids = {
+            copier.checkpoint_id_for(default, eu),
+            copier.checkpoint_id_for(eu, us),
+            copier.checkpoint_id_for(us, eu),
+            copier.checkpoint_id_for(eu, eu)
+        }
+        
+        assert len(ids) == 4
+        assert copier.checkpoint_id_for(default, eu).startswith("default/")
+        assert copier.checkpoint_id_for(default, eu) == copier.checkpoint_id_for(default, eu)
@@ -0,0 +1,147 @@
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from app.main import app
+from app.config import settings
+from app.services.job_service import JobService, JobStatus
+
+client = TestClient(app)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def app_lifespan():
+    """Run the application lifespan so shared services are started"""
+    with client:
+        yield
+
+
+def run(coroutine_function, *args):
+    """Run a coroutine on the application's event loop"""
+    return client.portal.call(coroutine_function, *args)
+
+
+class TestJobService:
+    """Test suite for the MongoDB backed job queue"""
+
+    @pytest.fixture
+    def job_type(self, request):
+        # A type of its own keeps the application's workers away from the jobs
+        return f"test_{request.node.name}"
+
+    def make_service(self, job_type, handler=None) -> JobService:
+        service = JobService()
+
+        async def succeed(job, context):
+            return {"done": True}
+
+        service.register(job_type, handler or succeed)
+        return service
+
+    def test_claim_and_run(self, job_type):
+        """Test that a queued job is claimed once and its result stored"""
+        service = self.make_service(job_type)
+
+        async def scenario():
+            job_id = await service.enqueue(job_type, {"value": 1}, owner_id="owner")
+            job = await service._claim()
+            second = await service._claim()
+            await service._run(job)
+            return job_id, job, second, await service.get_job(job_id)
+
+        job_id, job, second, finished = run(scenario)
+
+        assert str(job["_id"]) == job_id
+        assert job["status"] == JobStatus.RUNNING
+        assert job["attempts"] == 1
+        assert second is None
+        assert finished["status"] == JobStatus.SUCCEEDED
+        assert finished["result"] == {"done": True}
+        assert "params" not in finished
+
+    def test_expired_lease_is_claimed_again(self, job_type, monkeypatch):
+        """Test that a job whose worker died is retried until attempts run out"""
+        first, second = self.make_service(job_type), self.make_service(job_type)
+
+        async def expire(job):
+            await first.jobs_collection.update_one(
+                {"_id": job["_id"]},
+                {"$set": {"lease_expires_at": datetime.utcnow() - timedelta(seconds=1)}}
+            )
+
+        async def scenario():
+            job_id = await first.enqueue(job_type, {"secret": "x"})
+            job = await first._claim()
+            assert await second._claim() is None
+            await expire(job)
+            retried = await second._claim()
+            await expire(retried)
+            exhausted = await first._claim()
+            return retried, exhausted, await first.jobs_collection.find_one({"_id": job["_id"]})
+
+        monkeypatch.setattr(settings, "job_max_attempts", 2)
+        retried, exhausted, failed = run(scenario)
+
+        assert retried["worker_id"] == second.worker_id
+        assert retried["attempts"] == 2
+        assert exhausted is None
+        assert failed["status"] == JobStatus.FAILED
+        assert "params" not in failed
+
+    def test_lost_lease_cancels_handler(self, job_type, monkeypatch):
+        """Test that a worker stops its handler once another worker holds the job"""
+        monkeypatch.setattr(settings, "job_lease_seconds", 0.3)
+        cancelled = []
+
+        async def slow(job, context):
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(job["_id"])
+                raise
+
+        service = self.make_service(job_type, slow)
+
+        async def scenario():
+            await service.enqueue(job_type, {})
+            job = await service._claim()
+            await service.jobs_collection.update_one(
+                {"_id": job["_id"]},
+                {"$set": {"worker_id": "another_worker"}}
+            )
+            await asyncio.wait_for(service._run(job), timeout=2)
+            return job, await service.jobs_collection.find_one({"_id": job["_id"]})
+
+        job, stored = run(scenario)
+
+        assert cancelled == [job["_id"]]
+        assert stored["status"] == JobStatus.RUNNING
+        assert stored["worker_id"] == "another_worker"
+
+    def test_heartbeat_survives_failed_renewal(self, job_type, monkeypatch):
+        """Test that one failed lease renewal does not stop the heartbeat"""
+        monkeypatch.setattr(settings, "job_lease_seconds", 0.3)
+        service = self.make_service(job_type)
+        renew = service.jobs_collection.update_one
+        calls = []
+
+        async def flaky_update(*args, **kwargs):
+            calls.append(args)
+            if len(calls) == 1:
+                raise ConnectionError("connection reset")
+            return await renew(*args, **kwargs)
+
+        async def scenario():
+            await service.enqueue(job_type, {})
+            job = await service._claim()
+            monkeypatch.setattr(service.jobs_collection, "update_one", flaky_update)
+            work = asyncio.ensure_future(asyncio.sleep(5))
+            heartbeat = asyncio.create_task(service._heartbeat(job["_id"], work))
+            await asyncio.sleep(0.35)
+            alive = not heartbeat.done()
+            heartbeat.cancel()
+            work.cancel()
+            return alive
+
+        assert run(scenario) is True
+        assert len(calls) >= 2
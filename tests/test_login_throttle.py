@@ -0,0 +1,112 @@
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+from app.config import Settings, settings
+from app.database.mongodb import async_mongodb
+from app.main import app
+from app.services.login_throttle import (
+    BucketPolicy,
+    CostThrottle,
+    LoginThrottle,
+    LoginThrottled,
+    MemoryBucketStore,
+    Throttled
+)
+
+
+def make_throttle(**overrides) -> LoginThrottle:
+    options = {
+        "email_policy": BucketPolicy(capacity=3, refill_per_second=0.01),
+        "ip_policy": BucketPolicy(capacity=100, refill_per_second=1),
+        "free_failures": 10,
+        **overrides
+    }
+    return LoginThrottle(MemoryBucketStore(), **options)
+
+
+class TestLoginThrottle:
+    """Test suite for token-bucket login throttling"""
+    
+    def test_email_bucket_empties(self):
+        """Test that attempts beyond the burst are rejected with a retry delay"""
+        throttle = make_throttle()
+        
+        async def scenario():
+            for _ in range(3):
+                await throttle.check("Admin@Example.com", "10.0.0.1")
+            with pytest.raises(LoginThrottled) as rejected:
+                await throttle.check("admin@example.com", "10.0.0.2")
+            return rejected.value
+        
+        rejected = asyncio.run(scenario())
+        
+        assert rejected.retry_after > 0
+        assert throttle.stats()["rejected_rate"] == 1
+    
+    def test_failures_start_doubling_delay(self):
+        """Test that failures beyond the free ones block the email and success clears it"""
+        throttle = make_throttle(
+            email_policy=BucketPolicy(capacity=100, refill_per_second=1),
+            free_failures=2,
+            failure_delay=10
+        )
+        
+        async def scenario():
+            await throttle.record_failure("admin@example.com")
+            await throttle.record_failure("admin@example.com")
+            await throttle.check("admin@example.com")
+            await throttle.record_failure("admin@example.com")
+            await throttle.record_failure("admin@example.com")
+            with pytest.raises(LoginThrottled) as rejected:
+                await throttle.check("admin@example.com")
+            await throttle.record_success("admin@example.com")
+            await throttle.check("admin@example.com")
+            return rejected.value
+        
+        rejected = asyncio.run(scenario())
+        
+        assert 10 < rejected.retry_after <= 20
+        assert throttle.stats()["rejected_delay"] == 1
+    
+    @pytest.mark.parametrize("name", [
+        "login_email_per_minute",
+        "login_ip_per_minute",
+        "bulk_create_items_per_minute"
+    ])
+    def test_zero_refill_rate_is_rejected(self, name):
+        """Test that a bucket which never refills is refused at startup"""
+        with pytest.raises(ValidationError):
+            Settings(**{name: 0})
+    
+    def test_cost_throttle_charges_per_item(self):
+        """Test that a request is charged its cost and rejected whole when it does not fit"""
+        throttle = CostThrottle(
+            MemoryBucketStore(),
+            BucketPolicy(capacity=10, refill_per_second=1),
+            namespace="bulk_create"
+        )
+        
+        async def scenario():
+            await throttle.check("10.0.0.1", 8)
+            with pytest.raises(Throttled) as rejected:
+                await throttle.check("10.0.0.1", 5)
+            await throttle.check("10.0.0.2", 5)
+            return rejected.value
+        
+        rejected = asyncio.run(scenario())
+        
+        assert 2 < rejected.retry_after <= 3
+        assert throttle.stats() == {"allowed": 2, "rejected": 1, "store_errors": 0}
+    
+    def test_bulk_create_store_gets_ttl_index(self, monkeypatch):
+        """Test that shared buckets expire even while login throttling is off"""
+        monkeypatch.setattr(settings, "login_throttle_enabled", False)
+        monkeypatch.setattr(settings, "login_throttle_store", "mongo")
+        
+        with TestClient(app) as client:
+            collection = async_mongodb.get_database()["login_throttle"]
+            indexes = client.portal.call(collection.index_information)
+            client.portal.call(collection.drop)
+        
+        assert any(index.get("expireAfterSeconds") == 0 for index in indexes.values())
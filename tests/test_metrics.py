@@ -0,0 +1,33 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.config import settings
+
+client = TestClient(app)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def app_lifespan():
+    """Run the application lifespan so shared services are started"""
+    with client:
+        yield
+
+
+class TestMetricsEndpoints:
+    """Test suite for access to /metrics and /stats"""
+
+    @pytest.mark.parametrize("path", ["/metrics", "/stats"])
+    def test_requires_operator(self, path, monkeypatch):
+        """Test that runtime counters need the operator key"""
+        monkeypatch.setattr(settings, "operator_api_key", "operator-secret")
+
+        assert client.get(path).status_code == 403
+        assert client.get(path, headers={"X-Operator-Key": "wrong-secret"}).status_code == 403
+        assert client.get(path, headers={"X-Operator-Key": "operator-secret"}).status_code == 200
+
+    @pytest.mark.parametrize("path", ["/metrics", "/stats"])
+    def test_public_when_configured(self, path, monkeypatch):
+        """Test that METRICS_PUBLIC opens the counters to internal scrapers"""
+        monkeypatch.setattr(settings, "metrics_public", True)
+
+        assert client.get(path).status_code == 200
@@ -1,10 +1,22 @@
+import time
 import pytest
+from bson import ObjectId
 from fastapi.testclient import TestClient
 from app.main import app
+from app.config import settings
+from app.services.container import get_organization_service
+from app.services.job_service import JobContext
 
 client = TestClient(app)
 
 
+@pytest.fixture(scope="module", autouse=True)
+def app_lifespan():
+    """Run the application lifespan so shared services are started"""
+    with client:
+        yield
+
+
 class TestOrganizationEndpoints:
     """Test suite for organization endpoints"""
     
@@ -63,6 +75,67 @@ class TestOrganizationEndpoints:
         response = client.post("/org/create", json=payload)
         assert response.status_code == 422
     
+    def test_bulk_create_requires_operator(self, monkeypatch):
+        """Test that bulk creation needs the operator key"""
+        monkeypatch.setattr(settings, "operator_api_key", "operator-secret")
+        
+        response = client.post("/org/bulk_create", json=[])
+        assert response.status_code == 403
+        
+        response = client.post(
+            "/org/bulk_create",
+            json=[],
+            headers={"X-Operator-Key": "wrong-secret"}
+        )
+        assert response.status_code == 403
+    
+    def test_bulk_create_reports_each_item(self, monkeypatch):
+        """Test that valid, duplicate and invalid items get their own results"""
+        monkeypatch.setattr(settings, "operator_api_key", "operator-secret")
+        client.post("/org/create", json={
+            "organization_name": "bulk_existing_org",
+            "email": "admin@bulkexisting.com",
+            "password": "TestPass123"
+        })
+        payload = [
+            {"organization_name": "bulk_new_org", "email": "admin@bulknew.com", "password": "TestPass123"},
+            {"organization_name": "bulk_existing_org", "email": "other@bulkexisting.com", "password": "TestPass123"},
+            {"organization_name": "bulk_new_org", "email": "second@bulknew.com", "password": "TestPass123"},
+            {"organization_name": "bulk_weak_org", "email": "admin@bulkweak.com", "password": "weak"},
+            "not an organization"
+        ]
+        
+        response = client.post(
+            "/org/bulk_create",
+            json=payload,
+            headers={"X-Operator-Key": "operator-secret"}
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert (data["created"], data["failed"]) == (1, 4)
+        results = data["results"]
+        assert results[0]["success"] and results[0]["collection_name"].startswith("org_")
+        assert results[1]["error"] == "Organization already exists"
+        assert results[2]["error"] == "Organization already exists"
+        assert results[3]["organization_name"] == "bulk_weak_org"
+        assert "password" in results[3]["error"]
+        assert results[4]["organization_name"] is None and results[4]["error"]
+        assert client.get("/org/get?organization_name=bulk_new_org").status_code == 200
+    
+    def test_bulk_create_limits_body_size(self, monkeypatch):
+        """Test that oversized batches are refused before they are parsed"""
+        monkeypatch.setattr(settings, "operator_api_key", "operator-secret")
+        monkeypatch.setattr(settings, "bulk_create_max_bytes", 100)
+        
+        response = client.post(
+            "/org/bulk_create",
+            content=b"[" + b" " * 200 + b"]",
+            headers={"X-Operator-Key": "operator-secret", "Content-Type": "application/json"}
+        )
+        
+        assert response.status_code == 413
+    
     def test_get_organization_success(self):
         """Test getting organization by name"""
         # First create an organization
@@ -81,11 +154,162 @@ class TestOrganizationEndpoints:
         assert data["organization_name"] == "get_test_org"
         assert data["admin_email"] == "admin@gettest.com"
     
+    def test_get_organization_cached_round_trip_budget(self, round_trip_budget):
+        """Test that a get served from the organization cache makes no round trip"""
+        client.post("/org/create", json={
+            "organization_name": "budget_test_org",
+            "email": "admin@budgettest.com",
+            "password": "TestPass123"
+        })
+        client.get("/org/get?organization_name=budget_test_org")
+        
+        response = client.get("/org/get?organization_name=budget_test_org")
+        
+        assert response.status_code == 200
+        round_trip_budget(response, 0)
+    
+    def test_get_organization_uncached_round_trip_budget(self, round_trip_budget):
+        """Test that a get served from MongoDB takes a single round trip"""
+        client.post("/org/create", json={
+            "organization_name": "uncached_budget_org",
+            "email": "admin@uncachedbudget.com",
+            "password": "TestPass123"
+        })
+        get_organization_service().cache.clear()
+        
+        response = client.get("/org/get?organization_name=uncached_budget_org")
+        
+        assert response.status_code == 200
+        round_trip_budget(response, 1)
+    
+    def test_update_organization_round_trip_budget(self, round_trip_budget):
+        """Test that queueing an update stays within its MongoDB round trips"""
+        headers = self.login("update_budget_org", "admin@updatebudget.com")
+        get_organization_service().cache.clear()
+        
+        response = client.put(
+            "/org/update?old_org_name=update_budget_org",
+            json={
+                "organization_name": "update_budget_renamed",
+                "email": "admin@updatebudget.com",
+                "password": "TestPass456"
+            },
+            headers=headers
+        )
+        
+        assert response.status_code == 202
+        # Organization lookup, new name check, staging the password hash
+        # on the admin and the job insert; hashing itself is not a command
+        round_trip_budget(response, 4)
+    
+    def test_get_organization_not_modified(self):
+        """Test conditional get returns 304 for an unchanged organization"""
+        client.post("/org/create", json={
+            "organization_name": "etag_test_org",
+            "email": "admin@etagtest.com",
+            "password": "TestPass123"
+        })
+        
+        response = client.get("/org/get?organization_name=etag_test_org")
+        etag = response.headers["ETag"]
+        assert response.headers["Last-Modified"]
+        
+        response = client.get(
+            "/org/get?organization_name=etag_test_org",
+            headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+        assert response.content == b""
+    
     def test_get_organization_not_found(self):
         """Test getting non-existent organization"""
         response = client.get("/org/get?organization_name=nonexistent_org")
         assert response.status_code == 404
     
+    def test_list_requires_credentials(self):
+        """Test that listing needs an admin token or the operator key"""
+        response = client.get("/org/list")
+        assert response.status_code == 401
+        
+        response = client.get("/org/list", headers={"Authorization": "Bearer invalid"})
+        assert response.status_code == 401
+    
+    def test_list_pages_by_prefix(self):
+        """Test that prefix listings page through names in order"""
+        headers = self.login("list_prefix_c", "admin@listprefixc.com")
+        for name in ("list_prefix_a", "list_prefix_b"):
+            self.login(name, f"admin@{name.replace('_', '')}.com")
+        
+        response = client.get("/org/list?name_prefix=list_prefix_&limit=2", headers=headers)
+        assert response.status_code == 200
+        page = response.json()
+        assert [item["organization_name"] for item in page["items"]] == ["list_prefix_a", "list_prefix_b"]
+        
+        response = client.get(
+            f"/org/list?name_prefix=list_prefix_&limit=2&cursor={page['next_cursor']}",
+            headers=headers
+        )
+        page = response.json()
+        assert [item["organization_name"] for item in page["items"]] == ["list_prefix_c"]
+        assert page["next_cursor"] is None
+    
+    def test_list_pages_in_creation_order(self):
+        """Test that following next_cursor visits every organization once"""
+        headers = self.login("list_order_org", "admin@listorder.com")
+        
+        names, cursor = [], ""
+        while cursor is not None:
+            response = client.get(f"/org/list?limit=2&cursor={cursor}", headers=headers)
+            assert response.status_code == 200
+            page = response.json()
+            names += [item["organization_name"] for item in page["items"]]
+            cursor = page["next_cursor"]
+        
+        assert len(names) == len(set(names))
+        assert names[-1] == "list_order_org"
+    
+    def test_list_rejects_invalid_cursor(self):
+        """Test that malformed cursors and cursors of another ordering answer 400"""
+        headers = self.login("list_cursor_org", "admin@listcursor.com")
+        self.login("list_cursor_other", "admin@listcursorother.com")
+        
+        response = client.get("/org/list?cursor=not-a-cursor", headers=headers)
+        assert response.status_code == 400
+        
+        creation_cursor = client.get("/org/list?limit=1", headers=headers).json()["next_cursor"]
+        response = client.get(
+            f"/org/list?name_prefix=list_cursor&cursor={creation_cursor}",
+            headers=headers
+        )
+        assert response.status_code == 400
+    
+    def test_list_projects_fields(self, monkeypatch):
+        """Test that only requested fields are returned and admin emails only to operators"""
+        monkeypatch.setattr(settings, "operator_api_key", "operator-secret")
+        headers = self.login("list_fields_org", "admin@listfields.com")
+        
+        response = client.get(
+            "/org/list?name_prefix=list_fields_org&fields=collection_name",
+            headers=headers
+        )
+        assert response.status_code == 200
+        item = response.json()["items"][0]
+        assert item["collection_name"].startswith("org_")
+        assert item["admin_email"] is None and item["tenancy"] is None
+        
+        response = client.get("/org/list?fields=admin_email", headers=headers)
+        assert response.status_code == 400
+        response = client.get("/org/list?name_prefix=list_fields_org", headers=headers)
+        assert response.json()["items"][0]["admin_email"] is None
+        
+        response = client.get(
+            "/org/list?name_prefix=list_fields_org&fields=admin_email",
+            headers={"X-Operator-Key": "operator-secret"}
+        )
+        assert response.status_code == 200
+        assert response.json()["items"][0]["admin_email"] == "admin@listfields.com"
+    
     def test_update_organization_unauthorized(self):
         """Test updating organization without authentication"""
         payload = {
@@ -97,6 +321,125 @@ class TestOrganizationEndpoints:
         response = client.put("/org/update", json=payload)
         assert response.status_code == 403  # Forbidden - no auth
     
+    def test_job_status_only_visible_to_owner(self):
+        """Test that a queued job's status is only returned to the admin who queued it"""
+        tokens = {}
+        admins = {"job_owner_org": "admin@jobowner.com", "job_other_org": "admin@jobother.com"}
+        for name, email in admins.items():
+            client.post("/org/create", json={
+                "organization_name": name,
+                "email": email,
+                "password": "TestPass123"
+            })
+            login = client.post("/admin/login", json={"email": email, "password": "TestPass123"})
+            tokens[name] = {"Authorization": f"Bearer {login.json()['access_token']}"}
+        
+        response = client.put(
+            "/org/update?old_org_name=job_owner_org",
+            json={
+                "organization_name": "job_owner_org",
+                "email": "admin@jobowner.com",
+                "password": "TestPass456"
+            },
+            headers=tokens["job_owner_org"]
+        )
+        assert response.status_code == 202
+        status_url = response.json()["status_url"]
+        
+        response = client.get(status_url, headers=tokens["job_owner_org"])
+        assert response.status_code == 200
+        assert "params" not in response.json()
+        assert client.get(status_url, headers=tokens["job_other_org"]).status_code == 404
+    
+    def test_update_password_only_changes_with_the_update(self, monkeypatch):
+        """Test that a new password is not used unless its update job succeeds"""
+        headers = self.login("password_job_org", "admin@passwordjob.com")
+        self.login("password_taken_org", "admin@passwordtaken.com")
+        old_login = {"email": "admin@passwordjob.com", "password": "TestPass123"}
+        service = get_organization_service()
+        
+        async def failing_enqueue(*args, **kwargs):
+            raise ConnectionError("queue unavailable")
+        
+        with monkeypatch.context() as patch:
+            patch.setattr(service.job_service, "enqueue", failing_enqueue)
+            response = client.put(
+                "/org/update?old_org_name=password_job_org",
+                json={
+                    "organization_name": "password_job_org",
+                    "email": "admin@passwordjob.com",
+                    "password": "TestPass456"
+                },
+                headers=headers
+            )
+        assert response.status_code == 400
+        assert client.post("/admin/login", json=old_login).status_code == 200
+        
+        async def fail_rename():
+            org = await service.get_organization_by_name("password_job_org")
+            await service.auth_service.stage_password_hash(org["admin_id"], "change", "$2b$12$unused")
+            job = {"_id": None, "params": {
+                "organization_id": str(org["_id"]),
+                "organization_name": "password_taken_org",
+                "password_change_id": "change"
+            }}
+            with pytest.raises(Exception):
+                await service._run_update_job(job, JobContext(service.job_service, job))
+            return await service.auth_service.admins_collection.find_one({"_id": ObjectId(org["admin_id"])})
+        
+        admin = client.portal.call(fail_rename)
+        assert "pending_password" not in admin
+        assert client.post("/admin/login", json=old_login).status_code == 200
+        
+        response = client.put(
+            "/org/update?old_org_name=password_job_org",
+            json={
+                "organization_name": "password_job_org",
+                "email": "admin@passwordjob.com",
+                "password": "TestPass456"
+            },
+            headers=headers
+        )
+        status_url = response.json()["status_url"]
+        for _ in range(50):
+            if client.get(status_url, headers=headers).json()["status"] == "succeeded":
+                break
+            time.sleep(0.1)
+        assert client.post("/admin/login", json={**old_login, "password": "TestPass456"}).status_code == 200
+    
+    def login(self, name: str, email: str) -> dict:
+        client.post("/org/create", json={
+            "organization_name": name,
+            "email": email,
+            "password": "TestPass123"
+        })
+        response = client.post("/admin/login", json={"email": email, "password": "TestPass123"})
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+    
+    def test_import_malformed_body(self, monkeypatch):
+        """Test that malformed imports answer 400 and report the documents kept"""
+        monkeypatch.setattr(settings, "copy_batch_size", 1)
+        headers = self.login("bad_io_test_org", "admin@badiotest.com")
+        
+        response = client.post(
+            "/org/import?organization_name=bad_io_test_org",
+            content=b'{"name": "kept"}\n{"_id": {"$oid": "zz"}}\n',
+            headers=headers
+        )
+        assert response.status_code == 400
+        assert "1 documents imported before the error were kept" in response.json()["detail"]
+        
+        for body, content_type in (
+            (b"\x08\x00\x00\x00\x99a\x00\x00", "bson"),
+            (b'{"name": "not gzip"}\n', "ndjson")
+        ):
+            response = client.post(
+                f"/org/import?organization_name=bad_io_test_org&format={content_type}",
+                content=body,
+                headers={**headers, "Content-Encoding": "gzip"} if content_type == "ndjson" else headers
+            )
+            assert response.status_code == 400
+    
     def test_delete_organization_unauthorized(self):
         """Test deleting organization without authentication"""
         response = client.delete("/org/delete?organization_name=test_org")
@@ -0,0 +1,85 @@
+from bson import ObjectId
+from datetime import datetime
+from app.database.tenancy import DEDICATED, POOLED
+from app.services.organization_cache import MISS, OrganizationCache
+
+
+def make_org(name: str, tenancy: str = DEDICATED) -> dict:
+    return {
+        "_id": ObjectId(),
+        "organization_name": name,
+        "collection_name": f"org_{name}",
+        "admin_id": "admin",
+        "admin_email": f"admin@{name}.com",
+        "created_at": datetime.utcnow(),
+        "tenancy": tenancy,
+        "cluster": "default",
+        "version": 1
+    }
+
+
+class TestOrganizationCache:
+    """Test suite for the in-process organization cache"""
+    
+    def test_hit_after_put(self):
+        """Test that cached organizations are served by name and ID"""
+        cache = OrganizationCache()
+        org = make_org("cached_org")
+        cache.put(org)
+        
+        assert cache.get("cached_org").to_document() == org
+        assert cache.get_by_id(str(org["_id"])).organization_name == "cached_org"
+        assert cache.stats()["hits"] == 2
+    
+    def test_pooled_tenancy_is_kept(self):
+        """Test that cached organizations keep their tenancy mode"""
+        cache = OrganizationCache()
+        org = make_org("pooled_org", tenancy=POOLED)
+        cache.put(org)
+        
+        assert cache.get("pooled_org").tenancy == POOLED
+        assert cache.get_by_id(str(org["_id"])).to_document() == org
+    
+    def test_negative_entry(self):
+        """Test that unknown names are cached as missing"""
+        cache = OrganizationCache()
+        assert cache.get("missing_org") is MISS
+        
+        cache.put_missing("missing_org")
+        
+        assert cache.get("missing_org") is None
+        assert cache.stats()["negative_hits"] == 1
+        assert cache.stats()["misses"] == 1
+    
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first"""
+        cache = OrganizationCache(max_size=2)
+        first, second, third = make_org("first"), make_org("second"), make_org("third")
+        cache.put(first)
+        cache.put(second)
+        cache.get("first")
+        cache.put(third)
+        
+        assert cache.get("second") is MISS
+        assert cache.get_by_id(str(second["_id"])) is MISS
+        assert cache.get("first") is not MISS
+        assert cache.stats()["evictions"] == 1
+    
+    def test_ttl_expiry(self):
+        """Test that expired entries are treated as misses"""
+        cache = OrganizationCache(ttl_seconds=0)
+        cache.put(make_org("expired_org"))
+        
+        assert cache.get("expired_org") is MISS
+    
+    def test_invalidate_by_id_and_stale_load(self):
+        """Test invalidation by ID and that racing loads are discarded"""
+        cache = OrganizationCache()
+        org = make_org("renamed_org")
+        cache.put(org)
+        generation = cache.generation
+        
+        cache.invalidate(org_id=str(org["_id"]))
+        cache.put(org, generation)
+        
+        assert cache.get("renamed_org") is MISS
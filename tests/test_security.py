@@ -0,0 +1,85 @@
+import asyncio
+import time
+import pytest
+from app.utils.security import (
+    PasswordHashPool,
+    PasswordHashPoolBusy,
+    SecurityManager,
+    _hash_password,
+    _verify_password,
+    access_token_cache,
+    revoked_tokens
+)
+
+
+class TestPasswordHashPool:
+    """Test suite for the off-loop password hashing pool"""
+    
+    def test_hash_and_verify_round_trip(self):
+        """Test hashing and verifying through the worker pool"""
+        pool = PasswordHashPool(workers=1)
+        
+        async def scenario():
+            hashed = await pool.run(_hash_password, "RoundTrip123")
+            return hashed, await pool.run(_verify_password, "RoundTrip123", hashed)
+        
+        try:
+            hashed, verified = asyncio.run(scenario())
+        finally:
+            pool.shutdown()
+        
+        assert hashed.startswith("$2b$")
+        assert verified is True
+        assert SecurityManager.verify_password("RoundTrip123", hashed)
+    
+    def test_rejects_when_queue_is_full(self):
+        """Test that callers beyond concurrency plus queue are rejected"""
+        pool = PasswordHashPool(workers=1, max_concurrency=1, max_queue=1)
+        
+        async def scenario():
+            running = asyncio.ensure_future(pool.run(time.sleep, 0.5))
+            queued = asyncio.ensure_future(pool.run(time.sleep, 0))
+            await asyncio.sleep(0)
+            assert pool.queue_depth == 1
+            with pytest.raises(PasswordHashPoolBusy):
+                await pool.run(time.sleep, 0)
+            await asyncio.gather(running, queued)
+        
+        try:
+            asyncio.run(scenario())
+        finally:
+            pool.shutdown()
+
+
+class TestAccessTokenVerification:
+    """Test suite for cached access token verification"""
+    
+    def make_token(self) -> str:
+        return SecurityManager.create_access_token({
+            "admin_id": "admin",
+            "email": "admin@example.com",
+            "organization_id": "org"
+        })
+    
+    def test_repeated_verification_is_cached(self):
+        """Test that a token is decoded once and then served from the cache"""
+        token = self.make_token()
+        hits = access_token_cache.hits
+        
+        first = SecurityManager.verify_access_token(token)
+        second = SecurityManager.verify_access_token(token)
+        
+        assert first.admin_id == "admin"
+        assert first.jti
+        assert second is first
+        assert access_token_cache.hits == hits + 1
+        assert SecurityManager.verify_access_token(token + "x") is None
+    
+    def test_revoked_token_is_rejected(self):
+        """Test that a revoked token fails even when it is cached"""
+        token = self.make_token()
+        token_data = SecurityManager.verify_access_token(token)
+        
+        revoked_tokens.add(token_data.jti, time.time() + 60)
+        
+        assert SecurityManager.verify_access_token(token) is None
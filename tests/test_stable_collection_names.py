@@ -0,0 +1,95 @@
+import pytest
+from bson import ObjectId
+from fastapi.testclient import TestClient
+from app.main import app
+from app.database.mongodb import async_mongodb
+from app.migrations.stable_collection_names import migrate_to_stable_collection_names
+
+client = TestClient(app)
+
+OUTCOMES = ("migrated", "resumed", "already_migrated", "missing", "conflicts")
+
+
+@pytest.fixture(scope="module", autouse=True)
+def app_lifespan():
+    """Run the application lifespan so shared services are started"""
+    with client:
+        yield
+
+
+def run(coroutine_function, *args):
+    """Run a coroutine on the application's event loop"""
+    return client.portal.call(coroutine_function, *args)
+
+
+class TestStableCollectionNames:
+    """Test suite for the org_<name> to org_<organization_id> migration"""
+
+    @pytest.fixture
+    def legacy_orgs(self):
+        """IDs of one organization for each state the migration can find"""
+        db = async_mongodb.get_database()
+        orgs = {outcome: ObjectId() for outcome in OUTCOMES}
+
+        async def teardown():
+            await db["organizations"].delete_many({"_id": {"$in": list(orgs.values())}})
+            for name in ["org_legacy_migrated", "org_legacy_conflicts"]:
+                await db[name].drop()
+            for org_id in orgs.values():
+                await db[f"org_{org_id}"].drop()
+
+        yield orgs
+        run(teardown)
+
+    def counts(self, report: dict) -> dict:
+        return {outcome: report[outcome] for outcome in OUTCOMES}
+
+    def test_report_counts_each_state(self, legacy_orgs):
+        """Test that dry and real runs report resumed and conflicting renames apart"""
+        db = async_mongodb.get_database()
+
+        async def setup():
+            await db["organizations"].insert_many([
+                {
+                    "_id": org_id,
+                    "organization_name": f"legacy_{outcome}",
+                    "collection_name": (
+                        f"org_{org_id}" if outcome == "already_migrated" else f"org_legacy_{outcome}"
+                    )
+                }
+                for outcome, org_id in legacy_orgs.items()
+            ])
+            await db["org_legacy_migrated"].insert_one({"name": "kept"})
+            await db[f"org_{legacy_orgs['resumed']}"].insert_one({"name": "kept"})
+            await db["org_legacy_conflicts"].insert_one({"name": "old"})
+            await db[f"org_{legacy_orgs['conflicts']}"].insert_one({"name": "new"})
+
+        async def find_names():
+            cursor = db["organizations"].find({"_id": {"$in": list(legacy_orgs.values())}})
+            return {org["_id"]: org["collection_name"] async for org in cursor}
+
+        # Organizations of other tests are counted too, so only the change
+        # against a dry run before the legacy ones exist is compared
+        baseline = self.counts(run(migrate_to_stable_collection_names, True))
+        run(setup)
+        dry_run = self.counts(run(migrate_to_stable_collection_names, True))
+        names_after_dry_run = run(find_names)
+        migrated = self.counts(run(migrate_to_stable_collection_names))
+        rerun = self.counts(run(migrate_to_stable_collection_names))
+        names = run(find_names)
+        collections = run(db.list_collection_names)
+
+        def delta(counts):
+            return {outcome: counts[outcome] - baseline[outcome] for outcome in OUTCOMES}
+
+        assert delta(dry_run) == {outcome: 1 for outcome in OUTCOMES}
+        assert names_after_dry_run[legacy_orgs["migrated"]] == "org_legacy_migrated"
+        assert delta(migrated) == {outcome: 1 for outcome in OUTCOMES}
+        assert delta(rerun) == {
+            "migrated": 0, "resumed": 0, "already_migrated": 4, "missing": 0, "conflicts": 1
+        }
+        for outcome in ("migrated", "resumed", "missing"):
+            assert names[legacy_orgs[outcome]] == f"org_{legacy_orgs[outcome]}"
+        assert names[legacy_orgs["conflicts"]] == "org_legacy_conflicts"
+        assert "org_legacy_migrated" not in collections
+        assert f"org_{legacy_orgs['migrated']}" in collections
@@ -0,0 +1,72 @@
+import asyncio
+import json
+import logging
+import queue
+from app.models.admin import AdminLogin
+from app.models.organization import OrganizationCreate
+from app.services.auth_service import AuthService
+from app.utils.loop_monitor import EventLoopMonitor
+from app.utils.structured_logging import REDACTED, JsonFormatter, RedactingQueueHandler
+
+
+def make_record(msg, args=(), level=logging.INFO, **extra):
+    record = logging.LogRecord("test", level, __file__, 1, msg, args, None)
+    for key, value in extra.items():
+        setattr(record, key, value)
+    return record
+
+
+class FakeAdmins:
+    """Admins collection that knows nobody"""
+
+    async def find_one(self, query):
+        return None
+
+
+class TestStructuredLogging:
+    """Test suite for queued, redacted JSON logging"""
+
+    def test_queued_records_are_redacted_and_formatted_as_json(self):
+        """Test that secrets in arguments and extras never reach the formatted record"""
+        log_queue = queue.Queue()
+        handler = RedactingQueueHandler(log_queue)
+        org = OrganizationCreate(organization_name="acme", email="admin@acme.io", password="Secret123")
+
+        handler.emit(make_record(
+            "Creating %s",
+            (org,),
+            event="organization.created",
+            admin={"email": "admin@acme.io", "hashed_password": "$2b$12$abc"},
+            refresh_token="opaque"
+        ))
+
+        payload = json.loads(JsonFormatter().format(log_queue.get_nowait()))
+        assert "Secret123" not in payload["message"]
+        assert payload["event"] == "organization.created"
+        assert payload["admin"] == {"email": "admin@acme.io", "hashed_password": REDACTED}
+        assert payload["refresh_token"] == REDACTED
+
+    def test_sampling_applies_only_to_info_events(self):
+        """Test that sampled events are only dropped below warning level"""
+        log_queue = queue.Queue()
+        handler = RedactingQueueHandler(log_queue, sample_rates={"job.queued": 0.0})
+
+        handler.emit(make_record("Queued", event="job.queued"))
+        handler.emit(make_record("Queue failed", level=logging.ERROR, event="job.queued"))
+        handler.emit(make_record("Unrelated"))
+
+        assert [log_queue.get_nowait().msg for _ in range(log_queue.qsize())] == ["Queue failed", "Unrelated"]
+        assert handler.stats()["sampled_out"] == 1
+
+    def test_auth_failures_and_stalls_are_structured_events(self, caplog):
+        """Test that login failures and loop stalls carry an event and lazy arguments"""
+        service = AuthService()
+        service.admins_collection = FakeAdmins()
+
+        with caplog.at_level(logging.WARNING):
+            EventLoopMonitor(stall_threshold=0.1).record(0.25)
+            asyncio.run(service._verify_credentials(AdminLogin(email="nobody@acme.io", password="Secret123")))
+
+        stalled, failed = caplog.records
+        assert (stalled.event, stalled.args) == ("loop.stalled", (250.0,))
+        assert (failed.event, failed.reason, failed.args) == ("auth.failed", "unknown_email", ("nobody@acme.io",))
@@ -0,0 +1,197 @@
+import pytest
+from bson import ObjectId
+from fastapi.testclient import TestClient
+from app.main import app
+from app.database.mongodb import async_mongodb
+from app.database.tenancy import DEDICATED, POOLED, TENANT_FIELD, TenantCollection
+from app.migrations.tenancy_mode import MIGRATION_FIELD, migrate_tenancy_mode
+from app.services.database_service import DatabaseService
+
+client = TestClient(app)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def app_lifespan():
+    """Run the application lifespan so shared services are started"""
+    with client:
+        yield
+
+
+def run(coroutine_function, *args):
+    """Run a coroutine on the application's event loop"""
+    return client.portal.call(coroutine_function, *args)
+
+
+class TestTenantCollection:
+    """Test suite for tenant-scoped views of the shared collection"""
+
+    @pytest.fixture
+    def shared(self, request):
+        collection = async_mongodb.get_database()[f"test_{request.node.name}"]
+        yield collection
+        run(collection.drop)
+
+    def test_queries_are_scoped(self, shared):
+        """Test that each tenant only reads, counts and deletes its own documents"""
+        first, second = TenantCollection(shared, "first"), TenantCollection(shared, "second")
+
+        async def scenario():
+            await first.insert_many([{"name": "a"}, {"name": "b"}])
+            await second.insert_one({"name": "a"})
+            names = [document["name"] async for document in first.find({}).sort("name", 1)]
+            counts = (await first.count_documents({"name": "a"}), await second.estimated_document_count())
+            await second.delete_many({})
+            return names, counts, await shared.count_documents({})
+
+        names, counts, remaining = run(scenario)
+
+        assert names == ["a", "b"]
+        assert counts == (1, 1)
+        assert remaining == 2
+
+    def test_inserts_are_stamped(self, shared):
+        """Test that inserted documents carry the tenant key, overwriting any other"""
+        tenant = TenantCollection(shared, "owner")
+
+        async def scenario():
+            await tenant.insert_one({"name": "mine", TENANT_FIELD: "intruder"})
+            return await shared.find_one({"name": "mine"})
+
+        assert run(scenario)[TENANT_FIELD] == "owner"
+
+    @pytest.mark.parametrize("projection", [None, {"count": 0}, {"name": 1}])
+    def test_reads_hide_tenant_key(self, shared, projection):
+        """Test that reads leave the tenant key out under every kind of projection"""
+        tenant = TenantCollection(shared, "owner")
+
+        async def scenario():
+            await tenant.insert_one({"name": "mine", "count": 1})
+            return (
+                await tenant.find_one({}, projection),
+                await tenant.find({}, projection).to_list(length=None)
+            )
+
+        document, documents = run(scenario)
+
+        assert TENANT_FIELD not in document
+        assert document["name"] == "mine"
+        assert all(TENANT_FIELD not in document for document in documents)
+
+
+class TestMigrateTenancyMode:
+    """Test suite for moving organizations between dedicated and pooled tenancy"""
+
+    def make_org(self, name: str) -> dict:
+        client.post("/org/create", json={
+            "organization_name": name,
+            "email": f"admin@{name.replace('_', '')}.com",
+            "password": "TestPass123"
+        })
+
+        async def find():
+            return await async_mongodb.get_database()["organizations"].find_one(
+                {"organization_name": name}
+            )
+
+        org = run(find)
+        assert org.get("tenancy", DEDICATED) == DEDICATED
+        return org
+
+    async def find_org(self, org: dict) -> dict:
+        return await async_mongodb.get_database()["organizations"].find_one({"_id": org["_id"]})
+
+    async def has_collection(self, org: dict) -> bool:
+        return org["collection_name"] in await async_mongodb.get_database().list_collection_names()
+
+    def test_round_trip(self):
+        """Test that documents survive a move to pooled and back"""
+        org = self.make_org("tenancy_round_trip")
+        documents = [{"_id": ObjectId(), "name": "first"}, {"_id": ObjectId(), "name": "second"}]
+        service = DatabaseService()
+
+        async def scenario():
+            await service.tenant_collection(org).insert_many([dict(document) for document in documents])
+            to_pooled = await migrate_tenancy_mode(POOLED, organization_name=org["organization_name"])
+            pooled = await self.find_org(org)
+            pooled_documents = await service.tenant_collection(pooled).find({}).to_list(length=None)
+            dedicated_left = await self.has_collection(org)
+            to_dedicated = await migrate_tenancy_mode(DEDICATED, organization_name=org["organization_name"])
+            dedicated = await self.find_org(org)
+            return (
+                to_pooled, pooled, pooled_documents, dedicated_left, to_dedicated,
+                dedicated, await service.tenant_collection(dedicated).find({}).to_list(length=None)
+            )
+
+        to_pooled, pooled, pooled_documents, dedicated_left, to_dedicated, dedicated, final = run(scenario)
+
+        assert (to_pooled["migrated"], to_pooled["documents"], to_pooled["failed"]) == (1, 2, 0)
+        assert pooled["tenancy"] == POOLED and MIGRATION_FIELD not in pooled
+        assert pooled["version"] == org["version"] + 1
+        assert pooled["updated_at"] > org["updated_at"]
+        assert sorted(pooled_documents, key=lambda d: d["name"]) == documents
+        assert dedicated_left is False
+        assert (to_dedicated["migrated"], to_dedicated["documents"]) == (1, 2)
+        assert dedicated["tenancy"] == DEDICATED and MIGRATION_FIELD not in dedicated
+        assert sorted(final, key=lambda d: d["name"]) == documents
+
+    def test_shared_ids_keep_the_source(self):
+        """Test that an organization whose _ids another tenant holds is not moved"""
+        first, second = self.make_org("tenancy_shared_first"), self.make_org("tenancy_shared_second")
+        shared_id = ObjectId()
+        service = DatabaseService()
+
+        async def scenario():
+            await service.tenant_collection(first).insert_one({"_id": shared_id, "owner": "first"})
+            await service.tenant_collection(second).insert_one({"_id": shared_id, "owner": "second"})
+            await migrate_tenancy_mode(POOLED, organization_name=first["organization_name"])
+            report = await migrate_tenancy_mode(POOLED, organization_name=second["organization_name"])
+            return (
+                report,
+                await self.find_org(second),
+                await service.tenant_collection(second).find_one({"_id": shared_id})
+            )
+
+        report, stored, document = run(scenario)
+
+        assert (report["migrated"], report["failed"]) == (0, 1)
+        assert stored.get("tenancy", DEDICATED) == DEDICATED
+        assert document["owner"] == "second"
+
+    def test_rerun_finishes_interrupted_removal(self, monkeypatch):
+        """Test that a re-run drops old storage left behind after the switch"""
+        org = self.make_org("tenancy_interrupted")
+        service = DatabaseService()
+
+        async def fail_drop(self, org):
+            return False
+
+        async def interrupted():
+            await service.tenant_collection(org).insert_one({"name": "kept"})
+            with monkeypatch.context() as patch:
+                patch.setattr(DatabaseService, "drop_tenant_storage", fail_drop)
+                report = await migrate_tenancy_mode(POOLED, organization_name=org["organization_name"])
+            return report, await self.find_org(org), await self.has_collection(org)
+
+        async def rerun():
+            report = await migrate_tenancy_mode(POOLED, organization_name=org["organization_name"])
+            stored = await self.find_org(org)
+            return (
+                report,
+                stored,
+                await self.has_collection(org),
+                await service.tenant_collection(stored).count_documents({})
+            )
+
+        report, stored, exists = run(interrupted)
+
+        assert report["migrated"] == 1
+        assert stored["tenancy"] == POOLED
+        assert stored[MIGRATION_FIELD]["from"] == DEDICATED
+        assert exists is True
+
+        report, stored, exists, count = run(rerun)
+
+        assert (report["cleaned_up"], report["already_migrated"]) == (1, 1)
+        assert MIGRATION_FIELD not in stored
+        assert exists is False
+        assert count == 1
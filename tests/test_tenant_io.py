@@ -0,0 +1,59 @@
+import asyncio
+import gzip
+import bson
+import pytest
+from bson import ObjectId
+from bson.raw_bson import RawBSONDocument
+from app.utils.tenant_io import BSON_FORMAT, NDJSON, TenantImportError, decode_stream, encode_stream
+
+
+async def chunks_of(body: bytes, size: int = 7):
+    for start in range(0, len(body), size):
+        yield body[start:start + size]
+
+
+async def raw_documents(documents):
+    for document in documents:
+        yield RawBSONDocument(bson.encode(document))
+
+
+def encode(documents, fmt, compressed=False) -> bytes:
+    async def collect():
+        stream = encode_stream(raw_documents(documents), fmt, gzip=compressed, chunk_bytes=16)
+        return b"".join([chunk async for chunk in stream])
+    return asyncio.run(collect())
+
+
+def decode(body: bytes, fmt, compressed=False):
+    async def collect():
+        return [document async for document in decode_stream(chunks_of(body), fmt, gzip=compressed)]
+    return asyncio.run(collect())
+
+
+class TestTenantStreams:
+    """Test suite for tenant export and import streams"""
+
+    DOCUMENTS = [
+        {"_id": ObjectId(), "name": "first", "count": 1},
+        {"_id": ObjectId(), "name": "second", "tags": ["a", "b"]}
+    ]
+
+    @pytest.mark.parametrize("fmt", [NDJSON, BSON_FORMAT])
+    @pytest.mark.parametrize("compressed", [False, True])
+    def test_round_trip(self, fmt, compressed):
+        """Test that exported documents import back unchanged in small chunks"""
+        assert decode(encode(self.DOCUMENTS, fmt, compressed), fmt, compressed) == self.DOCUMENTS
+
+    @pytest.mark.parametrize("body, fmt, compressed", [
+        (b"\x10\x00\x00\x00\x02a\x00\xff\xff\xff\x7fabc\x00\x00", BSON_FORMAT, False),
+        (b"\x08\x00\x00\x00\x99a\x00\x00", BSON_FORMAT, False),
+        (b'{"_id": {"$oid": "zz"}}\n', NDJSON, False),
+        (b'{"created_at": {"$date": ""}}\n', NDJSON, False),
+        (b"[1, 2]\n", NDJSON, False),
+        (b'{"name": "not gzip"}\n', NDJSON, True),
+        (gzip.compress(b'{"name": "truncated"}\n')[:-12], NDJSON, True)
+    ])
+    def test_malformed_input_is_an_import_error(self, body, fmt, compressed):
+        """Test that every kind of malformed body raises TenantImportError"""
+        with pytest.raises(TenantImportError):
+            decode(body, fmt, compressed)